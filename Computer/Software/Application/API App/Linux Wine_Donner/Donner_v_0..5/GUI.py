@@ -1,31 +1,57 @@
-import sys, os
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QWidget, QFileDialog, QApplication
+import sys, os, time
+_T0 = time.perf_counter()
+
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QFileDialog, QApplication, QTableWidgetItem
 
 from GUI_Body import UIBuilder
-from GUI_W_FileSystem import Prefix
-from GUI_W_Runner1 import RunAnalyze 
+# Workers ( Prefix, RunAnalyze, CapsProbe ) are imported on first use to keep them off the first paint.
 
 class WineLauncher(QWidget):
+    bg_log = pyqtSignal(str)    # Thread-safe log for non-QThread helpers ( PrefixPool, PrefixCatalog )
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Wine EXE Launcher")
         self.resize(850, 450)
         
-        self.workers = [] 
+        self.workers, self.first_paint = [], None
         self.bprefix_path, self.exe_file, self.exe_path = None, None, None
+        self.pool = None    # PrefixPool, created by the first launch
+        self.keeper = None  # WineServerKeeper, created on the first warm launch
+        self.scheduler = None    # SessionScheduler, created by the first batch
 
         self.ui_builder = UIBuilder()  
         self.ui_builder.setup_ui(self) 
         self._connect_signals()
+        QTimer.singleShot(0, self._probe_caps)    # After the first paint
+        QTimer.singleShot(0, self._sweep_pool)
 
     def _connect_signals(self):
+        self.bg_log.connect(self.log.append)
         self.btn_base.clicked.connect(self.sel_bprefix)
         self.btn_exe.clicked.connect(self.sel_exe)
         self.btn_run.clicked.connect(self.launchan)
+        self.btn_batch.clicked.connect(self.batch_launch)
         self.modify_base.currentIndexChanged.connect(self.on_modify_base_changed)
         self.modify_temp.currentIndexChanged.connect(self.on_modify_temp_changed)
 
+    def _probe_caps(self, only=None):
+        from GUI_W_Probe import CapsProbe
+        probe = CapsProbe(self.bprefix_path, only, log=self.bg_log.emit)
+        self.workers.append(probe)
+        probe.result.connect(self.on_caps_result)
+        probe.done.connect(lambda _: probe in self.workers and self.workers.remove(probe))
+        probe.start()
+
+    def on_caps_result(self, name, ok, detail):
+        if name in self.checkboxes:
+            cb = self.checkboxes[name]
+            cb.setEnabled(ok) ; cb.setToolTip(detail)
+            if not ok and cb.isChecked():    cb.setChecked(False)
+        elif name == "Probes":    self.log.append(f"⏱️ Capability probes finished in {detail}")
+        else:    self.log.append(f"{'✅' if ok else '❌'} {name}: {detail}")
+
     def on_checkbox_state_changed(self, state):
         status = "Enabled" if state == Qt.Checked else "Disabled"
         self.log.append(f"⚙️ {self.sender().text()}: {status}")
@@ -35,29 +61,137 @@ class WineLauncher(QWidget):
         if path:
             self.bprefix_path = path
             self.log.append(f"📂 Base Prefix Set: {self.bprefix_path}")
+            self._probe_caps(only={"DXVK", "VKD3D"})
         else: self.log.append("❌ Selection cancelled.")
 
+    def _pool(self):
+        """PrefixPool, created by the first launch; refills in the background only where mounting needs no pkexec."""
+        from GUI_W_PrefixPool import PrefixPool
+        if self.pool is None and self.bprefix_path:    self.pool = PrefixPool(log=self.bg_log.emit)
+        return self.pool
+
+    def _sweep_pool(self):
+        """Slots of crashed sessions, reaped off the UI thread."""
+        from GUI_W_PrefixPool import PrefixPool
+        from GUI_W_Supervisor import Supervisor
+        Supervisor.shared().submit(Supervisor.blocking(PrefixPool.sweep, self.bg_log.emit))
+
     def sel_exe(self):
         file, _ = QFileDialog.getOpenFileName(self, "Select EXE", "", "Executables (*.exe)")
         if file:
             self.exe_file = file
             self.exe_path = os.path.dirname(file)
             self.log.append(f"💻 EXE: {file}")
+            self._restore_profile(file)
             temp_path = os.path.join(self.exe_path, ".wine_temp_noverlay")
-            self.log.append("✅ Found 📂Temp Prefix.\n" if os.path.isdir(temp_path) else "❌ Not Found Temp Prefix.\n")
+            self.log.append(self._temp_status(temp_path) if os.path.isdir(temp_path) else "❌ Not Found Temp Prefix.\n")
+            self._prescan(file)
         else: self.log.append("❌ Selection cancelled.") 
 
+    def _temp_status(self, temp_path):
+        """Arch / DXVK of the Temp Prefix from the catalog ( indexed in the background on first sight )."""
+        from GUI_W_Catalog import PrefixCatalog
+        cat, merged = PrefixCatalog.shared(log=self.bg_log.emit), os.path.join(temp_path, "merged")
+        caps = cat.caps(merged)
+        cat.watch(merged)
+        if not caps:    return "✅ Found 📂Temp Prefix.\n"
+        return f"✅ Found 📂Temp Prefix ( {caps['arch'] or '?'}, DXVK {'✔' if caps['DXVK'][0] else '✘'}, VKD3D {'✔' if caps['VKD3D'][0] else '✘'} ).\n"
+
+    def _prescan(self, exe):
+        """Missing imports from the PE headers, against the Base Prefix; off the UI thread."""
+        from GUI_W_PEScan import PEScan
+        from GUI_W_Supervisor import Supervisor
+        scan = PEScan(self.bprefix_path)
+        Supervisor.shared().submit(Supervisor.blocking(lambda: self.bg_log.emit(PEScan.format(scan.scan(exe)))))
+
     def launchan(self):
+        from GUI_W_Runner1 import RunAnalyze
         if not self.exe_file: return self.log.append("❌ Error: No EXE selected!")
-        self._start_task(RunAnalyze, (self.exe_path, self.exe_file), self.btn_run)
+        if self.warm_start.isChecked() and self.keeper is None:
+            from GUI_W_WineServer import WineServerKeeper
+            self.keeper = WineServerKeeper(log=self.bg_log.emit)
+        keeper = self.keeper if self.warm_start.isChecked() else None
+        profile = self._profile(self.exe_file)
+        self.log.append(f"🎛️ Profile {profile}")
+        self._start_task(RunAnalyze, (self.exe_path, self.exe_file, self._pool(), self.bprefix_path, keeper, None, profile), self.btn_run)
+
+    def _profile(self, exe):
+        """The exe's default LaunchProfile updated with the current checkboxes and resolution."""
+        from GUI_W_Profile import LaunchProfile
+        profile = LaunchProfile.load(exe)
+        profile.toggles = {name: cb.isChecked() for name, cb in self.checkboxes.items()}
+        profile.resolution = self.resolution.currentText().replace(" ", "") if self.resolution.currentIndex() else None
+        profile.save()
+        return profile
+
+    def _restore_profile(self, exe):
+        """Puts the exe's saved resolution and toggles back in the combo box and checkboxes."""
+        from GUI_W_Profile import LaunchProfile
+        profile = LaunchProfile.load(exe)
+        for name, cb in self.checkboxes.items():
+            if cb.isEnabled():    cb.setChecked(profile.toggles.get(name, False))    # Probes disable what the host lacks
+        res = profile.resolution
+        i = self.resolution.findText(res.replace("x", " x ")) if res else 0
+        if i < 0:    self.resolution.addItem(res.replace("x", " x ")) ; i = self.resolution.count() - 1    # Set from the CLI
+        self.resolution.setCurrentIndex(i)
+        if res:    self.log.append(f"🖥️ Resolution {res} ( saved for this EXE )")
+
+    def batch_launch(self):
+        from GUI_W_Scheduler import SessionScheduler
+        files, _ = QFileDialog.getOpenFileNames(self, "Select EXEs", "", "Executables (*.exe)")
+        if not files:    return self.log.append("❌ Selection cancelled.")
+
+        if self.scheduler is None:
+            self.scheduler = SessionScheduler(self._run_job, on_change=self.on_job_change)
+            self.job_timer = QTimer(self, interval=1000, timeout=self._tick_jobs)
+            self.log.append(f"🧮 Batch slots: {' | '.join(','.join(map(str, c)) for c in self.scheduler.slots)}")
+        self.jobs.setVisible(True)
+        for f in files:    self.scheduler.submit(f)
+        self.job_timer.start()
+
+    def _run_job(self, job, finish):
+        from GUI_W_Runner1 import RunAnalyze
+        keeper = self.keeper if self.warm_start.isChecked() else None
+        from GUI_W_Profile import LaunchProfile    # Each exe's stored choices : the UI state belongs to the single launch
+        worker = RunAnalyze(os.path.dirname(job.exe), job.exe, self._pool(), self.bprefix_path, keeper, job.cpus, LaunchProfile.load(job.exe))
+        self.workers.append(worker)
+        worker.log.connect(self.log.append)
+        worker.telemetry.connect(self.on_telemetry)
+
+        def on_done(ok):
+            if worker in self.workers: self.workers.remove(worker)
+            finish(ok)
+
+        worker.done.connect(on_done)
+        self.log.append(f"\n▶️ Job #{job.id}: {job.exe} on CPUs {job.cpus}")
+        worker.start()
+
+    def on_telemetry(self, text):
+        self.telemetry.setText(f"📡 {text}") ; self.telemetry.setVisible(True)
+
+    def on_job_change(self, job):
+        row = job.id - 1
+        if row >= self.jobs.rowCount():    self.jobs.setRowCount(row + 1)
+        cells = [str(job.id), os.path.basename(job.exe), job.state,
+                 ",".join(map(str, job.cpus or [])), f"{job.elapsed():.0f}s"]
+        for col, text in enumerate(cells):    self.jobs.setItem(row, col, QTableWidgetItem(text))
+
+    def _tick_jobs(self):
+        running = [j for j in self.scheduler.jobs if j.state == "running"]
+        for job in running:    self.jobs.setItem(job.id - 1, 4, QTableWidgetItem(f"{job.elapsed():.0f}s"))
+        if not self.scheduler.pending():    self.job_timer.stop()
 
     def on_modify_temp_changed(self, index):
-        mapping = {1: 4, 2: 3}
+        from GUI_W_FileSystem import Prefix
+        from GUI_W_Teardown import Teardown ; Teardown.shared(log=self.bg_log.emit)
+        mapping = {1: 4, 2: 3, 3: 5, 4: 6, 5: 8}
         if index in mapping:
-            self._start_task(Prefix, (mapping[index], self.exe_path, self.bprefix_path), self.modify_temp)
+            self._start_task(Prefix, (mapping[index], self.exe_path, self.bprefix_path, self.exe_file), self.modify_temp)
 
     def on_modify_base_changed(self, index):
-        mapping = {1: 1, 2: 2}
+        from GUI_W_FileSystem import Prefix
+        from GUI_W_Teardown import Teardown ; Teardown.shared(log=self.bg_log.emit)
+        mapping = {1: 1, 2: 2, 4: 7}
         if index in mapping:
             self._start_task(Prefix, (mapping[index], self.exe_path, self.bprefix_path), self.modify_base)
 
@@ -67,6 +201,7 @@ class WineLauncher(QWidget):
         self.workers.append(worker)
         
         if hasattr(worker, 'log'): worker.log.connect(self.log.append)
+        if hasattr(worker, 'telemetry'): worker.telemetry.connect(self.on_telemetry)
         
         def on_complete():
             ui_element.setEnabled(True)
@@ -76,11 +211,31 @@ class WineLauncher(QWidget):
         worker.done.connect(on_complete)
         worker.start()
 
+    def paintEvent(self, event):
+        if self.first_paint is None:    self.first_paint = time.perf_counter() - _T0
+        super().paintEvent(event)
+
+    def closeEvent(self, event):
+        self.log.ring.close()    # Flush the gzip spill of the session log
+        if self.pool:    self.pool.shutdown()
+        if self.keeper:    self.keeper.shutdown()
+        if "GUI_W_Supervisor" in sys.modules:    sys.modules["GUI_W_Supervisor"].Supervisor.shared().shutdown()    # Kill running games
+        if "GUI_W_Teardown" in sys.modules:    sys.modules["GUI_W_Teardown"].Teardown.drain(15)    # Finish pending unmounts
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
+    if "--reprobe" in sys.argv:    # Refresh the cached hardware profile
+        from GUI_W_HwProfile import HwProfile ; HwProfile.get(reprobe=True)
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     launcher = WineLauncher()
     launcher.show()
+    if "--bench-startup" in sys.argv:    # Report once painted and the background probes are finished
+        def report():
+            if launcher.first_paint is None or launcher.workers:    return QTimer.singleShot(10, report)
+            print(f"⏱️ first paint {launcher.first_paint * 1000:.1f} ms, probes done {(time.perf_counter() - _T0) * 1000:.1f} ms", flush=True)
+            app.quit()
+        QTimer.singleShot(0, report)
     sys.exit(app.exec_())
 
@@ -1,8 +1,12 @@
 import sys
+from PyQt5.QtCore import Qt, QTimer, QAbstractListModel, QModelIndex
 from PyQt5.QtWidgets import (
     QHBoxLayout, QVBoxLayout, QComboBox, QPushButton, 
-    QTextEdit, QCheckBox, QFrame
+    QListView, QCheckBox, QFrame, QTableWidget, QHeaderView, QLabel
 )
+from PyQt5.QtGui import QFont
+
+from GUI_W_LogRing import LogRing
 
 class UIUtils:
     @staticmethod
@@ -18,11 +22,52 @@ class UIUtils:
         line.setFrameShadow(QFrame.Sunken)
         return line
 
+class LogModel(QAbstractListModel):
+    def __init__(self, ring):
+        super().__init__()
+        self.ring = ring
+
+    def rowCount(self, parent=QModelIndex()):    return 0 if parent.isValid() else len(self.ring)
+
+    def data(self, index, role=Qt.DisplayRole):
+        return self.ring[index.row()] if role == Qt.DisplayRole and index.isValid() else None
+
+    def append(self, text):
+        lines = text.split("\n")
+        k = min(len(lines), self.ring.cap)
+        evict = len(self.ring) + k - self.ring.cap
+        if evict > 0:
+            self.beginRemoveRows(QModelIndex(), 0, evict - 1) ; self.ring.discard(evict) ; self.endRemoveRows()
+
+        n = len(self.ring)
+        self.beginInsertRows(QModelIndex(), n, n + k - 1) ; self.ring.extend(lines) ; self.endInsertRows()
+
+class LogView(QListView):
+    """Drop-in for the read-only QTextEdit : only visible rows are drawn."""
+
+    def __init__(self, capacity=20000):
+        super().__init__()
+        self.ring = LogRing(capacity, spill=LogRing.session_file())
+        self.model_ = LogModel(self.ring)
+        self.setModel(self.model_)
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setSelectionMode(QListView.ExtendedSelection)
+        self._follow = False
+
+    def append(self, text):
+        bar = self.verticalScrollBar()
+        if not self._follow and bar.value() >= bar.maximum():    # Scroll once per event-loop pass, not per line
+            self._follow = True ; QTimer.singleShot(0, self._scroll)
+        self.model_.append(text)
+
+    def _scroll(self):    self._follow = False ; self.scrollToBottom()
+
 class UIBuilder:    
     def setup_ui(self, window):
         main_v = QVBoxLayout(window)
 
-        window.log = QTextEdit(readOnly=True)
+        window.log = LogView()
         window.modify_base = QComboBox()
         window.modify_base.addItems([
             "BasePrefix Options : None", "Create Base Prefix", 
@@ -30,7 +75,7 @@ class UIBuilder:
         ])
         
         window.modify_temp = QComboBox()
-        window.modify_temp.addItems(["Temp Prefix Options : None", "Delete", "Create"])
+        window.modify_temp.addItems(["Temp Prefix Options : None", "Delete", "Create", "Inspect", "Compact to Base", "Auto-Fix Dlls"])
         
         window.resolution = QComboBox()
         window.resolution.addItems(["Resolution : None", "600 x 600", "1024 x 768", "1280 x 720"])
@@ -38,21 +83,35 @@ class UIBuilder:
         window.btn_base = QPushButton("Select The BasePrefix")
         window.btn_exe  = QPushButton("Select The G-Soft.exe")
         window.btn_run  = QPushButton("Launch and Analyze")
+        window.btn_batch = QPushButton("Batch Launch...")
 
         main_v.addLayout(UIUtils.row(window.modify_base, window.btn_base, window.btn_exe))
-        main_v.addLayout(UIUtils.row(window.modify_temp, window.resolution, window.btn_run))
+        main_v.addLayout(UIUtils.row(window.modify_temp, window.resolution, window.btn_run, window.btn_batch))
         main_v.addWidget(UIUtils.sep())
 
         log_h, chk_v = QHBoxLayout(), QVBoxLayout()
         window.checkboxes = {} 
         for label in ["Gamemode", "Vulkan", "VKD3D", "DXVK"]:
-            cb = QCheckBox(label)
+            cb = QCheckBox(label, enabled=False, toolTip="⏳ Probing...")    # Enabled by CapsProbe results
             if hasattr(window, 'on_checkbox_state_changed'):
                 cb.stateChanged.connect(window.on_checkbox_state_changed)
             chk_v.addWidget(cb)
             window.checkboxes[label] = cb
         
+        window.warm_start = QCheckBox("Warm Wineserver", toolTip="Keep wineserver alive per prefix between launches")
+        chk_v.addWidget(UIUtils.sep()) ; chk_v.addWidget(window.warm_start)
         chk_v.addStretch() 
         log_h.addWidget(window.log, 1) 
         log_h.addLayout(chk_v, 0)      
-        main_v.addLayout(log_h)
+        main_v.addLayout(log_h, 1)
+
+        window.telemetry = QLabel(visible=False)    # Live sparklines of the running game
+        window.telemetry.setFont(QFont("monospace"))
+        main_v.addWidget(window.telemetry)
+
+        window.jobs = QTableWidget(0, 5, visible=False)    # Live per-job view of batch sessions
+        window.jobs.setHorizontalHeaderLabels(["#", "EXE", "State", "CPUs", "Time"])
+        window.jobs.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        window.jobs.verticalHeader().setVisible(False)
+        window.jobs.setEditTriggers(QTableWidget.NoEditTriggers)
+        main_v.addWidget(window.jobs)
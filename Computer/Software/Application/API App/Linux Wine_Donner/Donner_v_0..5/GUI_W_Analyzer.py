@@ -0,0 +1,94 @@
+
+import re
+import sys
+import gzip
+import json
+import time
+from collections import Counter
+
+# One pass per line : Wine debug header + the known module-loader failures as alternatives.
+#   [+timestamp:][pid:][tid:]class:channel:function message
+RX = re.compile(r"""
+    ^(?:(?P<ts>\d+\.\d+):)?(?:[0-9a-f]{4}:){0,2}
+    (?P<cls>err|warn|fixme):(?P<ch>[\w-]+):(?P<fn>\w+)\s?
+    (?:
+        (?:Library|Loading\ library)\ (?P<lib>[^\s(]+)\ \(which\ is\ needed\ by\ L"(?P<by>[^"]*)"\)\ (?P<why>not\ found|failed[^.]*)
+      | Importing\ dlls\ for\ L"(?P<exe>[^"]*)"\ failed,\ status\ (?P<status>\w+)
+      | Failed\ to\ load\ module\ L"(?:[^"]*\\)?(?P<mod>[^"\\]+)";\ status=(?P<mstatus>\w+)
+      | (?P<rest>.*)
+    )""", re.X)
+
+class DllAnalyzer:
+    """Streaming stage : feed() every log line, then report() / write_report()."""
+
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self.lines = self.matched = 0
+        self.dlls = {}                     # name -> {count, first_seen, needed_by, reason}
+        self.ldr_failures = {}             # exe  -> status
+        self.fixme = Counter()             # channel:function -> count
+
+    def feed(self, line):
+        self.lines += 1
+        m = RX.match(line)
+        if not m: return
+        self.matched += 1
+
+        g = m.groupdict()
+        if g["lib"]:       self._missing(g["lib"], g["ts"], g["by"], g["why"])
+        elif g["mod"]:     self._missing(g["mod"], g["ts"], None, f"status {g['mstatus']}")
+        elif g["exe"]:     self.ldr_failures.setdefault(g["exe"], g["status"])
+        elif g["cls"] == "fixme":    self.fixme[f"{g['ch']}:{g['fn']}"] += 1
+
+    def _missing(self, name, ts, by, why):
+        name = name.lower()
+        d = self.dlls.get(name)
+        if d is None:
+            seen = float(ts) if ts else round(time.monotonic() - self.t0, 3)
+            d = self.dlls[name] = {"count": 0, "first_seen": seen, "needed_by": [], "reason": why}
+        d["count"] += 1
+        if by and by not in d["needed_by"]:    d["needed_by"].append(by)
+
+    def missing(self):
+        return sorted(self.dlls, key=lambda n: (-self.dlls[n]["count"], n))
+
+    def report(self):
+        return {
+            "lines": self.lines, "matched": self.matched,
+            "missing_dlls": {n: self.dlls[n] for n in self.missing()},
+            "ldr_failures": self.ldr_failures,
+            "fixme_top": dict(self.fixme.most_common(25)),
+        }
+
+    def write_report(self, exe_dir):
+        path = f"{exe_dir}/Analyzable-logs.json"
+        with open(path, "w") as f:    json.dump(self.report(), f, indent=2)
+        return path
+
+    def summary(self):
+        if not self.dlls:    return "✅ No missing DLLs detected."
+        return "❗ Missing DLLs: " + ", ".join(f"{n} (×{self.dlls[n]['count']})" for n in self.missing())
+
+
+def bench(paths):
+    """Lines/s over recorded logs ( plain or .gz spill files ), or a synthetic log."""
+    if paths:
+        lines = []
+        for p in paths:
+            with (gzip.open if p.endswith(".gz") else open)(p, "rt", errors="ignore") as f:
+                lines += f.read().splitlines()
+    else:
+        from GUI_W_LogPipe import LogPipe
+        lines = list(LogPipe.synthetic(500_000))
+
+    an = DllAnalyzer()
+    t0 = time.perf_counter()
+    for line in lines:    an.feed(line)
+    dt = time.perf_counter() - t0
+
+    print(f"⏱️ {len(lines)} lines in {dt:.2f}s -> {len(lines) / dt:,.0f} lines/s ( {an.matched} matched )")
+    print(an.summary())
+
+
+if __name__ == "__main__":
+    bench(sys.argv[1:])
@@ -0,0 +1,233 @@
+
+import os
+import sys
+import time
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from pathlib import Path
+
+from GUI_W_PrefixStore import PrefixStore
+from GUI_W_Teardown import Teardown
+from GUI_W_Copier import PrefixCopier
+
+def mount_of(path):
+    """( mountpoint, fstype, source ) holding `path`, from /proc/self/mountinfo ( no `df -T` fork )."""
+    path, best = os.path.realpath(path), ("/", "unknown", "")
+    try:
+        with open("/proc/self/mountinfo") as f:
+            for line in f:
+                pre, _, post = line.partition(" - ")
+                mp = pre.split()[4].replace("\\040", " ")
+                if (path == mp or path.startswith(mp.rstrip("/") + "/")) and len(mp) >= len(best[0]):
+                    fstype, source = (post.split() + ["", ""])[:2]
+                    best = (mp, fstype, source)
+    except OSError:    pass
+    return best
+
+def _existing(path):
+    path = Path(path).absolute()
+    while not path.exists():    path = path.parent
+    return path
+
+def _sudo():    return ["pkexec"] if os.geteuid() else []
+
+
+class Backend:
+    """A way to give a game a writable prefix on top of a read-only base.
+
+    Each backend's create(base, root) returns `root/merged`, the WINEPREFIX; destroy(root)
+    hands everything to the background Teardown. rank orders the candidates, fastest first;
+    opt_in ones are only used when asked for by name ( DONNER_BACKEND ); privileged ones
+    mount through pkexec when not run as root.
+    """
+    name, rank, opt_in, privileged = "base", 99, False, False
+    NO_XATTR = ("vfat", "exfat", "ntfs", "ntfs3", "fuseblk", "msdos")    # No overlay upper / reflink here
+
+    @classmethod
+    def supported(cls, base, root):    return False
+
+    @classmethod
+    def destroy(cls, root):
+        root, td = Path(root), Teardown.shared()
+        side = [os.path.dirname(os.path.realpath(root / d)) for d in ("upper", "work") if (root / d).is_symlink()]
+        if root.exists():    td.trash(root)
+        for d in set(side):
+            if os.path.isdir(d):    td.trash(d)
+
+    @staticmethod
+    def _overlay(cmd, base, upper, work, merged):
+        for d in (upper, work, merged):    os.makedirs(d, exist_ok=True)
+        opts = f"lowerdir={base},upperdir={upper},workdir={work},noatime"
+        subprocess.run(cmd + ["-o", opts, str(merged)], check=True, capture_output=True)
+
+
+class KernelOverlay(Backend):
+    name, rank, privileged = "overlay", 2, True
+
+    @classmethod
+    def supported(cls, base, root):
+        try:    kernel = "overlay" in open("/proc/filesystems").read()
+        except OSError:    kernel = False
+        return kernel and bool(not os.geteuid() or shutil.which("pkexec")) and mount_of(_existing(root))[1] not in cls.NO_XATTR + ("overlay",)
+
+    @classmethod
+    def create(cls, base, root):
+        root = Path(root)
+        cls._overlay(_sudo() + ["mount", "-t", "overlay", "overlay"], base, root / "upper", root / "work", root / "merged")
+        return root / "merged"
+
+
+class TmpfsOverlay(KernelOverlay):
+    """Kernel overlay with upper/work in RAM ( v0.3's /dev/shm prefix ); also the way to
+    overlay onto NTFS / exFAT game drives, which cannot hold an upper layer themselves.
+    Opt-in ( DONNER_BACKEND=tmpfs ) : whatever gets installed into the prefix is lost at
+    reboot, Compact to Base included."""
+    name, rank, opt_in = "tmpfs", 8, True
+    SHM, MIN_FREE = "/dev/shm", 2 << 30
+
+    @classmethod
+    def supported(cls, base, root):
+        if mount_of(cls.SHM)[1] != "tmpfs" or not super().supported(base, cls.SHM):    return False
+        st = os.statvfs(cls.SHM)
+        return st.f_bavail * st.f_frsize > cls.MIN_FREE
+
+    @classmethod
+    def create(cls, base, root):
+        root = Path(root) ; root.mkdir(parents=True, exist_ok=True)
+        key = hashlib.sha1(str(root.absolute()).encode()).hexdigest()[:12]
+        side = Path(cls.SHM) / f"donner-{os.getuid()}" / key
+        for d in ("upper", "work"):
+            (side / d).mkdir(parents=True, exist_ok=True)
+            if not (root / d).is_symlink():    (root / d).symlink_to(side / d)
+        cls._overlay(_sudo() + ["mount", "-t", "overlay", "overlay"], base, side / "upper", side / "work", root / "merged")
+        return root / "merged"
+
+
+class FuseOverlay(Backend):
+    name, rank = "fuse-overlayfs", 4
+
+    @classmethod
+    def supported(cls, base, root):
+        return bool(shutil.which("fuse-overlayfs")) and os.path.exists("/dev/fuse") \
+            and mount_of(_existing(root))[1] not in cls.NO_XATTR
+
+    @classmethod
+    def create(cls, base, root):
+        root = Path(root)
+        cls._overlay(["fuse-overlayfs"], base, root / "upper", root / "work", root / "merged")
+        return root / "merged"
+
+
+class Reflink(Backend):
+    """Per-file FICLONE snapshot ( btrfs / xfs / bcachefs ) : no mount, no privileges."""
+    name, rank = "reflink", 3
+
+    @classmethod
+    def supported(cls, base, root):
+        root = _existing(root)
+        if os.stat(base).st_dev != os.stat(root).st_dev:    return False
+        probe = next((p for p in Path(base).rglob("*") if p.is_file() and not p.is_symlink()), None)
+        if probe is None:    return False
+        fd, tmp = tempfile.mkstemp(dir=root) ; os.close(fd)
+        try:    return PrefixStore.clone(probe, tmp, link=False) == "reflink"
+        finally:    os.unlink(tmp)
+
+    @classmethod
+    def create(cls, base, root):
+        merged = Path(root) / "merged"
+        cls.copy_tree(base, merged, link=False)
+        return merged
+
+    @staticmethod
+    def copy_tree(src, dst, link=False):
+        for dirpath, dirnames, filenames in os.walk(src):
+            out = Path(dst) / os.path.relpath(dirpath, src)
+            out.mkdir(parents=True, exist_ok=True)
+            for n in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+                p = os.path.join(dirpath, n)
+                if os.path.islink(p):    os.symlink(os.readlink(p), out / n)
+                elif os.path.isfile(p):    PrefixStore.clone(p, out / n, link=link)
+
+
+class Copy(Backend):
+    """Parallel incremental copy : works everywhere ( NTFS game drives too ), slowest to create
+    the first time; re-creating over a kept `merged` only refreshes what changed in the base."""
+    name, rank = "copy", 9
+
+    @classmethod
+    def supported(cls, base, root):    return True
+
+    @classmethod
+    def create(cls, base, root):
+        merged = Path(root) / "merged"
+        PrefixCopier(log=lambda t: None).run(base, merged)
+        return merged
+
+
+class Backends:
+    ALL = sorted([TmpfsOverlay, KernelOverlay, Reflink, FuseOverlay, Copy], key=lambda b: b.rank)
+
+    @staticmethod
+    def select(base, root, prefer=None):
+        """Fastest backend the host supports for `base` -> `root`; DONNER_BACKEND forces one."""
+        prefer = prefer or os.environ.get("DONNER_BACKEND")
+        for b in Backends.ALL:
+            if prefer and b.name != prefer or b.opt_in and not prefer:    continue
+            try:
+                if b.supported(base, root):    return b
+            except OSError:    pass
+        return Copy
+
+    @staticmethod
+    def of(root):
+        """The backend that built `root` ( recorded at creation )."""
+        try:    name = (Path(root) / ".backend").read_text().strip()
+        except OSError:    return Copy
+        return next((b for b in Backends.ALL if b.name == name), Copy)
+
+    @staticmethod
+    def create(base, root, prefer=None, log=print):
+        b = Backends.select(base, root, prefer)
+        mp, fs, _ = mount_of(_existing(root))
+        log(f"⚡ Using {b.name} on {fs} ( {mp} ).")
+        merged = b.create(base, root)
+        (Path(root) / ".backend").write_text(b.name)
+        return merged
+
+    @staticmethod
+    def destroy(root):    Backends.of(root).destroy(root)
+
+
+def bench(base=None, files=2000):
+    """create / first-launch I/O / teardown per supported backend."""
+    with tempfile.TemporaryDirectory(dir=os.environ.get("DONNER_BENCH_DIR")) as tmp:
+        if base is None:    # Synthetic base with a prefix-like file mix
+            base = Path(tmp) / "base"
+            for i in range(files):
+                p = base / "drive_c" / "windows" / "system32" / f"lib{i}.dll"
+                p.parent.mkdir(parents=True, exist_ok=True) ; p.write_bytes(os.urandom(4096 + i * 37 % 60000))
+            os.makedirs(base / "dosdevices") ; os.symlink("../drive_c", base / "dosdevices" / "c:")
+
+        print(f"📂 base on {mount_of(base)[1]}, temp on {mount_of(tmp)[1]}")
+        for b in Backends.ALL:
+            root = Path(tmp) / b.name
+            try:
+                if not b.supported(base, root):    print(f"   {b.name:15} unsupported") ; continue
+                t0 = time.perf_counter() ; merged = b.create(base, root) ; t_create = time.perf_counter() - t0
+
+                t0 = time.perf_counter()    # First launch : read every DLL head, write a few hundred files
+                for p in (Path(merged) / "drive_c" / "windows" / "system32").iterdir():
+                    with open(p, "rb") as f:    f.read(4096)
+                for i in range(300):    (Path(merged) / "drive_c" / f"save{i}.dat").write_bytes(b"s" * 65536)
+                t_io = time.perf_counter() - t0
+
+                t0 = time.perf_counter() ; b.destroy(root) ; Teardown.shared().wait() ; t_down = time.perf_counter() - t0
+                print(f"   {b.name:15} create {t_create * 1000:7.0f} ms   first-launch I/O {t_io * 1000:6.0f} ms   teardown {t_down * 1000:6.0f} ms")
+            except (OSError, subprocess.CalledProcessError) as e:    print(f"   {b.name:15} failed: {e}")
+        print(f"🏁 selected: {Backends.select(base, Path(tmp) / 'x').name}")
+
+
+if __name__ == "__main__":
+    bench(sys.argv[1] if len(sys.argv) > 1 else None)
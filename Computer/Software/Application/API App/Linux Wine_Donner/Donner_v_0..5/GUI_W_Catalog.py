@@ -0,0 +1,321 @@
+
+import os
+import sys
+import time
+import queue
+import ctypes
+import select
+import sqlite3
+import struct
+import tempfile
+import threading
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+from GUI_W_PEScan import PEScan
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prefixes (id INTEGER PRIMARY KEY, path TEXT UNIQUE, arch TEXT, scanned REAL);
+CREATE TABLE IF NOT EXISTS dlls (
+    prefix INTEGER, dir TEXT, name TEXT, size INTEGER, mtime INTEGER,
+    version TEXT, builtin INTEGER, arch TEXT, PRIMARY KEY (prefix, name, dir)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dlls_name ON dlls (name);
+"""
+
+class Inotify:
+    """Minimal inotify over ctypes : add() / rm() a directory watch, read() ( wd, mask, name ) events."""
+    CLOSE_WRITE, MOVED_FROM, MOVED_TO, CREATE, DELETE, DELETE_SELF, OVERFLOW = 0x8, 0x40, 0x80, 0x100, 0x200, 0x400, 0x4000
+    IGNORED = 0x8000    # Watch removed : rm(), directory deleted or its filesystem unmounted
+    MASK = CLOSE_WRITE | MOVED_FROM | MOVED_TO | CREATE | DELETE | DELETE_SELF
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:    raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:    raise OSError(ctypes.get_errno(), f"inotify_add_watch {path}")
+        return wd
+
+    def rm(self, wd):    self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:    return []
+        try:    buf = os.read(self.fd, 1 << 16)
+        except BlockingIOError:    return []
+        out, i = [], 0
+        while i < len(buf):
+            wd, mask, _, n = self.EVENT.unpack_from(buf, i)
+            out.append((wd, mask, buf[i + 16:i + 16 + n].rstrip(b"\0").decode(errors="surrogateescape")))
+            i += 16 + n
+        return out
+
+
+class PrefixCatalog:
+    """SQLite index of the DLLs of every known prefix ( ~/.cache/donner/catalog/prefixes.db ).
+
+    One row per system32 / syswow64 file : size, mtime, PE version resource, Wine
+    builtin-stub marker and arch. ensure() ( re )indexes a prefix, re-parsing only files
+    whose size or mtime changed; a background thread then keeps watched prefixes current
+    through inotify ( polling every `poll` seconds where inotify is unavailable ) until
+    unwatch() or the prefix is deleted / unmounted, so capability queries are single
+    SELECTs instead of filesystem probes. Rows of Temp Prefixes and pool slots are
+    deleted with them.
+    """
+    DIRS = ("system32", "syswow64")
+    EXTS = (".dll", ".drv", ".sys", ".exe", ".ocx")
+    _shared, _shared_lock = None, threading.Lock()
+
+    def __init__(self, db=None, poll=10, log=print):
+        self.db, self.poll, self.log = str(db or Utils.cache_dir("catalog") / "prefixes.db"), poll, log
+        self.local, self.write_lock, self.watches, self.watched = threading.local(), threading.Lock(), {}, set()
+        self.requests = queue.Queue()
+        with self.write_lock:    self._conn().executescript(SCHEMA)
+        try:    self.inotify = Inotify()
+        except (OSError, AttributeError):    self.inotify = None    # No inotify : poll instead
+        self.thread = threading.Thread(target=self._loop, daemon=True, name="donner-catalog") ; self.thread.start()
+
+    @classmethod
+    def shared(cls, log=None):
+        """Process-wide catalog; `log` ( e.g. the GUI's queued bg_log ) receives its watcher errors."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:    cls._shared = cls(log=log or print)
+        if log:    cls._shared.log = log
+        return cls._shared
+
+    @classmethod
+    def release(cls, prefix):
+        """unwatch() on the shared catalog, if one is running, and drops the rows of `prefix`
+        ( before a Temp Prefix or pool slot is torn down )."""
+        if cls._shared is not None:    cls._shared.unwatch(prefix, forget=True)
+
+    @staticmethod
+    def disposable(prefix):
+        """Temp Prefix / pool slot overlays ( .../merged, see Backends.create ) : rows die with them."""
+        return os.path.basename(prefix) == "merged"
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.db, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL") ; conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # Indexing
+
+    @staticmethod
+    def prefix_arch(prefix):
+        try:
+            with open(Path(prefix) / "system.reg", errors="ignore") as f:
+                for line in f:
+                    if line.startswith("#arch="):    return line[6:].strip()
+                    if line.startswith("["):    break
+        except OSError:    pass
+        return None
+
+    @staticmethod
+    def _row(path, st):
+        try:    pe = PEScan.parse(path)
+        except (OSError, ValueError, struct.error):    pe = {"arch": None, "version": None, "builtin": PEScan.is_builtin(path)}
+        return st.st_size, st.st_mtime_ns, pe["version"], int(pe["builtin"]), pe["arch"]
+
+    def _pid(self, conn, prefix):
+        conn.execute("INSERT INTO prefixes (path, arch, scanned) VALUES (?, ?, ?) ON CONFLICT (path) DO UPDATE "
+                     "SET arch = excluded.arch, scanned = excluded.scanned", (prefix, self.prefix_arch(prefix), time.time()))
+        return conn.execute("SELECT id FROM prefixes WHERE path = ?", (prefix,)).fetchone()[0]
+
+    def ensure(self, prefix):
+        """Indexes `prefix` incrementally; returns ( files parsed, files dropped )."""
+        prefix = os.path.realpath(prefix)
+        conn, parsed, dropped = self._conn(), 0, 0
+        with self.write_lock, conn:
+            pid = self._pid(conn, prefix)
+            for d in self.DIRS:
+                have = {n: (s, m) for n, s, m in conn.execute("SELECT name, size, mtime FROM dlls WHERE prefix = ? AND dir = ?", (pid, d))}
+                try:
+                    with os.scandir(Path(prefix) / "drive_c" / "windows" / d) as it:    entries = [e for e in it if e.name.lower().endswith(self.EXTS)]
+                except OSError:    entries = []
+                rows = []
+                for e in entries:
+                    try:    st = e.stat()
+                    except OSError:    continue
+                    if have.pop(e.name.lower(), None) != (st.st_size, st.st_mtime_ns):    rows.append((pid, d, e.name.lower(), *self._row(e.path, st)))
+                conn.executemany("INSERT OR REPLACE INTO dlls VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.executemany("DELETE FROM dlls WHERE prefix = ? AND dir = ? AND name = ?", [(pid, d, n) for n in have])
+                parsed, dropped = parsed + len(rows), dropped + len(have)
+        return parsed, dropped
+
+    def _update(self, prefix, d, name):
+        """One inotify event : re-reads or drops a single file."""
+        conn, path = self._conn(), Path(prefix) / "drive_c" / "windows" / d / name
+        with self.write_lock, conn:
+            pid = self._pid(conn, prefix)
+            try:    conn.execute("INSERT OR REPLACE INTO dlls VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (pid, d, name.lower(), *self._row(path, os.stat(path))))
+            except OSError:    conn.execute("DELETE FROM dlls WHERE prefix = ? AND dir = ? AND name = ?", (pid, d, name.lower()))
+
+    def watch(self, prefix):
+        """Indexes `prefix` in the background and keeps it current from then on."""
+        self.requests.put((os.path.realpath(prefix), "watch"))
+
+    def unwatch(self, prefix, forget=False):
+        """Stops keeping `prefix` current; its rows stay queryable unless `forget`."""
+        self.requests.put((os.path.realpath(prefix), "forget" if forget else "unwatch"))
+
+    def forget(self, prefix):
+        """Deletes the rows of `prefix`."""
+        conn = self._conn()
+        with self.write_lock, conn:
+            row = conn.execute("SELECT id FROM prefixes WHERE path = ?", (os.path.realpath(prefix),)).fetchone()
+            if row:    conn.execute("DELETE FROM dlls WHERE prefix = ?", row) ; conn.execute("DELETE FROM prefixes WHERE id = ?", row)
+
+    def _prune(self):
+        """Rows of disposable prefixes that no longer exist ( sessions that ended without release() )."""
+        for (path,) in self._conn().execute("SELECT path FROM prefixes").fetchall():
+            if self.disposable(path) and not os.path.isdir(Path(path) / "drive_c"):    self.forget(path)
+
+    def _loop(self):
+        last_poll = time.monotonic()
+        try:    self._prune()
+        except Exception as e:    self.log(f"❌ Catalog: {e}")
+        while True:
+            try:
+                while True:    # Pending watch() / unwatch() requests
+                    prefix, op = self.requests.get_nowait()
+                    if op != "watch":
+                        self._drop(prefix)
+                        if op == "forget":    self.forget(prefix)
+                        continue
+                    self.ensure(prefix)
+                    for d in self.DIRS:
+                        path = Path(prefix) / "drive_c" / "windows" / d
+                        if self.inotify and path.is_dir() and (prefix, d) not in self.watches.values():
+                            self.watches[self.inotify.add(path)] = (prefix, d)
+                    self.watched.add(prefix)
+            except queue.Empty:    pass
+            except Exception as e:    self.log(f"❌ Catalog: {e}")
+
+            if self.inotify:
+                for wd, mask, name in self.inotify.read(1.0):
+                    if mask & Inotify.OVERFLOW:    self._rescan() ; continue
+                    prefix, d = self.watches.get(wd, (None, None))
+                    if not prefix:    continue
+                    if mask & Inotify.IGNORED:    # Directory gone or unmounted : forget the prefix with its last watch
+                        del self.watches[wd]
+                        if all(p != prefix for p, _ in self.watches.values()):
+                            self.watched.discard(prefix)
+                            if self.disposable(prefix):
+                                try:    self.forget(prefix)
+                                except Exception as e:    self.log(f"❌ Catalog: {e}")
+                        continue
+                    try:
+                        if mask & Inotify.DELETE_SELF:    self.ensure(prefix)
+                        elif name.lower().endswith(self.EXTS):    self._update(prefix, d, name)
+                    except Exception as e:    self.log(f"❌ Catalog: {e}")
+            else:    time.sleep(1.0)
+            if not self.inotify and time.monotonic() - last_poll > self.poll:
+                self._rescan() ; last_poll = time.monotonic()
+
+    def _drop(self, prefix):
+        for wd in [wd for wd, (p, _) in self.watches.items() if p == prefix]:
+            del self.watches[wd] ; self.inotify.rm(wd)
+        self.watched.discard(prefix)
+
+    def _rescan(self):
+        for prefix in list(self.watched):
+            try:    self.ensure(prefix)
+            except Exception as e:    self.log(f"❌ Catalog: {e}")
+
+    # Queries
+
+    def _prefix(self, prefix):
+        return self._conn().execute("SELECT id, arch FROM prefixes WHERE path = ?", (os.path.realpath(prefix),)).fetchone()
+
+    def known(self, prefix):    return self._prefix(prefix) is not None
+
+    def missing(self, prefix, names, native=False):
+        """Which of `names` the prefix lacks ( or only has as Wine builtin stubs when `native` )."""
+        row = self._prefix(prefix)
+        if not row:    return list(names)
+        have = {n for n, b in self._conn().execute(
+            f"SELECT name, MIN(builtin) FROM dlls WHERE prefix = ? AND name IN ({','.join('?' * len(names))}) GROUP BY name",
+            (row[0], *[n.lower() for n in names])) if not (native and b)}
+        return [n for n in names if n.lower() not in have]
+
+    def dll(self, prefix, name):
+        """{dir: ( size, version, builtin, arch )} of one DLL in a prefix."""
+        row = self._prefix(prefix)
+        if not row:    return {}
+        return {d: rest for d, *rest in self._conn().execute(
+            "SELECT dir, size, version, builtin, arch FROM dlls WHERE prefix = ? AND name = ?", (row[0], name.lower()))}
+
+    def caps(self, prefix):
+        """Arch, DXVK / VKD3D-Proton ( native d3d11 + dxgi / d3d12 + d3d12core ) and their versions."""
+        row = self._prefix(prefix)
+        if not row:    return None
+        caps = (("DXVK", ("d3d11.dll", "dxgi.dll")), ("VKD3D", ("d3d12.dll", "d3d12core.dll")))
+        rows = self._conn().execute("SELECT name, dir, version, builtin FROM dlls WHERE prefix = ? AND name IN (?, ?, ?, ?)",
+                                    (row[0], *[n for _, names in caps for n in names])).fetchall()
+        native, ver = {n for n, _, _, b in rows if not b}, {n: v for n, d, v, _ in rows if d == "system32"}
+        out = {"arch": row[1]}
+        for cap, names in caps:
+            miss = [n for n in names if n not in native]
+            out[cap] = (not miss, f"missing native {', '.join(miss)}" if miss else
+                        f"native {', '.join(names)}" + (f" {ver[names[0]]}" if ver.get(names[0]) else ""))
+        return out
+
+    def where(self, name, native=True):
+        """Every indexed prefix holding `name` : [( path, dir, version, builtin )]."""
+        return self._conn().execute(
+            "SELECT p.path, d.dir, d.version, d.builtin FROM dlls d JOIN prefixes p ON p.id = d.prefix "
+            "WHERE d.name = ? AND (? = 0 OR d.builtin = 0) ORDER BY p.path", (name.lower(), int(native))).fetchall()
+
+
+def bench(prefixes=10, files=3000):
+    """Initial index, no-change rescan, capability queries vs os.path.exists probes, and
+    how long an inotify update takes to show up."""
+    from GUI_W_PEScan import _pe
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp, roots = Path(tmp), []
+        for p in range(prefixes):
+            s32 = tmp / f"p{p}" / "drive_c" / "windows" / "system32" ; s32.mkdir(parents=True)
+            (tmp / f"p{p}" / "system.reg").write_text("WINE REGISTRY Version 2\n\n#arch=win64\n\n")
+            for i in range(files):    _pe(s32 / f"lib{i}.dll", stub=True)
+            for n in ("d3d11.dll", "dxgi.dll", "d3d12.dll", "d3d12core.dll"):    _pe(s32 / n, stub=p % 2 == 0, version=(2, 3, 0, 0))
+            roots.append(tmp / f"p{p}")
+
+        cat = PrefixCatalog(tmp / "catalog.db", log=print)
+        t0 = time.perf_counter()
+        for r in roots:    cat.ensure(r)
+        print(f"📇 index {prefixes} x {files + 4} files : {time.perf_counter() - t0:.2f}s")
+        t0 = time.perf_counter()
+        for r in roots:    cat.ensure(r)
+        print(f"🔁 rescan, nothing changed : {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+        t0 = time.perf_counter()
+        for _ in range(100):
+            for r in roots:    [os.path.exists(r / "drive_c/windows/system32" / n) for n in ("d3d11.dll", "dxgi.dll", "d3d12.dll", "d3d12core.dll")]
+        probe = (time.perf_counter() - t0) / 100 / prefixes * 1e6
+        t0 = time.perf_counter()
+        for _ in range(100):
+            for r in roots:    cat.caps(r)
+        query = (time.perf_counter() - t0) / 100 / prefixes * 1e6
+        print(f"🔎 per prefix : exists() probes {probe:.0f} µs ( presence only ), caps() {query:.0f} µs "
+              f"( arch, native vs builtin, version ); {len(cat.where('d3d11.dll'))} prefixes with native DXVK")
+
+        for r in roots:    cat.watch(r)
+        time.sleep(1.5)
+        t0 = time.perf_counter()
+        _pe(roots[0] / "drive_c/windows/system32/d3d11.dll", version=(2, 4, 0, 0))
+        while cat.dll(roots[0], "d3d11.dll")["system32"][1] != "2.4.0.0" and time.perf_counter() - t0 < 15:    time.sleep(0.005)
+        print(f"👀 {'inotify' if cat.inotify else 'poll'} update visible after {(time.perf_counter() - t0) * 1000:.0f} ms : {cat.caps(roots[0])['DXVK']}")
+
+
+if __name__ == "__main__":
+    # python3 GUI_W_Catalog.py PREFIX...   index and print capabilities
+    if len(sys.argv) > 1:
+        cat = PrefixCatalog()
+        for p in sys.argv[1:]:    cat.ensure(p) ; print(p, cat.caps(p))
+    else:    bench()
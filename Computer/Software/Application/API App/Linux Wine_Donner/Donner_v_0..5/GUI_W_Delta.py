@@ -0,0 +1,240 @@
+
+import os
+import sys
+import stat
+import json
+import time
+import heapq
+import shutil
+import fnmatch
+import hashlib
+import tempfile
+import subprocess
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+from GUI_W_PrefixStore import PrefixStore
+
+class UpperDelta:
+    """What an overlay temp prefix wrote : scans `upper` against its `lower` base prefix.
+
+    Directory listings are cached by ( inode, mtime ), so a rescan only reads directories
+    that changed and re-stats the files of the rest. Reports per-directory byte deltas
+    ( vs the base, and growth since the previous scan ), whiteouts / opaque dirs and the
+    largest writers; compact() folds a useful upper layer into a new stored base prefix.
+
+    Kernel overlays mounted through pkexec mark opaque dirs with trusted.overlay.opaque,
+    which only root can read : unprivileged, a mount with `userxattr` is read directly,
+    otherwise one privileged pass lists the opaque dirs.
+    """
+    EXCLUDE = ("drive_c/users/*/Temp/*", "drive_c/users/*/AppData/Local/Temp/*", "drive_c/windows/temp/*", "*.log")
+    OPAQUE = ("trusted.overlay.opaque", "user.overlay.opaque", "user.fuseoverlayfs.opaque")
+    CACHE_V = 2    # Bump when the cached per-directory facts change meaning
+    HELPER = ("import os, sys, json\nu, out = sys.argv[1], []\nfor d, _, _ in os.walk(u):\n"
+              "    try:\n        if os.getxattr(d, 'trusted.overlay.opaque', follow_symlinks=False) == b'y':    out.append(d)\n"
+              "    except OSError:    pass\nprint(json.dumps(out))")
+
+    def __init__(self, upper, lower=None, cache=None):
+        self.root = os.path.dirname(os.path.abspath(upper))    # Before resolving : tmpfs uppers are symlinks
+        self.upper, self.lower = os.path.realpath(upper), str(lower) if lower else None
+        self.privileged = None    # Opaque dirs from the privileged pass, per scan / compact
+        key = hashlib.sha1(self.upper.encode()).hexdigest()[:12]
+        self.cache_file = Path(cache) if cache else Utils.cache_dir("delta") / f"{key}.json"
+        try:    self.cache = json.loads(self.cache_file.read_text())
+        except (OSError, ValueError):    self.cache = {}
+        if self.cache.get("v") != self.CACHE_V:    self.cache = {"v": self.CACHE_V}
+        self.cache.setdefault("dirs", {}) ; self.cache.setdefault("totals", {})
+
+    @classmethod
+    def is_whiteout(cls, st):
+        return stat.S_ISCHR(st.st_mode) and st.st_rdev == 0
+
+    def is_opaque(self, path):
+        for attr in self.OPAQUE:
+            try:
+                if os.getxattr(path, attr, follow_symlinks=False) == b"y":    return True
+            except OSError:    pass
+        return self.privileged is not None and path in self.privileged
+
+    def _needs_helper(self):
+        """Unprivileged, on a pkexec-mounted kernel overlay whose mount does not use userxattr."""
+        if not os.geteuid():    return False
+        try:    backend = Path(self.root, ".backend").read_text().strip()
+        except OSError:    return False
+        if backend not in ("overlay", "tmpfs"):    return False
+        try:
+            with open("/proc/self/mountinfo") as f:
+                for line in f:
+                    fields = line.partition(" - ")[2].split()
+                    if len(fields) < 3 or fields[0] != "overlay":    continue
+                    opts = fields[2].split(",")
+                    if "userxattr" in opts and any(o.startswith("upperdir=") and os.path.realpath(o[9:]) == self.upper for o in opts):
+                        return False
+        except OSError:    pass
+        return True
+
+    def _load_privileged(self, strict):
+        """One pkexec pass over `upper` for trusted.overlay.opaque; raises when `strict`."""
+        self.privileged = None
+        if not self._needs_helper():    return
+        try:
+            out = subprocess.run(["pkexec", sys.executable, "-c", self.HELPER, self.upper],
+                                 check=True, capture_output=True, text=True).stdout
+            self.privileged = {os.path.realpath(p) for p in json.loads(out)}
+        except (OSError, ValueError, subprocess.CalledProcessError) as e:
+            if strict:    raise OSError(f"cannot read the overlay's opaque dirs without privileges: {e}")
+
+    def _lower_size(self, rel):
+        """Bytes the base had at `rel` ( a whole tree for a whited-out directory )."""
+        if not self.lower:    return 0
+        p = os.path.join(self.lower, rel)
+        try:    st = os.lstat(p)
+        except OSError:    return 0
+        if not stat.S_ISDIR(st.st_mode):    return st.st_size
+        return sum(os.lstat(os.path.join(d, f)).st_size for d, _, fs in os.walk(p) for f in fs)
+
+    def _list(self, path, rel):
+        """[name, kind, size, lower_size] for a changed directory; kind f/l/d/w ( whiteout )."""
+        out = []
+        with os.scandir(path) as it:
+            for e in it:
+                r = os.path.join(rel, e.name) if rel else e.name
+                if e.is_dir(follow_symlinks=False):    out.append([e.name, "d", 0, 0]) ; continue
+                st = e.stat(follow_symlinks=False)
+                if e.is_symlink():    out.append([e.name, "l", 0, 0])
+                elif self.is_whiteout(st):    out.append([e.name, "w", 0, self._lower_size(r)])
+                elif stat.S_ISREG(st.st_mode):    out.append([e.name, "f", st.st_size, self._lower_size(r)])
+        return out
+
+    def scan(self, quick=False, depth=3, top=15):
+        """Walks `upper`; `quick` trusts unchanged directories entirely ( no per-file stat )."""
+        t0 = time.perf_counter()
+        self._load_privileged(strict=False)    # A report : best effort
+        old, dirs = self.cache["dirs"], {}
+        files = nbytes = delta = read = 0
+        whiteouts, opaque, writers, rollup = [], [], [], {}
+
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.upper, rel) if rel else self.upper
+            try:    st = os.lstat(path)
+            except OSError:    continue
+            key = [st.st_ino, st.st_mtime_ns]
+
+            hit = old.get(rel)
+            if hit and hit[:2] == key:
+                entries, is_opaque = hit[2], hit[3]
+                if not quick:    # Names unchanged; contents of existing files may still grow
+                    for e in entries:
+                        if e[1] == "f":
+                            try:    e[2] = os.lstat(os.path.join(path, e[0])).st_size
+                            except OSError:    e[2] = 0
+            else:
+                try:    entries = self._list(path, rel)
+                except OSError:    continue
+                is_opaque, read = bool(rel) and self.is_opaque(path), read + 1
+            dirs[rel] = key + [entries, is_opaque]
+            if is_opaque:    opaque.append(rel)
+
+            bucket = os.path.join(*rel.split(os.sep)[:depth]) if rel else "."
+            for name, kind, size, lower in entries:
+                r = os.path.join(rel, name) if rel else name
+                if kind == "d":    stack.append(r) ; continue
+                if kind == "w":    whiteouts.append(r) ; d = -lower
+                else:
+                    d = size - lower ; files += 1 ; nbytes += size
+                    if kind == "f":    writers.append((size, r))
+                rollup[bucket] = rollup.get(bucket, 0) + d ; delta += d
+
+        prev = self.cache["totals"]
+        self.cache = {"v": self.CACHE_V, "dirs": dirs, "totals": rollup}
+        tmp = self.cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.cache)) ; os.replace(tmp, self.cache_file)
+
+        return {
+            "upper": self.upper, "files": files, "bytes": nbytes, "delta": delta,
+            "dirs": sorted(((d, b, b - prev.get(d, 0)) for d, b in rollup.items()), key=lambda x: -abs(x[1]))[:top],
+            "top": [(r, s) for s, r in heapq.nlargest(top, writers)],
+            "whiteouts": whiteouts, "opaque": opaque,
+            "scan_s": time.perf_counter() - t0, "dirs_read": read, "dirs_total": len(dirs),
+        }
+
+    @staticmethod
+    def format(rep):
+        mib = lambda b: f"{b / 2**20:+.1f} MiB"
+        lines = [f"🔍 {rep['files']} files, {rep['bytes'] / 2**20:.1f} MiB in upper ( {mib(rep['delta'])} vs base ), "
+                 f"{len(rep['whiteouts'])} whiteouts, {len(rep['opaque'])} opaque dirs; "
+                 f"scan {rep['scan_s'] * 1000:.0f} ms ( {rep['dirs_read']}/{rep['dirs_total']} dirs read )"]
+        lines += [f"   📁 {d}: {mib(b)} ( {mib(g)} since last scan )" for d, b, g in rep["dirs"]]
+        lines += [f"   ✍️ {r}: {s / 2**20:.1f} MiB" for r, s in rep["top"][:5]]
+        return "\n".join(lines)
+
+    def compact(self, name, dest=None, exclude=EXCLUDE, store=None):
+        """Base + upper ( whiteouts and opaque dirs applied, `exclude` globs dropped ) stored
+        as manifest `name`; checked out into `dest` when given. Returns ingest stats."""
+        if not self.lower:    raise ValueError("compact() needs the lower base prefix")
+        store = store or PrefixStore()
+        self._load_privileged(strict=True)    # A missed opaque dir would merge deleted base content back in
+        work = Path(tempfile.mkdtemp(prefix=f"compact-{name}-", dir=store.root))
+        try:
+            self._clone_tree(self.lower, work)
+            for dirpath, dirnames, filenames in os.walk(self.upper):
+                rel = os.path.relpath(dirpath, self.upper)
+                out = work / rel
+                if rel != "." and self.is_opaque(dirpath) and out.exists():    shutil.rmtree(out)
+                out.mkdir(parents=True, exist_ok=True)
+
+                for n in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+                    src, r = os.path.join(dirpath, n), os.path.normpath(os.path.join(rel, n))
+                    dst = out / n
+                    if os.path.isdir(dst) and not os.path.islink(dst):    shutil.rmtree(dst)
+                    elif os.path.lexists(dst):    os.unlink(dst)
+
+                    st = os.lstat(src)
+                    if self.is_whiteout(st) or any(fnmatch.fnmatch(r, g) for g in exclude):    continue
+                    if stat.S_ISLNK(st.st_mode):    os.symlink(os.readlink(src), dst)
+                    elif stat.S_ISREG(st.st_mode):    PrefixStore.clone(src, dst)
+
+            stats = store.ingest(work, name)
+            if dest:    store.checkout(name, dest)
+            return stats
+        finally:    shutil.rmtree(work, ignore_errors=True)
+
+    @staticmethod
+    def _clone_tree(src, dst):
+        for dirpath, dirnames, filenames in os.walk(src):
+            out = Path(dst) / os.path.relpath(dirpath, src)
+            out.mkdir(parents=True, exist_ok=True)
+            for n in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+                p = os.path.join(dirpath, n)
+                if os.path.islink(p):    os.symlink(os.readlink(p), out / n)
+                elif os.path.isfile(p):    PrefixStore.clone(p, out / n)
+
+
+def bench(files=100_000):
+    """Cold scan, warm rescan ( a few writes ) and quick rescan of a synthetic upper layer."""
+    with tempfile.TemporaryDirectory() as tmp:
+        upper, lower = Path(tmp) / "upper", Path(tmp) / "lower"
+        for i in range(files):
+            d = upper / "drive_c" / "Game" / f"d{i % 1000}"
+            if i < 1000:    d.mkdir(parents=True)
+            (d / f"f{i}.dat").write_bytes(b"x" * (i % 16))
+        (lower / "drive_c" / "windows").mkdir(parents=True)
+        (lower / "drive_c" / "windows" / "old.dll").write_bytes(b"x" * 4096)
+
+        delta = UpperDelta(upper, lower, cache=Path(tmp) / "cache.json")
+        cold = delta.scan()
+        for i in range(10):    (upper / "drive_c" / "Game" / f"d{i}" / f"f{i}.dat").write_bytes(b"y" * 65536)
+        warm = delta.scan()
+        quick = delta.scan(quick=True)
+
+        print(f"⏱️ {files} files : cold {cold['scan_s']:.2f}s, warm {warm['scan_s']:.2f}s "
+              f"( {warm['dirs_read']} dirs read ), quick {quick['scan_s']:.2f}s")
+        print(UpperDelta.format(warm))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]):    # python3 GUI_W_Delta.py <upper> [lower]
+        print(UpperDelta.format(UpperDelta(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None).scan()))
+    else:    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
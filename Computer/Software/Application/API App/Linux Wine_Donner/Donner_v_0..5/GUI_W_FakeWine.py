@@ -0,0 +1,99 @@
+
+import os
+import sys
+import stat
+from pathlib import Path
+
+# Stand-in for wine / wineserver / wineboot, used by the benchmarks and batch runs
+# where no real Wine is installed. Behaviour is driven by FAKE_WINE_* variables :
+#   FAKE_WINE_COLD / FAKE_WINE_WARM : seconds until the "window" without / with a running wineserver
+#   FAKE_WINE_RUN                   : seconds the "game" keeps running after its window appears
+#   FAKE_WINE_BOOT                  : seconds wineboot takes
+#   FAKE_WINE_MISSING               : comma list of DLLs reported missing unless present in system32
+#   FAKE_WINE_EXIT                  : exit code
+#   FAKE_WINETRICKS_TIME            : seconds each winetricks verb "downloads and installs"
+STUB = r'''#!/usr/bin/env python3
+import os, sys, time, socket, signal
+
+def sock_path():
+    st = os.stat(os.environ.get("WINEPREFIX") or os.path.expanduser("~/.wine"))
+    return f"/tmp/.wine-{os.getuid()}/server-{st.st_dev:x}-{st.st_ino:x}/socket"
+
+def server():
+    path = sock_path()
+    if "-k" in " ".join(sys.argv[1:]):
+        try:    os.kill(int(open(path + ".pid").read()), signal.SIGTERM)
+        except (OSError, ValueError):    pass
+        return 0
+    if "-w" in sys.argv:    return 0
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    if os.path.exists(path):    os.unlink(path)
+    s = socket.socket(socket.AF_UNIX) ; s.bind(path) ; s.listen()
+    open(path + ".pid", "w").write(str(os.getpid()))
+    def bye(*_):
+        for p in (path, path + ".pid"):
+            try:    os.unlink(p)
+            except OSError:    pass
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, bye)
+    while True:    time.sleep(3600)
+
+def wine():
+    if sys.argv[1:2] == ["--version"]:    print("wine-9.0 (fake)") ; return 0
+    warm = os.path.exists(sock_path())
+    time.sleep(float(os.environ.get("FAKE_WINE_WARM" if warm else "FAKE_WINE_COLD", "0.05" if warm else "1.0")))
+    s32 = os.path.join(os.environ.get("WINEPREFIX", ""), "drive_c", "windows", "system32")
+    exe = sys.argv[-1] if len(sys.argv) > 1 else "game.exe"
+    for dll in filter(None, os.environ.get("FAKE_WINE_MISSING", "").split(",")):
+        if not os.path.exists(os.path.join(s32, dll.lower())):
+            print(f'0024:err:module:import_dll Library {dll.upper()} (which is needed by L"{exe}") not found', flush=True)
+    print(f"fake-wine: window shown ({'warm' if warm else 'cold'})", flush=True)
+    time.sleep(float(os.environ.get("FAKE_WINE_RUN", "0")))
+    return int(os.environ.get("FAKE_WINE_EXIT", "0"))
+
+def boot():
+    time.sleep(float(os.environ.get("FAKE_WINE_BOOT", "0")))
+    return 0
+
+DLLS = {"vcrun2015": ["msvcp140", "vcruntime140", "vcomp140"], "dxvk": ["d3d9", "d3d10core", "d3d11", "dxgi"],
+        "d3dx9": ["d3dx9_43"], "xact": ["xactengine3_7", "x3daudio1_7"], "vcrun2010": ["msvcp100", "msvcr100"],
+        "xinput": ["xinput1_1", "xinput1_2", "xinput1_3"]}
+
+def winetricks():
+    prefix = os.environ.get("WINEPREFIX") or os.path.expanduser("~/.wine")
+    s32 = os.path.join(prefix, "drive_c", "windows", "system32")
+    os.makedirs(s32, exist_ok=True)
+    for verb in (a for a in sys.argv[1:] if not a.startswith("-")):
+        print(f"Executing w_do_call {verb}", flush=True)
+        time.sleep(float(os.environ.get("FAKE_WINETRICKS_TIME", "2")))
+        for dll in DLLS.get(verb, [verb]):
+            with open(os.path.join(s32, dll + ".dll"), "wb") as f:    f.write(os.urandom(65536))
+        reg = os.path.join(prefix, "user.reg")
+        text = open(reg).read() if os.path.exists(reg) else "WINE REGISTRY Version 2\n\n"
+        head = "[Software\\\\Wine\\\\DllOverrides] 1700000000\n#time=1d9\n"
+        vals = "".join(f'"{d}"="native,builtin"\n' for d in DLLS.get(verb, [verb]))
+        text = text.replace(head, head + vals) if head in text else text + "\n" + head + vals
+        open(reg, "w").write(text)
+        with open(os.path.join(prefix, "winetricks.log"), "a") as f:    f.write(verb + "\n")
+    return 0
+
+name = os.path.basename(sys.argv[0])
+sys.exit(server() if name == "wineserver" else boot() if name == "wineboot" else winetricks() if name == "winetricks" else wine())
+'''
+
+class FakeWine:
+    NAMES = ("wine", "wine64", "wineserver", "wineboot", "winetricks")
+
+    @staticmethod
+    def install(bindir):
+        """Writes the stub binaries into `bindir`; returns an env with it first on PATH."""
+        bindir = Path(bindir) ; bindir.mkdir(parents=True, exist_ok=True)
+        for name in FakeWine.NAMES:
+            p = bindir / name
+            p.write_text(STUB)
+            p.chmod(p.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        return {**os.environ, "PATH": f"{bindir}{os.pathsep}{os.environ.get('PATH', '')}"}
+
+
+if __name__ == "__main__":
+    print(FakeWine.install(sys.argv[1] if len(sys.argv) > 1 else "fake-wine-bin")["PATH"])
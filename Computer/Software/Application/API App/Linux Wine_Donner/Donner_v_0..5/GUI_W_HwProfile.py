@@ -0,0 +1,120 @@
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import resource
+import subprocess
+
+from GUI_W_Runner_Builder import Utils
+
+class HwProfile:
+    """Host facts used by Build._command, probed once and cached on disk.
+
+    The cache key covers the DRM device list, the kernel release and the mtimes
+    of the PATH and Vulkan ICD directories, so new GPUs, kernels, drivers or
+    installed tools invalidate it.
+    """
+    DRM = "/sys/class/drm"
+    ICD_DIRS = ("/usr/share/vulkan/icd.d", "/usr/local/share/vulkan/icd.d", "/etc/vulkan/icd.d")
+    VERSION = 2    # Bump when probe() gains keys : cached profiles reprobe
+    _profile = None
+    _nofile_done = False
+
+    @staticmethod
+    def cache_file():    return Utils.cache_dir() / "hwprofile.json"
+
+    @staticmethod
+    def key():
+        try:    drm = sorted(os.listdir(HwProfile.DRM))
+        except OSError:    drm = []
+
+        parts = [str(HwProfile.VERSION), ",".join(drm), os.uname().release]
+        for d in os.environ.get("PATH", "").split(os.pathsep) + list(HwProfile.ICD_DIRS):
+            try:    parts.append(f"{d}:{os.stat(d).st_mtime_ns}")
+            except OSError:    pass
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    @classmethod
+    def get(cls, reprobe=False):
+        if cls._profile and not reprobe:    return cls._profile
+
+        key, path, prof = cls.key(), cls.cache_file(), None
+        if not reprobe:
+            try:
+                with open(path) as f: data = json.load(f)
+                if data.get("key") == key:    prof = data["profile"]
+            except (OSError, ValueError):    pass
+
+        if prof is None:
+            prof = cls.probe()
+            try:
+                tmp = path.with_suffix(".tmp")
+                with open(tmp, "w") as f:    json.dump({"key": key, "profile": prof}, f, indent=2)
+                os.replace(tmp, path)
+            except OSError:    pass
+
+        cls._raise_nofile(prof)
+        cls._profile = prof
+        return prof
+
+    @staticmethod
+    def probe():
+        mem_gb, cores = Utils.get_ram_cpucores()
+
+        vendors = []
+        try:
+            for d in sorted(f for f in os.listdir(HwProfile.DRM) if f.startswith('card')):
+                p = f'{HwProfile.DRM}/{d}/device/vendor'
+                if os.path.exists(p):
+                    with open(p) as f: v = f.read().strip().lower()
+                    if v not in vendors: vendors.append(v)
+        except OSError:    pass
+
+        try:    nofile_hard = resource.getrlimit(resource.RLIMIT_NOFILE)[1]
+        except (ValueError, OSError):    nofile_hard = 0
+
+        return {
+            "mem_gb": round(mem_gb, 2), "cores": cores, "gpu_vendors": vendors,
+            "ionice": shutil.which("ionice"), "taskset": shutil.which("taskset"), "gamescope": shutil.which("gamescope"),
+            "gamemoderun": shutil.which("gamemoderun"), "vk_icds": HwProfile.probe_icds(),
+            "nofile_hard": nofile_hard, "vulkan": HwProfile.probe_vulkan(),
+            "probed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    @staticmethod
+    def probe_icds():
+        """Vulkan ICD manifests, for picking the driver of the game's GPU."""
+        out = []
+        for d in HwProfile.ICD_DIRS:
+            try:    out += sorted(os.path.join(d, f) for f in os.listdir(d) if f.endswith(".json"))
+            except OSError:    pass
+        return out
+
+    @staticmethod
+    def probe_vulkan():
+        """Device names reported by vulkaninfo ( empty when Vulkan is unusable )."""
+        if not shutil.which("vulkaninfo"):    return []
+        try:
+            out = subprocess.run(["vulkaninfo", "--summary"], capture_output=True, text=True, timeout=5).stdout
+            return sorted({l.split("=", 1)[1].strip() for l in out.splitlines() if "deviceName" in l and "=" in l})
+        except (subprocess.SubprocessError, OSError):    return []
+
+    @classmethod
+    def _raise_nofile(cls, prof):
+        if cls._nofile_done:    return
+        cls._nofile_done = True
+        try:
+            if prof["nofile_hard"] >= 524288:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (prof["nofile_hard"], prof["nofile_hard"]))
+        except (ValueError, OSError):    pass
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter() ; prof = HwProfile.get(reprobe="--reprobe" in sys.argv)
+    t1 = time.perf_counter() ; HwProfile.get()
+    t2 = time.perf_counter()
+    print(json.dumps(prof, indent=2))
+    print(f"⏱️ first get {(t1 - t0) * 1e3:.2f} ms, cached get {(t2 - t1) * 1e6:.1f} µs")
@@ -0,0 +1,166 @@
+
+import os
+import pty
+import signal
+import asyncio
+import time
+import hashlib
+import itertools
+import subprocess
+
+from GUI_W_Runner_Builder import Build, Utils
+from GUI_W_LogPipe import LogPipe
+from GUI_W_Analyzer import DllAnalyzer
+from GUI_W_Telemetry import Telemetry
+from GUI_W_Recorder import Recorder
+from GUI_W_Supervisor import Supervisor
+from GUI_W_ShaderCache import ShaderCache
+
+class Launch:
+    """Launch-and-Analyze without Qt : `log` is any callable, run() returns success.
+    RunAnalyze runs run_async() on the Supervisor loop for the GUI; Headless.py calls run()."""
+
+    _seq = itertools.count(1)    # Run number within this process, for unique recording / telemetry names
+
+    def __init__(self, exe_path, exe_file, pool=None, bprefix_path=None, keeper=None, cpus=None,
+                 log=print, tprefix=None, timeout=None, profile=None, on_sample=None):
+        self.log, self.timeout, self.profile = log, timeout, profile    # LaunchProfile, default : empty one
+        self.on_sample = on_sample    # Called with the Telemetry on every sample ( GUI sparklines )
+        self.exe_path = os.path.abspath(exe_path)
+        self.exe_file = os.path.abspath(exe_file)
+        self.tprefix  = tprefix or os.path.join(self.exe_path, ".wine_temp_noverlay", "merged")
+        self.pool, self.bprefix_path, self.slot = pool, bprefix_path, None
+        self.keeper = keeper    # WineServerKeeper when warm start is enabled
+        self.cpus = cpus        # Core set from SessionScheduler ( batch runs )
+        self.proc, self.result, self.shaders = None, {}, None
+
+    def run(self):
+
+        master, t0 = None, time.monotonic()
+        try:
+            master = self._start_process(*self._prepare(), self.exe_path)
+            return self._read_logs(master)   
+
+        except Exception as e:  self.log(f"❌ Failure: {str(e)}") ; self.result["error"] = str(e) ; return False
+        finally:    self._release(master, t0)
+
+    async def run_async(self):
+        """run() as a Supervisor coroutine : blocking setup / teardown go to its executor, the
+        game output is read on the event loop, and cancelling kills the process group."""
+        master, t0 = None, time.monotonic()
+        try:
+            cmd, env = await Supervisor.blocking(self._prepare)
+            master = self._start_process(cmd, env, self.exe_path)
+            return await self._read_logs_async(master)
+
+        except asyncio.CancelledError:    self.log("⏹️ Cancelled.") ; self.result["error"] = "cancelled" ; raise
+        except Exception as e:  self.log(f"❌ Failure: {str(e)}") ; self.result["error"] = str(e) ; return False
+        finally:    await Supervisor.blocking(self._release, master, t0)
+
+    def _prepare(self):
+        if self.pool and not os.path.isdir(self.tprefix):    # No exe-local Temp Prefix : take a pooled one
+            self.slot = self.pool.acquire(self.bprefix_path)
+            self.tprefix = self.slot.merged
+            self.log(self.pool.metrics())
+
+        checked = self.slot.base if self.slot else self.tprefix    # A fresh slot is its base : no per-slot indexing
+        if self.profile and (bad := {t: d for t, (ok, d) in self.profile.check(checked).items() if not ok}):
+            self.log("⚠️ Toggles off for this launch : " + "; ".join(f"{t} ( {d} )" for t, d in bad.items()))
+            self.result["toggles_off"], self.profile = bad, self.profile.without(bad)
+        cmd, env = Build._command(self.exe_file, self.tprefix, self.cpus, self.profile)
+        if self.profile:    self.result["profile"] = str(self.profile)
+        if os.environ.get("DONNER_SHADER_CACHE", "1") != "0":    # Caches outlive the disposable prefix
+            try:    self.shaders = ShaderCache(self.exe_file, log=self.log) ; env.update(self.shaders.begin())
+            except OSError as e:    self.shaders = None ; self.log(f"❌ Shader cache unavailable: {e}")
+
+        self.log(f"📂 Temporary Prefix found At:{self.tprefix}")
+        if self.keeper:
+            warm = self.keeper.begin(self.tprefix, env)
+            self.log("🔥 Reusing warm wineserver." if warm else "🧊 Started persistent wineserver.")
+        self.log(f"⏳ Launching : {' '.join(cmd)}\n")
+        return cmd, env
+
+    def _release(self, master, t0):
+        self.result["seconds"] = round(time.monotonic() - t0, 3)
+        self._cleanup(master) # 4. Final Cleanup
+        if self.keeper:    self.keeper.end(self.tprefix)
+        if self.slot:    # A pooled prefix is disposable : its server goes with it
+            if self.keeper:    self.keeper.stop(self.tprefix)
+            self.pool.release(self.slot)
+
+
+    def _start_process(self, cmd, env, cwd):
+        master, slave = pty.openpty()
+        
+        self.proc = subprocess.Popen(
+            cmd, env=env, cwd=cwd,
+            text=True, 
+            preexec_fn=os.setsid,  # Creates a process group for clean cleanup
+            stdout=slave, 
+            stderr=slave, 
+            stdin=slave,
+            close_fds=True
+        )
+        os.close(slave)  # Close slave in parent; proc uses it
+        return master
+
+    def _sinks(self, loop=None):
+        pipe, analyzer = LogPipe(), DllAnalyzer()
+        tel = Telemetry(self.proc.pid, on_sample=self.on_sample).start(loop)    # setsid : pgid == pid
+        pipe.sinks += [analyzer.feed, tel.feed_line]
+        Recorder.prune()
+        uniq = f"{hashlib.sha1(self.exe_file.encode()).hexdigest()[:6]}-{os.getpid()}-{next(self._seq)}"    # Same-named / parallel runs
+        stem = f"{os.path.splitext(os.path.basename(self.exe_file))[0]}-{time.strftime('%Y%m%d-%H%M%S')}-{uniq}"
+        rec = Recorder(stem, {"exe": self.exe_file, "profile": self.result.get("profile")})
+        pipe.raw.append(rec.feed)
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        return pipe, analyzer, tel, rec, stem, deadline
+
+    def _read_logs(self, master):
+        pipe, analyzer, tel, rec, stem, deadline = self._sinks()
+        try:    pipe.pump(master, lambda: self.proc.poll() is None, self.log, deadline)
+        finally:    tel.stop() ; self.result["recording"] = rec.close()
+        return self._finish(pipe, analyzer, tel, stem, deadline)
+
+    async def _read_logs_async(self, master):
+        pipe, analyzer, tel, rec, stem, deadline = self._sinks(asyncio.get_running_loop())
+        try:    await pipe.apump(master, lambda: self.proc.poll() is None, self.log, deadline)
+        finally:    tel.stop() ; self.result["recording"] = rec.close()
+        return await Supervisor.blocking(self._finish, pipe, analyzer, tel, stem, deadline)
+
+    def _finish(self, pipe, analyzer, tel, stem, deadline):
+        timed_out = bool(deadline) and time.monotonic() >= deadline and self.proc.poll() is None
+        if timed_out:    self.log(f"⏱️ Time limit of {self.timeout}s reached, stopping.") ; self._cleanup(None)
+        ret = self.proc.wait() 
+        self.result.update(returncode=ret, timed_out=timed_out, missing_dlls=analyzer.missing(), lines=pipe.total)
+        self.log(pipe.stats())
+        self.log(analyzer.summary())
+        self.log(tel.summary())
+        if self.shaders:
+            try:    self.result["shaders"] = self.shaders.end(tel) ; self.log(ShaderCache.format(self.result["shaders"]))
+            except OSError as e:    self.log(f"❌ Shader cache not updated: {e}")
+        try:
+            meta = {"exe": self.exe_file, "profile": self.result.get("profile"), "cpus": self.cpus}
+            self.result["telemetry"] = tel.save(Utils.cache_dir("telemetry") / f"{stem}.dtel", meta)
+        except OSError as e:    self.log(f"❌ Telemetry not written: {e}")
+        try:    self.log(f"📝 Report: {self.result.setdefault('report', analyzer.write_report(self.exe_path))}")
+        except OSError as e:    self.log(f"❌ Report not written: {e}")
+        self.log(f"\n⏹️ Process Closed with code: {ret}")
+        return ret == 0 or timed_out    # Reaching the time limit alive counts as a successful analysis
+
+    def _cleanup(self, master):
+
+        if master:
+            try:    os.close(master)
+            except OSError:    pass
+
+        if self.proc and self.proc.poll() is None:
+            try:
+                pgid = os.getpgid(self.proc.pid)
+                for sig in [signal.SIGTERM, signal.SIGKILL]:
+                    try:
+                        os.killpg(pgid, sig)
+                        self.proc.wait(timeout=2)
+                        break
+                    except (subprocess.TimeoutExpired, ProcessLookupError):    continue
+            except Exception:    pass
@@ -0,0 +1,147 @@
+
+import os
+import sys
+import time
+import random
+import select
+import asyncio
+import threading
+from collections import deque
+
+class LogPipe:
+    """Reads a PTY in large chunks and hands lines out as frame-rate batches.
+
+    The PTY is always read at full speed and every line reaches the sinks; only what is
+    emitted is bounded : past `max_pending` waiting lines the oldest are dropped ( counted
+    in `dropped` ), so a chatty game never blocks on its output.
+    """
+
+    def __init__(self, fps=30, max_batch=2000, max_pending=20000, chunk=1 << 16):
+        self.interval, self.max_batch, self.max_pending, self.chunk = 1.0 / fps, max_batch, max_pending, chunk
+        self.pending, self.partial = deque(), b""      # pending : [line, repeat-count]
+        self.total = self.dropped = self.merged = self.batches = 0
+        self.sinks = []                                 # Extra per-line consumers (analyzers, telemetry)
+        self.raw = []                                   # Consumers of the undecoded chunks (recorder)
+        self._next = time.monotonic() + self.interval
+
+    def feed(self, data: bytes):
+        for sink in self.raw: sink(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        for raw in lines:
+            line = raw.decode(errors="ignore").strip()
+            if line: self._push(line)
+
+    def _push(self, line):
+        self.total += 1
+        for sink in self.sinks: sink(line)
+
+        if self.pending and self.pending[-1][0] == line:    # Collapse repeats ( fixme spam, HUD lines )
+            self.pending[-1][1] += 1 ; self.merged += 1 ; return
+
+        self.pending.append([line, 1])
+        while len(self.pending) > self.max_pending:          # Bound the GUI backlog : keep the tail, count the loss
+            self.dropped += self.pending.popleft()[1]
+
+    def flush(self, emit, limit=None):
+        self._next = time.monotonic() + self.interval
+        n = min(len(self.pending), limit or self.max_batch)
+        if not n: return
+
+        out = []
+        for _ in range(n):
+            line, count = self.pending.popleft()
+            out.append(line if count == 1 else f"{line}  (×{count})")
+        self.batches += 1
+        emit("\n".join(out))
+
+    def pump(self, fd, alive, emit, deadline=None):
+        """Drains `fd` until EOF / process exit / `deadline`, calling `emit` at most once per frame."""
+        os.set_blocking(fd, False)
+        while deadline is None or time.monotonic() < deadline:
+            r, _, _ = select.select([fd], [], [], max(0.0, self._next - time.monotonic()))
+            if r:
+                try:    data = os.read(fd, self.chunk)
+                except BlockingIOError:    data = None
+                except OSError:    data = b""     # EIO : PTY slave closed
+                if data == b"":    break
+                if data:    self.feed(data)
+
+            if time.monotonic() >= self._next:    self.flush(emit)
+            if not r and not alive():    break
+
+        if self.partial:    self.feed(b"\n")
+        while self.pending:    self.flush(emit, limit=len(self.pending))
+
+    async def apump(self, fd, alive, emit, deadline=None):
+        """pump() on an asyncio loop : `fd` is watched with add_reader, no thread blocks on it."""
+        loop, ready = asyncio.get_running_loop(), asyncio.Event()
+        os.set_blocking(fd, False)
+        loop.add_reader(fd, ready.set)
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                try:    await asyncio.wait_for(ready.wait(), max(0.0, self._next - time.monotonic()))
+                except asyncio.TimeoutError:    pass
+                got = ready.is_set()
+                if got:
+                    ready.clear()
+                    try:    data = os.read(fd, self.chunk)
+                    except BlockingIOError:    data = None
+                    except OSError:    data = b""     # EIO : PTY slave closed
+                    if data == b"":    break
+                    if data:    self.feed(data)
+
+                if time.monotonic() >= self._next:    self.flush(emit)
+                if not got and not alive():    break
+        finally:    loop.remove_reader(fd)
+
+        if self.partial:    self.feed(b"\n")
+        while self.pending:    self.flush(emit, limit=len(self.pending))
+
+    def stats(self):
+        return f"📊 Logs: {self.total} lines, {self.merged} merged, {self.dropped} dropped, {self.batches} batches"
+
+    @staticmethod
+    def synthetic(n, seed=7):
+        """Wine-like log lines : fixme/err/trace noise, repeated HUD lines and missing-DLL errors."""
+        rnd = random.Random(seed)
+        dlls = ["msvcp140.dll", "vcruntime140.dll", "d3dcompiler_47.dll", "xinput1_3.dll", "mfplat.dll", "dinput8.dll"]
+        kinds = [
+            lambda t: f"{t:.3f}:0024:fixme:ntdll:NtQuerySystemInformation info_class SYSTEM_PERFORMANCE_INFORMATION",
+            lambda t: f"{t:.3f}:0024:err:module:import_dll Library {rnd.choice(dlls).upper()} (which is needed by L\"C:\\game\\game.exe\") not found",
+            lambda t: f"{t:.3f}:0024:err:module:LdrInitializeThunk Importing dlls for L\"C:\\game\\game.exe\" failed, status c0000135",
+            lambda t: f"{t:.3f}:0030:warn:module:load_dll Failed to load module L\"{rnd.choice(dlls)}\"; status=c0000135",
+            lambda t: f"{t:.3f}:0030:trace:d3d:wined3d_device_context_draw device_context {rnd.randrange(1 << 32):#x}",
+            lambda t: "info:  DXVK: v2.3 frame time 16.6 ms",
+        ]
+        weights = [30, 2, 1, 3, 50, 14]
+        t = 0.0
+        for _ in range(n):
+            t += rnd.random() / 1000
+            yield rnd.choices(kinds, weights)[0](t)
+
+
+def bench(n=500_000):
+    """Replays a synthetic Wine log through a pipe and reports throughput / batching."""
+    data = ("\n".join(LogPipe.synthetic(n)) + "\n").encode()
+    r, w = os.pipe()
+
+    def writer():
+        view = memoryview(data)
+        while view:    view = view[os.write(w, view[:1 << 16]):]
+        os.close(w)
+
+    pipe, emitted = LogPipe(), [0]
+    threading.Thread(target=writer, daemon=True).start()
+    t0 = time.perf_counter()
+    pipe.pump(r, lambda: True, lambda batch: emitted.__setitem__(0, emitted[0] + 1))
+    dt = time.perf_counter() - t0
+    os.close(r)
+
+    print(f"⏱️ {n} lines / {len(data) / 2**20:.1f} MiB in {dt:.2f}s -> {n / dt:,.0f} lines/s")
+    print(f"📨 {emitted[0]} signals instead of {n} ( {emitted[0] / dt:.1f}/s )")
+    print(pipe.stats())
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,74 @@
+
+import os
+import sys
+import gzip
+import time
+import tempfile
+import statistics
+
+from GUI_W_Runner_Builder import Utils
+
+class LogRing:
+    """Fixed-capacity line buffer; the full stream is spilled to a gzip file."""
+
+    def __init__(self, capacity=20000, spill=None):
+        self.cap, self.buf = capacity, [None] * capacity
+        self.head = self.size = 0
+        self.spill_path = spill
+        self.spill = gzip.open(spill, "at", compresslevel=1, errors="ignore") if spill else None
+
+    @staticmethod
+    def session_file():
+        return Utils.cache_dir("logs") / time.strftime("session-%Y%m%d-%H%M%S.log.gz")
+
+    def __len__(self):    return self.size
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size: raise IndexError(i)
+        return self.buf[(self.head + i) % self.cap]
+
+    def discard(self, n):
+        """Forgets the `n` oldest lines ( they are already in the spill file )."""
+        n = max(0, min(n, self.size))
+        for _ in range(n):
+            self.buf[self.head] = None ; self.head = (self.head + 1) % self.cap
+        self.size -= n
+
+    def extend(self, lines):
+        if self.spill:    self.spill.write("\n".join(lines) + "\n")
+        lines = lines[-self.cap:]
+        self.discard(self.size + len(lines) - self.cap)
+        for line in lines:
+            self.buf[(self.head + self.size) % self.cap] = line ; self.size += 1
+
+    def append(self, line):    self.extend([line])
+
+    def close(self):
+        if self.spill:    self.spill.close() ; self.spill = None
+
+
+def bench(n=1_000_000, batch=1):
+    """Append latency at `n` lines with the gzip spill enabled."""
+    from GUI_W_LogPipe import LogPipe
+
+    lines = list(LogPipe.synthetic(n))
+    with tempfile.TemporaryDirectory() as tmp:
+        ring, lat = LogRing(spill=f"{tmp}/bench.log.gz"), []
+        t0 = time.perf_counter()
+        for i in range(0, n, batch):
+            t = time.perf_counter_ns()
+            ring.extend(lines[i:i + batch])
+            lat.append(time.perf_counter_ns() - t)
+        ring.close()
+        dt = time.perf_counter() - t0
+        size = sum(len(l) + 1 for l in lines)
+        packed = os.path.getsize(f"{tmp}/bench.log.gz")
+
+    q = statistics.quantiles(lat, n=100)
+    print(f"⏱️ {n} lines ( batch {batch} ) in {dt:.2f}s : mean {statistics.fmean(lat) / 1000:.2f}µs, "
+          f"p50 {q[49] / 1000:.2f}µs, p99 {q[98] / 1000:.2f}µs per append")
+    print(f"💾 Ring holds {len(ring)} lines; spill {size / 2**20:.1f} MiB -> {packed / 2**20:.1f} MiB gzip")
+
+
+if __name__ == "__main__":
+    bench(*(int(a) for a in sys.argv[1:3]))
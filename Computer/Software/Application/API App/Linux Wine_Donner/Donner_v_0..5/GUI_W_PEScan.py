@@ -0,0 +1,257 @@
+
+import os
+import sys
+import json
+import mmap
+import time
+import glob
+import struct
+import hashlib
+import tempfile
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+
+class PEScan:
+    """Missing DLLs of an exe found from its PE headers, without starting Wine.
+
+    The exe and every DLL it resolves to ( game dir first, then the base prefix's
+    system32 / syswow64 for its arch, then Wine's own builtin dirs ) are memory-mapped
+    and their import and delay-import tables walked recursively. Parsed tables are
+    cached by content hash, the hash by ( size, mtime, inode ), so a rescan only stats.
+    """
+    MACHINES = {0x14c: "win32", 0x8664: "win64", 0xaa64: "arm64"}
+    APISET = ("api-ms-win-", "ext-ms-win-")    # Virtual, always provided by Wine
+    BUILTIN = (b"Wine builtin DLL", b"Wine placeholder DLL")    # Stock prefix stubs, at offset 0x40
+    WINE_LIBS = ("/usr/lib/wine", "/usr/lib64/wine", "/usr/lib/*-linux-gnu/wine", "/opt/wine*/lib*/wine",
+                 "/usr/local/lib/wine", "/usr/local/lib64/wine")
+
+    def __init__(self, prefix=None, cache=None):
+        self.prefix = Path(prefix) if prefix else None
+        self.cache_file = Path(cache) if cache else Utils.cache_dir("pescan") / "cache.json"
+        try:    self.cache = json.loads(self.cache_file.read_text())
+        except (OSError, ValueError):    self.cache = {}
+        self.cache.setdefault("files", {}) ; self.cache.setdefault("pe", {})
+        self.dirty = False
+
+    # PE parsing
+
+    @classmethod
+    def parse(cls, path):
+        """{"arch", "imports", "delay", "version", "builtin"} of a PE file; ValueError if it is not one."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < 0x40:    raise ValueError("not a PE file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:    return cls._parse(m)
+
+    @classmethod
+    def _parse(cls, m):
+        u16 = lambda o: struct.unpack_from("<H", m, o)[0]
+        u32 = lambda o: struct.unpack_from("<I", m, o)[0]
+        if m[:2] != b"MZ":    raise ValueError("no MZ header")
+        pe = u32(0x3C)
+        if m[pe:pe + 4] != b"PE\0\0":    raise ValueError("no PE header")
+
+        machine, nsect, opt_size = u16(pe + 4), u16(pe + 6), u16(pe + 20)
+        opt = pe + 24
+        plus = u16(opt) == 0x20B
+        base = struct.unpack_from("<Q", m, opt + 24)[0] if plus else u32(opt + 28)
+        dirs, ndirs = opt + (112 if plus else 96), u32(opt + (108 if plus else 92))
+        sections = [struct.unpack_from("<8xIIII", m, opt + opt_size + 40 * i) for i in range(nsect)]
+
+        def offset(rva):
+            for vsize, va, raw_size, raw in sections:
+                if va <= rva < va + max(vsize, raw_size):    return rva - va + raw
+            return rva if rva < len(m) else None    # Headers / unsectioned images
+
+        def cstr(rva):
+            o = offset(rva)
+            if o is None:    return None
+            end = m.find(b"\0", o, o + 256)
+            return m[o:end].decode("ascii", "replace") if end > o else None
+
+        def table(index, size, name_at, attr=False):
+            if ndirs <= index:    return []
+            rva = u32(dirs + 8 * index)
+            o, names = offset(rva) if rva else None, []
+            while o is not None and o + size <= len(m):
+                name_rva = u32(o + name_at)
+                if not name_rva:    break
+                if attr and not u32(o) & 1:    name_rva -= base    # Old delay tables hold VAs
+                if name := cstr(name_rva):    names.append(name)
+                o += size
+            return names
+
+        def version():    # RT_VERSION -> first name -> first language -> VS_FIXEDFILEINFO
+            rva = u32(dirs + 16) if ndirs > 2 else 0
+            root = offset(rva) if rva else None
+            if root is None:    return None
+            entries = lambda o: [struct.unpack_from("<II", m, o + 16 + 8 * i) for i in range(u16(o + 12) + u16(o + 14))]
+            node = next((off for ident, off in entries(root) if ident == 16), None)
+            for _ in range(2):
+                if node is None or not node & 0x80000000:    return None
+                sub = entries(root + (node & 0x7FFFFFFF))
+                node = sub[0][1] if sub else None
+            if node is None or node & 0x80000000:    return None
+            data, size = struct.unpack_from("<II", m, root + node)
+            o = offset(data)
+            i = m.find(b"\xbd\x04\xef\xfe", o, o + min(size, 512)) if o is not None else -1
+            if i < 0:    return None
+            ms, ls = struct.unpack_from("<II", m, i + 8)
+            return f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+
+        return {"arch": cls.MACHINES.get(machine, hex(machine)), "imports": table(1, 20, 12),
+                "delay": table(13, 32, 4, attr=True), "version": version(),
+                "builtin": any(b in m[0x40:0x60] for b in cls.BUILTIN)}
+
+    @classmethod
+    def is_builtin(cls, path):
+        try:
+            with open(path, "rb") as f:    head = f.read(0x60)
+        except OSError:    return True
+        return any(b in head[0x40:] for b in cls.BUILTIN)
+
+    def info(self, path):
+        """parse() through the cache; returns ( info, cache hit )."""
+        st = os.stat(path)
+        key = [st.st_size, st.st_mtime_ns, st.st_ino]
+        hit = self.cache["files"].get(path)
+        if hit and hit[:3] == key and hit[3] in self.cache["pe"]:    return self.cache["pe"][hit[3]], True
+
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            if st.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:    h.update(m)
+        digest = h.hexdigest()
+        pe = self.cache["pe"].get(digest)
+        if pe is None:
+            try:    pe = self.parse(path)
+            except (ValueError, struct.error) as e:    pe = {"error": str(e)}
+            self.cache["pe"][digest] = pe
+        self.cache["files"][path] = key + [digest] ; self.dirty = True
+        return pe, False
+
+    # Resolution
+
+    def search_dirs(self, arch):
+        """DLL dirs for `arch`, in Wine's search order after the exe's own dir."""
+        out = []
+        if self.prefix:
+            wow = (self.prefix / "drive_c/windows/syswow64").is_dir()
+            out.append(self.prefix / "drive_c/windows" / ("syswow64" if wow and arch == "win32" else "system32"))
+        sub = {"win32": "i386-windows", "win64": "x86_64-windows", "arm64": "aarch64-windows"}.get(arch)
+        for pat in [*os.environ.get("WINEDLLPATH", "").split(os.pathsep), *self.WINE_LIBS]:
+            if pat and sub:    out += [Path(p) / sub for p in glob.glob(pat)]
+        return [d for d in out if d.is_dir()]
+
+    @staticmethod
+    def _listing(d):
+        try:
+            with os.scandir(d) as it:    return {e.name.lower(): e.path for e in it if e.name.lower().endswith((".dll", ".drv", ".sys", ".exe"))}
+        except OSError:    return {}
+
+    def scan(self, exe):
+        t0 = time.perf_counter()
+        exe = os.path.abspath(exe)
+        top, top_hit = self.info(exe)
+        if "error" in top:    return {"exe": exe, "error": top["error"], "ms": (time.perf_counter() - t0) * 1000}
+
+        index, game, dirs = {}, os.path.dirname(exe), self.search_dirs(top["arch"])
+        for d in reversed(dirs):    index.update(self._listing(d))
+        index.update(self._listing(game))    # The exe's dir wins
+
+        missing, delay, found, apisets = {}, {}, set(), set()
+        queue, seen, parsed, hits = [exe], {exe}, 0, 0
+        while queue:
+            path = queue.pop()
+            pe, hit = self.info(path) if path != exe else (top, top_hit)
+            parsed += not hit ; hits += hit
+            if "error" in pe:    continue
+            for kind, names in (("imports", pe["imports"]), ("delay", pe["delay"])):
+                for name in names:
+                    low = name.lower() if "." in name else f"{name.lower()}.dll"
+                    if low.startswith(self.APISET):    apisets.add(low) ; continue
+                    dll = index.get(low)
+                    if dll is None:
+                        (missing if kind == "imports" else delay).setdefault(low, []).append(os.path.basename(path)) ; continue
+                    found.add(low)
+                    if dll not in seen and (dll.startswith(game) or not self.is_builtin(dll)):
+                        seen.add(dll) ; queue.append(dll)
+
+        if self.dirty:
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.cache)) ; os.replace(tmp, self.cache_file) ; self.dirty = False
+        for d in missing:    delay.pop(d, None)
+        return {"exe": exe, "arch": top["arch"], "missing": missing, "delay_missing": delay, "found": len(found), "dirs": len(dirs),
+                "apisets": len(apisets), "parsed": parsed, "cached": hits, "ms": (time.perf_counter() - t0) * 1000}
+
+    @staticmethod
+    def format(rep):
+        name = os.path.basename(rep["exe"])
+        if "error" in rep:    return f"🔬 {name}: not scanned ( {rep['error']} )"
+        by = lambda d: ", ".join(f"{k} ( {', '.join(sorted(set(v))[:3])} )" for k, v in sorted(d.items()))
+        out = f"🔬 PE scan {name} ( {rep['arch']} ): {rep['found']} DLLs resolved, {rep['apisets']} api-sets, "
+        out += f"{rep['parsed']} files parsed, {rep['cached']} cached, {rep['ms']:.1f} ms"
+        out += f"\n❗ Missing imports: {by(rep['missing'])}" if rep["missing"] else "\n✅ No missing imports."
+        if rep["delay_missing"]:    out += f"\n⚠️ Missing delay-loaded: {by(rep['delay_missing'])}"
+        if not rep["dirs"]:    out += "\n⚠️ No Base Prefix or Wine DLL dir to check against : system DLLs count as missing."
+        return out
+
+
+def _pe(path, imports=(), delay=(), machine=0x8664, stub=False, version=None):
+    """Minimal PE32+ image with one section holding the import / delay-import tables
+    ( and a version resource when `version` is an ( a, b, c, d ) tuple )."""
+    names, blob = {}, bytearray()
+    idata, rva0 = 0x1000, 0x1000
+    table = 20 * (len(imports) + 1) + 32 * (len(delay) + 1)
+    for n in (*imports, *delay):
+        names[n] = rva0 + table + len(blob) ; blob += n.encode() + b"\0"
+    sect = b"".join(struct.pack("<12xI4x", names[n]) for n in imports) + bytes(20)
+    sect += b"".join(struct.pack("<II24x", 1, names[n]) for n in delay) + bytes(32) + blob
+    sect += bytes(-len(sect) % 4)
+    res = rva0 + len(sect)
+    if version:
+        a, b, c, d = version
+        info = bytes(6) + "VS_VERSION_INFO\0".encode("utf-16le") + bytes(2)
+        info += struct.pack("<IIII", 0xFEEF04BD, 0x10000, a << 16 | b, c << 16 | d) + bytes(36)
+        level = lambda ident, off: struct.pack("<IIHHHH", 0, 0, 0, 0, 0, 1) + struct.pack("<II", ident, off)
+        sect += level(16, 0x80000018) + level(1, 0x80000030) + level(0x409, 0x48)
+        sect += struct.pack("<IIII", res + 0x58, len(info), 0, 0) + info
+
+    head = bytearray(0x200)
+    head[:2], head[0x3C:0x40] = b"MZ", struct.pack("<I", 0x80)
+    if stub:    head[0x40:0x50] = b"Wine builtin DLL"
+    head[0x80:0x84] = b"PE\0\0"
+    struct.pack_into("<HHIIIHH", head, 0x84, machine, 1, 0, 0, 0, 240, 0x2022)
+    opt = 0x98
+    struct.pack_into("<H", head, opt, 0x20B) ; struct.pack_into("<Q", head, opt + 24, 0x140000000)
+    struct.pack_into("<I", head, opt + 108, 16)
+    struct.pack_into("<II", head, opt + 112 + 8, rva0, 20 * (len(imports) + 1))
+    struct.pack_into("<II", head, opt + 112 + 8 * 13, rva0 + 20 * (len(imports) + 1), 32 * (len(delay) + 1))
+    if version:    struct.pack_into("<II", head, opt + 112 + 8 * 2, res, 0x58)
+    struct.pack_into("<8sIIII", head, opt + 240, b".idata", len(sect), idata, len(sect), 0x200)
+    Path(path).write_bytes(bytes(head) + sect)
+
+def bench(dlls=60, prefix_files=3000):
+    """Cold scan ( hash + parse ) vs cached rescan of a synthetic game against a synthetic prefix."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        s32 = tmp / "prefix/drive_c/windows/system32" ; s32.mkdir(parents=True)
+        for i in range(prefix_files):    _pe(s32 / f"lib{i}.dll", ["kernel32.dll"], stub=True)
+        _pe(s32 / "kernel32.dll", stub=True)
+        game = tmp / "game" ; game.mkdir()
+        for i in range(dlls):    # A chain of engine DLLs, each pulling in more of the prefix
+            _pe(game / f"engine{i}.dll", [f"engine{i + 1}.dll" if i + 1 < dlls else "msvcp140.dll", f"lib{i}.dll",
+                                          "api-ms-win-crt-runtime-l1-1-0.dll"], ["xinput1_3.dll"] if i == 7 else [])
+        _pe(game / "game.exe", ["engine0.dll", "kernel32.dll", "d3dx9_43.dll"])
+
+        scan = PEScan(tmp / "prefix", cache=tmp / "cache.json")
+        for label in ("cold", "warm"):
+            rep = scan.scan(game / "game.exe")
+            print(f"⏱️ {label}: {rep['ms']:.1f} ms, {rep['parsed']} parsed, {rep['cached']} cached")
+        print(PEScan.format(rep))
+
+
+if __name__ == "__main__":
+    # python3 GUI_W_PEScan.py GAME.exe [BASE_PREFIX]
+    if len(sys.argv) > 1:    print(PEScan.format(PEScan(sys.argv[2] if len(sys.argv) > 2 else None).scan(sys.argv[1])))
+    else:    bench()
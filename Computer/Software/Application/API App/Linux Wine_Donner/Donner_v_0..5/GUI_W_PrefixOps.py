@@ -0,0 +1,152 @@
+
+import os, time, asyncio, subprocess
+from pathlib import Path
+
+from GUI_W_PrefixStore import PrefixStore
+from GUI_W_Teardown import Teardown
+from GUI_W_Delta import UpperDelta
+from GUI_W_Backends import Backends
+from GUI_W_Catalog import PrefixCatalog
+from GUI_W_VerbCache import VerbCache
+from GUI_W_Supervisor import Supervisor
+
+class PrefixOps:
+    """Base / Temp prefix operations without Qt; Prefix runs them on the Supervisor loop."""
+    VERBS = ("vcrun2015", "dxvk")    # What v0.2 / v0.3 installed into every prefix
+
+    def __init__(self, num: int, exe_path, bprefix_path=None, log=print, verbs=None, exe_file=None):
+        self.log = log
+        self.num, self.exe_path, self.bprefix_path, self.exe_file = num, exe_path, bprefix_path, exe_file
+        self.verbs = verbs or os.environ.get("DONNER_VERBS", "").split() or self.VERBS
+        self.base_dir = Path(__file__).parent.resolve() / "BasePrefix"
+        self.temp_dir = Path(exe_path) / ".wine_temp_noverlay" if exe_path else None
+
+    def run(self):
+        func = self._op()
+        if func is None:    return False
+        return Supervisor.shared().call(func()) if asyncio.iscoroutinefunction(func) else func()
+
+    async def run_async(self):
+        """run() as a Supervisor coroutine : verb installs and resolving are awaited on the
+        loop, blocking ops go to its executor, so no executor thread waits on the loop."""
+        func = self._op()
+        if func is None:    return False
+        return await func() if asyncio.iscoroutinefunction(func) else await Supervisor.blocking(func)
+
+    def _op(self):
+        ops = {
+            1: (self._create_base_prefix, "\n📂 Creating Base Wine Prefix..."),
+            2: (self._delete_prefix,      "\n🗑️ Deleting BasePrefix."),
+            3: (self._create_temp_prefix, "\n⚡ Creating Temporary Prefix..."),
+            4: (self._delete_prefix,      "\n🗑️ Deleting Temporary Prefix."),
+            5: (self._inspect_temp_prefix, "\n🔍 Inspecting Temporary Prefix..."),
+            6: (self._compact_temp_prefix, "\n🧬 Compacting Temporary Prefix into a Base..."),
+            7: (self._install_verbs,      "\n📦 Installing Dlls into Base Prefix..."),
+            8: (self._resolve_temp_prefix, "\n🧩 Resolving missing Dlls in the Temporary Prefix..."),
+        }
+        if self.num in ops:
+              func, msg = ops[self.num]
+              self.log(msg) ; return func
+        else: self.log("❌ Invalid Operation."); return None
+
+
+    def _delete_prefix(self):
+
+        target = self.base_dir if self.num == 2 else self.temp_dir
+        if not target or not target.exists():
+            self.log("❌ No Directory found."); return True
+
+        self.log(f"🧹 Cleaning: {target}")
+        try:    # Instant; unmount + deletion continue in the background
+            if self.num == 4:    PrefixCatalog.release(target / "merged") ; Backends.destroy(target)
+            else:    Teardown.shared().trash(target)
+        except OSError as e:    self.log(f"❌ Removal failed: {e}"); return False
+
+        self.log("✅ Removed, reclaiming space in background.")
+        return True
+
+
+    def _create_temp_prefix(self):
+
+        if not self.bprefix_path or not self.temp_dir:
+            self.log("❌ Missing Path Info."); return False
+
+        try:
+            Backends.create(self.bprefix_path, self.temp_dir, log=self.log)
+            self.log("✅ Lightweight Prefix Created.\n")
+            return True
+        except subprocess.CalledProcessError as e:
+            err = e.stderr.decode().strip()
+            self.log(f"❌ Mount Error: {err}\n"); return False
+        except OSError as e:    self.log(f"❌ Error: {e}\n"); return False
+
+    def _inspect_temp_prefix(self):
+        upper = self.temp_dir / "upper" if self.temp_dir else None
+        if not upper or not upper.is_dir():
+            self.log("❌ No Temp Prefix found."); return False
+        self.log(UpperDelta.format(UpperDelta(upper, self.bprefix_path).scan()))
+        return True
+
+    def _compact_temp_prefix(self):
+        upper = self.temp_dir / "upper" if self.temp_dir else None
+        if not upper or not upper.is_dir() or not self.bprefix_path:
+            self.log("❌ Missing Path Info."); return False
+        try:
+            name = f"compact-{Path(self.exe_path).name}-{time.strftime('%Y%m%d-%H%M%S')}"
+            dest = self.base_dir.with_name(f"BasePrefix-{Path(self.exe_path).name}")
+            stats = UpperDelta(upper, self.bprefix_path).compact(name, dest=dest)
+            self.log(f"📦 Stored as {name}: {stats['new']} new objects")
+            self.log(f"✅ New Base-Prefix: {dest}\n")
+            return True
+        except Exception as e:  self.log(f"❌ Error: {str(e)}") ; return False
+
+    async def _install_verbs(self):
+        target = Path(self.bprefix_path) if self.bprefix_path else self.base_dir
+        if not target.is_dir():
+            self.log("❌ No Base Prefix found."); return False
+        try:
+            results = await VerbCache(log=self.log).install(target, self.verbs)
+            self.log(f"{'✅' if all(results.values()) else '❌'} Verbs: {results}\n")
+            return all(results.values())
+        except Exception as e:  self.log(f"❌ Error: {str(e)}") ; return False
+
+    async def _resolve_temp_prefix(self):
+        if not self.exe_file or not self.bprefix_path:
+            self.log("❌ Missing Path Info."); return False
+        from GUI_W_Resolver import DllIndex, DllResolver
+        try:
+            cache, index = VerbCache(log=self.log), DllIndex()
+            await Supervisor.blocking(self._index, index, cache)
+            return (await DllResolver(self.exe_file, self.bprefix_path, index, cache, log=self.log).run())["ok"]
+        except Exception as e:  self.log(f"❌ Error: {str(e)}") ; return False
+
+    def _index(self, index, cache):
+        index.add_cache(cache)
+        for p in {Path(self.bprefix_path), *self.base_dir.parent.glob("BasePrefix*")}:    index.scan_prefix(p)
+
+    def _create_base_prefix(self):
+        try:
+            self.log(f"⏳ Initializing: {self.base_dir}")
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+
+            store, name = PrefixStore(), PrefixStore.base_name("win64")
+            if store.has(name):    # Clone the stored prefix instead of booting a new one
+                stats = store.checkout(name, self.base_dir)
+                self.log(f"⚡ Cloned {name} from store: {stats}")
+                self.log("✅ Base-Prefix Created.\n")
+                return True
+        
+            target = str(self.base_dir.resolve())    # Abs_path preventin Wine getting lost
+            env = {**os.environ, "WINEPREFIX": target, "WINEARCH": "win64", "WINEDEBUG": "-all"}
+
+            self.log("⚙️ Building core files...")
+            subprocess.run(["wineboot", "-u"], env=env, check=True, capture_output=True)
+            subprocess.run(["wineserver", "-w"], env=env, check=True)
+
+            stats = store.ingest(self.base_dir, name)    # Reflinked objects share the prefix's extents where supported
+            self.log(f"📦 Stored as {name}: {stats['new']} new objects")
+            self.log("✅ Base-Prefix Created.\n")
+            return True
+
+        except Exception as e:  self.log(f"❌ Error: {str(e)}") ; return False
+
@@ -0,0 +1,223 @@
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import hashlib
+import itertools
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+from collections import deque, OrderedDict
+
+from GUI_W_Runner_Builder import Utils
+from GUI_W_Backends import Backends
+
+class Slot:
+    def __init__(self, base, root, merged):
+        self.base, self.root, self.merged, self.created = base, Path(root), str(merged), time.monotonic()
+
+class PrefixPool:
+    """Keeps `size` mounted + booted overlay prefixes ready per base prefix.
+
+    acquire() hands out a ready slot ( or builds one on a miss ) and refills in the
+    background. Slots idle longer than `ttl` are torn down, and only the `max_bases`
+    most recently used base prefixes keep a pool. Refills only run where building a slot
+    needs no password prompt : with a pkexec mount, slots are built by the launch itself.
+    """
+
+    def __init__(self, size=2, ttl=1800, max_bases=2, create=None, destroy=None, log=print):
+        self.size, self.ttl, self.max_bases, self.log = size, ttl, max_bases, log
+        self.create, self.destroy = create or self.mount, destroy or self.unmount
+        self.cv = threading.Condition()
+        self.ready = OrderedDict()          # base -> deque[Slot], LRU order
+        self.filling = {}                   # base -> refill thread running
+        self.latency = deque(maxlen=1000)   # seconds from acquire() to a usable prefix
+        self.hits = self.misses = 0
+        self.quiet = {}                     # base -> slots can be built without elevation
+        self.ids, self.closed = itertools.count(), False
+        threading.Thread(target=self._reaper, daemon=True).start()
+
+    @staticmethod
+    def _pool_dir(base):
+        return Utils.cache_dir("pool", hashlib.sha1(os.path.abspath(base).encode()).hexdigest()[:12])
+
+    def _slot_dir(self, base):
+        return self._pool_dir(base) / f"slot-{os.getpid()}-{next(self.ids)}"
+
+    def _unattended(self, base):
+        """Whether a background refill may build slots for `base` ( no pkexec prompt )."""
+        if self.create is not self.mount:    return True
+        if base not in self.quiet:
+            b = Backends.select(base, self._pool_dir(base))
+            self.quiet[base] = not (b.privileged and os.geteuid())
+            if not self.quiet[base]:    self.log(f"ℹ️ Pool refill off : {b.name} mounts need pkexec, slots are built at launch.")
+        return self.quiet[base]
+
+    def warm(self, base):
+        with self.cv:
+            self.ready.setdefault(base, deque()) ; self.ready.move_to_end(base)
+            evicted = list(self.ready)[:-self.max_bases]
+            drained = [s for b in evicted for s in self.ready.pop(b)]
+        for s in drained:    self._destroy(s)
+        self._schedule(base)
+
+    def acquire(self, base):
+        t0 = time.perf_counter()
+        self.warm(base)
+        with self.cv:
+            slot = self.ready[base].popleft() if self.ready.get(base) else None
+            if slot:    self.hits += 1
+            else:    self.misses += 1
+        if slot is None:    # Miss : build inline, the refill will catch up for next time
+            slot = self._build(base)
+        self.latency.append(time.perf_counter() - t0)
+        self._schedule(base)
+        return slot
+
+    def release(self, slot):
+        threading.Thread(target=self._destroy, args=(slot,), daemon=True).start()
+
+    def _schedule(self, base):
+        if not self._unattended(base):    return
+        with self.cv:
+            if self.closed or self.filling.get(base):    return
+            self.filling[base] = True
+        threading.Thread(target=self._refill, args=(base,), daemon=True).start()
+
+    def _refill(self, base):
+        try:
+            while True:
+                with self.cv:
+                    if self.closed or base not in self.ready or len(self.ready[base]) >= self.size:    return
+                slot = self._build(base)
+                with self.cv:
+                    if base in self.ready and not self.closed:    self.ready[base].append(slot) ; slot = None
+                if slot:    self._destroy(slot)
+        except Exception as e:    self.log(f"❌ Pool refill failed: {e}")
+        finally:
+            with self.cv:    self.filling[base] = False
+
+    def _build(self, base):
+        root = self._slot_dir(base) ; root.mkdir()
+        (root / ".owner").write_text(self.owner(os.getpid()))    # For sweep() after a crash
+        return Slot(base, root, self.create(base, root))
+
+    def _destroy(self, slot):
+        try:    self.destroy(slot.root)
+        except Exception as e:    self.log(f"❌ Pool teardown failed: {e}")
+
+    def _reaper(self):
+        while not self.closed:
+            time.sleep(min(60, self.ttl / 4))
+            now, stale = time.monotonic(), []
+            with self.cv:
+                for q in self.ready.values():
+                    while q and now - q[0].created > self.ttl:    stale.append(q.popleft())
+            for s in stale:    self._destroy(s)
+
+    def metrics(self):
+        lat = sorted(self.latency)
+        if not lat:    return "📈 Pool: no launches yet"
+        q = statistics.quantiles(lat, n=100) if len(lat) > 1 else [lat[0]] * 99
+        ready = sum(len(d) for d in self.ready.values())
+        return f"📈 Pool launch-ready: p50 {q[49] * 1000:.0f} ms, p99 {q[98] * 1000:.0f} ms ( {len(lat)} launches, {self.hits} hits, {self.misses} misses, {ready} ready )"
+
+    def shutdown(self):
+        with self.cv:
+            self.closed = True
+            slots = [s for q in self.ready.values() for s in q] ; self.ready.clear()
+        for s in slots:    self._destroy(s)
+
+    @staticmethod
+    def owner(pid):
+        """"<pid> <start time>" ( /proc/<pid>/stat field 22 ) : unique even across pid reuse; None if gone."""
+        try:
+            with open(f"/proc/{pid}/stat") as f:    return f"{pid} {f.read().rpartition(')')[2].split()[19]}"
+        except (OSError, IndexError):    return None
+
+    @staticmethod
+    def sweep(log=print):
+        """Tears down slots whose owning session is gone ( e.g. after a crash ); returns how many."""
+        n = 0
+        for slot in Utils.cache_dir("pool").glob("*/slot-*"):
+            try:    token = (slot / ".owner").read_text().strip()
+            except OSError:    continue     # Still being built, or not a slot
+            if PrefixPool.owner(token.split()[0]) == token:    continue    # Owner alive
+            try:    Backends.destroy(slot) ; n += 1
+            except Exception as e:    log(f"❌ Pool sweep failed for {slot}: {e}")
+        if n:    log(f"🧹 Reaped {n} pool slot(s) left by ended sessions")
+        return n
+
+    @staticmethod
+    def mount(base, root):
+        """Writable prefix on `base` from the fastest backend the host supports + wineboot."""
+        merged = Backends.create(base, root, log=lambda t: None)
+        env = {**os.environ, "WINEPREFIX": str(merged), "WINEDEBUG": "-all"}
+        subprocess.run(["wineboot", "-u"], env=env, check=True, capture_output=True)
+        subprocess.run(["wineserver", "-w"], env=env, check=True)
+        return merged
+
+    @staticmethod
+    def unmount(root):
+        """Slots share the batched, background teardown : one elevated call per batch of slots."""
+        Backends.destroy(root)
+
+
+def check():
+    """Pool behaviour with a directory-only create / destroy : hand-out, refill, miss, LRU
+    eviction of base prefixes, TTL reaping, shutdown and the sweep of dead sessions' slots."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_CACHE_HOME"] = tmp
+        made, gone, lock = [], [], threading.Lock()
+
+        def create(base, root):
+            time.sleep(0.05) ; os.makedirs(f"{root}/merged")
+            with lock:    made.append(str(root))
+            return f"{root}/merged"
+
+        def destroy(root):
+            shutil.rmtree(root)
+            with lock:    gone.append(str(root))
+
+        def until(cond, what, limit=5):
+            deadline = time.monotonic() + limit
+            while not cond():
+                assert time.monotonic() < deadline, what
+                time.sleep(0.02)
+
+        pool = PrefixPool(size=2, ttl=0.6, max_bases=1, create=create, destroy=destroy, log=lambda t: None)
+        pool.warm("A")
+        until(lambda: len(pool.ready["A"]) == 2, "pool not filled to size")
+
+        ready = list(pool.ready["A"])
+        slot = pool.acquire("A")
+        assert slot is ready[0] and os.path.isdir(slot.merged), "acquire did not hand out a ready slot"
+        until(lambda: len(pool.ready["A"]) == 2, "pool not refilled after acquire")
+        pool.release(slot)
+        until(lambda: str(slot.root) in gone, "released slot not torn down")
+
+        miss = pool.acquire("B")
+        assert miss.base == "B" and os.path.isdir(miss.merged), "miss did not build a slot inline"
+        assert "A" not in pool.ready, "least recently used base kept its pool"
+        until(lambda: all(str(s.root) in gone for s in ready[1:]), "evicted base slots not torn down")
+        until(lambda: len(pool.ready["B"]) == 2, "pool not filled for the new base")
+
+        stale = list(pool.ready["B"])
+        until(lambda: all(str(s.root) in gone for s in stale), "slots past the TTL not reaped", limit=3)
+        assert not pool.ready["B"], "reaped slots still handed out"
+
+        pool.warm("B") ; until(lambda: len(pool.ready["B"]) == 2, "pool not refilled after reaping")
+        pool.shutdown() ; pool.release(miss)
+        until(lambda: sorted(made) == sorted(gone), "shutdown left slots behind")
+
+        dead, live = PrefixPool._pool_dir("C") / "slot-1-0", PrefixPool._pool_dir("C") / f"slot-{os.getpid()}-99"
+        for d, token in ((dead, "1 0"), (live, PrefixPool.owner(os.getpid()))):    d.mkdir() ; (d / ".owner").write_text(token)
+        assert PrefixPool.sweep(log=lambda t: None) == 1 and live.exists(), "sweep judged slot owners wrong"
+    print(f"✅ PrefixPool checks passed ( {len(made)} slots built and torn down )")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["check"]:    check()
@@ -0,0 +1,181 @@
+
+import os
+import sys
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+
+FICLONE = 0x40049409
+
+class PrefixStore:
+    """Content-addressed store of Wine prefixes.
+
+    objects/ab/<sha256>[x]  : one file per unique content ( + exec bit )
+    manifests/<name>.json   : relpath -> {"f": object} | {"l": symlink target} | {"d": mode}
+    Checkouts are reflinks when the filesystem supports them. Without reflink, the PE files
+    and fonts under windows/ are hardlinked ( Wine loads them but never rewrites them in
+    place; installs replace them ) and everything else is copied, as the registry and the
+    other files a prefix rewrites in place must never reach a shared object. Read-only
+    checkouts ( writable=False ) hardlink everything but the registry.
+    """
+    MUTABLE = (".reg",)
+    SHARED = ("drive_c/windows/system32/", "drive_c/windows/syswow64/", "drive_c/windows/fonts/")
+    SHARED_EXTS = (".dll", ".exe", ".drv", ".sys", ".ocx", ".ttf", ".ttc", ".otf", ".fon")
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else Utils.cache_dir("store")
+        self.objects, self.manifests = self.root / "objects", self.root / "manifests"
+        for d in (self.objects, self.manifests): d.mkdir(parents=True, exist_ok=True)
+
+    def has(self, name):    return (self.manifests / f"{name}.json").exists()
+    def names(self):    return sorted(p.stem for p in self.manifests.glob("*.json"))
+
+    def _object(self, digest):    return self.objects / digest[:2] / digest
+
+    @staticmethod
+    def _hash(path, mode):
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):    h.update(chunk)
+        return h.hexdigest() + ("x" if mode & 0o111 else "")
+
+    @staticmethod
+    def clone(src, dst, link=True):
+        """reflink -> hardlink -> copy; returns the method used. An existing `dst` is replaced,
+        never written through ( it may be a hardlinked object )."""
+        try:    os.unlink(dst)
+        except FileNotFoundError:    pass
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:    fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            shutil.copystat(src, dst) ; return "reflink"
+        except OSError:    pass
+        if link:
+            try:    os.unlink(dst) ; os.link(src, dst) ; return "hardlink"
+            except OSError:    pass
+        shutil.copy2(src, dst) ; return "copy"
+
+    def ingest(self, src, name):
+        """Adds a prefix tree; only objects not already stored cost disk space."""
+        src, manifest, stats = Path(src), {}, {"files": 0, "new": 0, "new_bytes": 0}
+        for dirpath, dirnames, filenames in os.walk(src):
+            rel_dir = os.path.relpath(dirpath, src)
+            if rel_dir != ".":    manifest[rel_dir] = {"d": os.stat(dirpath).st_mode & 0o7777}
+
+            for n in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+                p, rel = os.path.join(dirpath, n), os.path.normpath(os.path.join(rel_dir, n))
+                st = os.lstat(p)
+                if os.path.islink(p):    manifest[rel] = {"l": os.readlink(p)} ; continue
+                if not os.path.isfile(p):    continue     # sockets / fifos are not part of a prefix
+
+                digest = self._hash(p, st.st_mode)
+                obj = self._object(digest)
+                if not obj.exists():
+                    obj.parent.mkdir(exist_ok=True)
+                    fd, tmp = tempfile.mkstemp(".tmp", dir=obj.parent) ; os.close(fd)    # Concurrent ingests of one object
+                    self.clone(p, tmp, link=False)
+                    os.chmod(tmp, 0o555 if digest.endswith("x") else 0o444)
+                    os.replace(tmp, obj)
+                    stats["new"] += 1 ; stats["new_bytes"] += st.st_size
+                manifest[rel] = {"f": digest}
+                stats["files"] += 1
+
+        fd, tmp = tempfile.mkstemp(".tmp", dir=self.manifests)
+        with os.fdopen(fd, "w") as f:    f.write(json.dumps(manifest))
+        os.replace(tmp, self.manifests / f"{name}.json")
+        return stats
+
+    def checkout(self, name, dest, writable=True):
+        """Materialises manifest `name` into `dest` as clones of the stored objects."""
+        manifest = json.loads((self.manifests / f"{name}.json").read_text())
+        dest, stats = Path(dest), {}
+        dest.mkdir(parents=True, exist_ok=True)
+
+        for rel, e in sorted(manifest.items()):     # Parents sort before children
+            p = dest / rel
+            if "d" in e:    p.mkdir(exist_ok=True) ; continue
+            p.parent.mkdir(parents=True, exist_ok=True)
+            if p.is_symlink() or p.exists():    p.unlink()
+            if "l" in e:    os.symlink(e["l"], p) ; continue
+
+            obj = self._object(e["f"])
+            how = self.clone(obj, p, link=self.shareable(rel) or not writable and not rel.endswith(self.MUTABLE))
+            if how != "hardlink":    os.chmod(p, 0o755 if e["f"].endswith("x") else 0o644)
+            stats[how] = stats.get(how, 0) + 1
+
+        for rel, e in manifest.items():
+            if "d" in e:    os.chmod(dest / rel, e["d"])
+        return stats
+
+    @classmethod
+    def shareable(cls, rel):
+        """Files a writable checkout may hardlink when there is no reflink."""
+        rel = rel.lower()
+        return rel.startswith(cls.SHARED) and rel.endswith(cls.SHARED_EXTS)
+
+    def usage(self):
+        return sum(p.stat().st_size for p in self.objects.glob("*/*") if p.is_file())
+
+    @staticmethod
+    def wine_version():
+        try:    ver = subprocess.run(["wine", "--version"], capture_output=True, text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):    ver = ""
+        return ver or "unknown"
+
+    @staticmethod
+    def base_name(arch="win64"):
+        """Manifest name of the stock base prefix for the installed Wine."""
+        return f"base-{arch}-{PrefixStore.wine_version()}"
+
+
+def disk_usage(*roots):
+    """Bytes allocated by the trees, counting each inode once ( hardlinks are free )."""
+    seen, total = set(), 0
+    for root in roots:
+        for dirpath, _, files in os.walk(root):
+            for f in files:
+                st = os.lstat(os.path.join(dirpath, f))
+                if (st.st_dev, st.st_ino) not in seen:    seen.add((st.st_dev, st.st_ino)) ; total += st.st_blocks * 512
+    return total
+
+
+def bench(src=None):
+    """`wineboot -u` ( when Wine exists ) vs store checkout; plus the cost of one variant."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp) ; store = PrefixStore(tmp / "store")
+
+        if src is None and shutil.which("wineboot"):
+            src = tmp / "wineboot"
+            env = {**os.environ, "WINEPREFIX": str(src), "WINEARCH": "win64", "WINEDEBUG": "-all"}
+            t0 = time.perf_counter()
+            subprocess.run(["wineboot", "-u"], env=env, check=True, capture_output=True)
+            subprocess.run(["wineserver", "-w"], env=env, check=True)
+            print(f"⏱️ wineboot -u : {time.perf_counter() - t0:.2f}s, {disk_usage(src) / 2**20:.0f} MiB")
+        elif src is None:    # No Wine here : a synthetic tree with a prefix-like file mix
+            src = tmp / "synthetic"
+            for i in range(3000):
+                p = src / "drive_c" / "windows" / "system32" / f"lib{i}.dll"
+                p.parent.mkdir(parents=True, exist_ok=True) ; p.write_bytes(os.urandom(4096 + i * 37))
+            (src / "system.reg").write_text("WINE REGISTRY Version 2\n")
+            os.makedirs(src / "dosdevices", exist_ok=True) ; os.symlink("../drive_c", src / "dosdevices" / "c:")
+
+        t0 = time.perf_counter() ; st = store.ingest(src, "base")
+        print(f"📦 ingest : {time.perf_counter() - t0:.2f}s, {st['files']} files, store {store.usage() / 2**20:.0f} MiB")
+
+        t0 = time.perf_counter() ; how = store.checkout("base", tmp / "clone")
+        print(f"⚡ checkout : {time.perf_counter() - t0:.2f}s {how}, +{disk_usage(tmp / 'store', tmp / 'clone') / 2**20 - disk_usage(tmp / 'store') / 2**20:.1f} MiB")
+
+        dlls = sorted((tmp / "clone").rglob("*.dll"))[:20]
+        for p in dlls:    p.unlink() ; p.write_bytes(os.urandom(65536))
+        st = store.ingest(tmp / "clone", "variant")
+        print(f"🧬 variant ( {len(dlls)} changed files ) : +{st['new_bytes'] / 2**20:.1f} MiB in store")
+
+
+if __name__ == "__main__":
+    bench(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,91 @@
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import statistics
+import subprocess
+from pathlib import Path
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from GUI_W_HwProfile import HwProfile
+from GUI_W_Supervisor import Supervisor
+
+class CapsProbe(QObject):
+    """Runs the capability probes concurrently on the Supervisor's executor after the window
+    is shown; results arrive through queued signals."""
+    result, done = pyqtSignal(str, bool, str), pyqtSignal(bool)
+
+    def __init__(self, bprefix_path=None, only=None, log=None):
+        super().__init__()
+        self.bprefix_path, self.only, self.log = bprefix_path, only, log
+
+    def start(self):    self.job = Supervisor.shared().submit(self.run(), self.done.emit)
+
+    async def run(self):
+        t0 = time.perf_counter()
+        probes = {
+            "Vulkan": self._vulkan, "DXVK": self._dxvk, "VKD3D": self._vkd3d,
+            "Gamemode": self._gamemode, "Wine": self._wine, "Winetricks": self._winetricks,
+        }
+        if self.only:    probes = {k: v for k, v in probes.items() if k in self.only}
+
+        async def probe(name, fn):
+            try:    ok, detail = await Supervisor.blocking(fn)
+            except Exception as e:    ok, detail = False, str(e)
+            self.result.emit(name, ok, detail)
+        await asyncio.gather(*(probe(name, fn) for name, fn in probes.items()))
+
+        if not self.only:    self.result.emit("Probes", True, f"{(time.perf_counter() - t0) * 1000:.0f} ms")
+        return True
+
+    def _vulkan(self):
+        devs = HwProfile.get()["vulkan"]
+        return bool(devs), ", ".join(devs) or "vulkaninfo found no device"
+
+    def _catalog(self, cap):
+        """Native ( not Wine builtin-stub ) DLLs from the prefix catalog, indexed on first use."""
+        if not self.bprefix_path:    return False, "Select a Base Prefix first"
+        from GUI_W_Catalog import PrefixCatalog
+        cat = PrefixCatalog.shared(log=self.log)
+        if not cat.known(self.bprefix_path):    cat.ensure(self.bprefix_path)
+        cat.watch(self.bprefix_path)
+        return cat.caps(self.bprefix_path)[cap]
+
+    def _dxvk(self):    return self._catalog("DXVK")
+    def _vkd3d(self):   return self._catalog("VKD3D")
+
+    def _gamemode(self):
+        path = shutil.which("gamemoderun")
+        return bool(path), path or "gamemoderun not installed"
+
+    def _wine(self):
+        if not shutil.which("wine"):    return False, "wine not in PATH"
+        out = subprocess.run(["wine", "--version"], capture_output=True, text=True, timeout=10)
+        return out.returncode == 0, out.stdout.strip() or out.stderr.strip()
+
+    def _winetricks(self):
+        path = shutil.which("winetricks")
+        return bool(path), path or "winetricks not installed"
+
+
+def bench(runs=5):
+    """Time-to-first-paint of GUI.py : one cold run ( no bytecode, no profile cache ), then warm runs."""
+    here = Path(__file__).parent
+    env = {**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")}
+
+    def once(*flags):
+        out = subprocess.run([sys.executable, *flags, str(here / "GUI.py"), "--bench-startup"],
+                             env=env, capture_output=True, text=True, timeout=60).stdout
+        return float(out.rsplit("first paint", 1)[1].split("ms")[0])
+
+    shutil.rmtree(here / "__pycache__", ignore_errors=True)
+    HwProfile.cache_file().unlink(missing_ok=True)
+    cold = once("-B")
+    warm = [once() for _ in range(runs)]
+    print(f"⏱️ first paint : cold {cold:.0f} ms, warm median {statistics.median(warm):.0f} ms ( {runs} runs )")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,157 @@
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from types import MappingProxyType
+
+from GUI_W_Runner_Builder import Build, Utils
+
+class LaunchProfile:
+    """Named, versioned launch settings of one exe : checkbox toggles, resolution and
+    tuning-flag overrides ( A/B tests ), stored in ~/.cache/donner/profiles/<exe>.json.
+
+    snapshot() compiles the profile against the hardware profile into a frozen env /
+    argv, keyed by a hash of both; an unchanged profile reuses the cached snapshot
+    instead of recomputing Build's tuning rules on every launch.
+    """
+    RULES = 3    # Bump when Build._tuning changes : every cached snapshot recompiles
+    TOGGLES = ("Gamemode", "Vulkan", "VKD3D", "DXVK")
+    _snapshots = {}
+
+    def __init__(self, exe, name="default", toggles=None, resolution=None, flags=None, version=0):
+        self.exe, self.name, self.version = os.path.abspath(exe), name, version
+        self.toggles = {t: bool((toggles or {}).get(t)) for t in self.TOGGLES}
+        self.resolution, self.flags = resolution, dict(flags or {})
+
+    def spec(self):
+        return {"toggles": self.toggles, "resolution": self.resolution, "flags": self.flags}
+
+    # Storage : {name: [spec_v1, spec_v2, ...]}, newest last
+
+    @staticmethod
+    def store_file(exe):
+        key = hashlib.sha1(os.path.abspath(exe).encode()).hexdigest()[:12]
+        return Utils.cache_dir("profiles") / f"{key}.json"
+
+    @classmethod
+    def _read(cls, exe):
+        try:    return json.loads(cls.store_file(exe).read_text())
+        except (OSError, ValueError):    return {}
+
+    @classmethod
+    def load(cls, exe, name="default", version=None):
+        """Latest ( or a given ) version of `name`; an empty profile if it was never saved.
+        Raises ValueError for a version that does not exist."""
+        history = cls._read(exe).get(name, [])
+        if version is not None and not 1 <= version <= len(history):
+            raise ValueError(f"profile {name} has no version {version} ( saved : {len(history)} )")
+        if not history:    return cls(exe, name)
+        v = version or len(history)
+        return cls(exe, name, version=v, **history[v - 1])
+
+    @classmethod
+    def names(cls, exe):    return {n: len(h) for n, h in cls._read(exe).items()}
+
+    def save(self):
+        """Appends a new version when the spec changed; returns the version in effect. An
+        unchanged spec only reads the store : nothing is written, so saving on every launch is free."""
+        data = self._read(self.exe)
+        history = data.setdefault(self.name, [])
+        if not history or history[-1] != self.spec():
+            history.append(self.spec())
+            path = self.store_file(self.exe)
+            fd, tmp = tempfile.mkstemp(".tmp", dir=path.parent)
+            with os.fdopen(fd, "w") as f:    f.write(json.dumps(data, indent=1))
+            os.replace(tmp, path)
+        self.version = len(history)
+        return self.version
+
+    # Compiled snapshots
+
+    def key(self, hw):
+        hw = {k: v for k, v in hw.items() if k != "probed_at"}
+        blob = json.dumps([self.RULES, hw, self.spec()], sort_keys=True)
+        return hashlib.sha1(blob.encode()).hexdigest()
+
+    def snapshot(self, hw=None):
+        """Frozen {"key", "env", "wrap", "mask", "args", "taskset"} for this profile on this host."""
+        from GUI_W_HwProfile import HwProfile
+        hw = hw or HwProfile.get()
+        key = self.key(hw)
+        if key in self._snapshots:    return self._snapshots[key]
+
+        path = Utils.cache_dir("profiles", "snapshots") / f"{key}.json"
+        try:    snap = json.loads(path.read_text())
+        except (OSError, ValueError):
+            env, wrap, mask, args = Build._tuning(hw, self)
+            snap = {"key": key, "env": env, "wrap": wrap, "mask": mask, "args": args, "taskset": hw["taskset"]}
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snap, sort_keys=True)) ; os.replace(tmp, path)
+
+        snap = MappingProxyType({**snap, "env": MappingProxyType(snap["env"]), "wrap": tuple(snap["wrap"]), "args": tuple(snap["args"])})
+        self._snapshots[key] = snap
+        return snap
+
+    @staticmethod
+    def diff(a, b):
+        """[( key, value in a, value in b )] over the compiled env and argv of two profiles."""
+        sa, sb = a.snapshot(), b.snapshot()
+        out = [(k, sa["env"].get(k), sb["env"].get(k)) for k in sorted(set(sa["env"]) | set(sb["env"]))
+               if sa["env"].get(k) != sb["env"].get(k)]
+        for k in ("wrap", "mask", "args"):
+            if sa[k] != sb[k]:    out.append((f"<{k}>", sa[k], sb[k]))
+        return out
+
+    # Toggles against the prefix
+
+    def check(self, prefix, hw=None):
+        """{toggle: ( ok, detail )} for the checked toggles, against the host and the prefix's
+        cataloged DLLs ( indexed on first sight ); a failing one only buys a failed launch."""
+        from GUI_W_HwProfile import HwProfile
+        hw, on = hw or HwProfile.get(), [t for t, v in self.toggles.items() if v]
+        out, caps = {}, None
+        if {"DXVK", "VKD3D"} & set(on):
+            from GUI_W_Catalog import PrefixCatalog
+            try:
+                cat = PrefixCatalog.shared()
+                if not cat.known(prefix):    cat.ensure(prefix)
+                caps = cat.caps(prefix)
+            except Exception as e:    caps = {"error": str(e)}    # Unreadable catalog : do not block the launch
+        icds = Build.icds(hw)
+        for t in on:
+            if t == "Gamemode":    out[t] = (bool(hw.get("gamemoderun")), hw.get("gamemoderun") or "gamemoderun not installed")
+            elif t == "Vulkan":    out[t] = (bool(icds), ", ".join(map(os.path.basename, icds)) or "no Vulkan ICD for this GPU")
+            elif not icds and not hw.get("vulkan"):    out[t] = (False, "needs Vulkan")
+            elif caps and t in caps:    out[t] = caps[t]
+            else:    out[t] = (True, (caps or {}).get("error") or "prefix not cataloged")
+        return out
+
+    def without(self, toggles):
+        """Unsaved copy with `toggles` switched off."""
+        return LaunchProfile(self.exe, self.name, {t: v and t not in toggles for t, v in self.toggles.items()},
+                             self.resolution, self.flags, self.version)
+
+    def __str__(self):    return f"{self.name}@{self.version}"
+
+
+def _ref(exe, ref):
+    name, _, v = ref.partition("@")
+    return LaunchProfile.load(exe, name, int(v) if v else None)
+
+if __name__ == "__main__":
+    # python3 GUI_W_Profile.py game.exe                      list profiles
+    # python3 GUI_W_Profile.py game.exe set NAME KEY=VAL...  new version with tuning overrides ( resolution=WxH )
+    # python3 GUI_W_Profile.py game.exe diff A[@v] B[@v]     compiled env / argv differences
+    exe, cmd, args = sys.argv[1], (sys.argv[2:3] or ["list"])[0], sys.argv[3:]
+    if cmd == "set":
+        p = LaunchProfile.load(exe, args[0])
+        p.flags.update(a.split("=", 1) for a in args[1:])
+        if "resolution" in p.flags:    p.resolution = p.flags.pop("resolution") or None
+        print(f"💾 {args[0]}@{p.save()} ( {p.snapshot()['key'][:12]} )")
+    elif cmd == "diff":
+        a, b = _ref(exe, args[0]), _ref(exe, args[1])
+        for k, va, vb in LaunchProfile.diff(a, b):    print(f"{k:32} {va!s:>28}  ->  {vb}")
+    else:
+        for n, v in LaunchProfile.names(exe).items():    print(f"{n}@{v}")
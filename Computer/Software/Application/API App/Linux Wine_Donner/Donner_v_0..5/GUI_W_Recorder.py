@@ -0,0 +1,172 @@
+
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import struct
+import argparse
+import tempfile
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+
+class Recorder:
+    """Raw PTY output of one session in a memory-mapped segment file + a line index.
+
+    <name>.seg  : the bytes exactly as Wine wrote them ( copied straight into the mapping )
+    <name>.idx  : one record per line : offset, length, ms since start, channel
+    <name>.json : exe, start time, line count
+    Channels come from Wine's `class:` prefix ( err / warn / fixme / trace ), so queries
+    filter on the index first and only touch the segment bytes of candidate lines.
+    """
+    IDX = struct.Struct("<QIIB3x")
+    CHANNELS = ("other", "err", "warn", "fixme", "trace")
+    RX = re.compile(rb"(?:\d+\.\d+:)?(?:[0-9a-f]{4}:){0,2}(err|warn|fixme|trace):")
+    CODE = {c.encode(): i for i, c in enumerate(CHANNELS)}
+    LIVE_S = 6 * 3600    # Unclosed session written to this recently : another process is still recording it
+    _live = set()        # Bases being recorded in this process
+
+    def __init__(self, name, meta=None, root=None, chunk=8 << 20):
+        self.base = Path(root or self.root()) / name
+        self.t0, self.pos, self.line_start, self.lines = time.time(), 0, 0, 0
+        self.seg = open(f"{self.base}.seg", "w+b")
+        self.cap = chunk ; self.seg.truncate(chunk)
+        self.mm = mmap.mmap(self.seg.fileno(), chunk)
+        self.idx = open(f"{self.base}.idx", "wb", buffering=1 << 16)
+        self.meta = {**(meta or {}), "start": self.t0}
+        Path(f"{self.base}.json").write_text(json.dumps(self.meta))
+        self._live.add(self.base)
+
+    @staticmethod
+    def root():    return Utils.cache_dir("recordings")
+
+    def feed(self, data):
+        """LogPipe raw sink : appends a PTY chunk and indexes every line it completes."""
+        start, end = self.pos, self.pos + len(data)
+        if end > self.cap:    # Grow the mapping by doubling
+            self.mm.close() ; self.cap = max(self.cap * 2, end)
+            self.seg.truncate(self.cap) ; self.mm = mmap.mmap(self.seg.fileno(), self.cap)
+        self.mm[start:end] = data
+        self.pos = end
+
+        ms = int((time.time() - self.t0) * 1000)
+        i = data.find(b"\n")
+        while i != -1:
+            self._index(start + i, ms) ; self.line_start = start + i + 1
+            i = data.find(b"\n", i + 1)
+
+    def _index(self, end, ms):
+        ls = self.line_start
+        if end > ls and self.mm[end - 1] == 13:    end -= 1     # PTY line endings are \r\n
+        if end <= ls:    return
+        m = self.RX.match(self.mm, ls, min(end, ls + 64))
+        self.idx.write(self.IDX.pack(ls, end - ls, ms, self.CODE[m.group(1)] if m else 0))
+        self.lines += 1
+
+    def close(self):
+        if self.mm is None:    return
+        if self.pos > self.line_start:    self._index(self.pos, int((time.time() - self.t0) * 1000))
+        self.mm.flush() ; self.mm.close() ; self.mm = None
+        self.seg.truncate(self.pos) ; self.seg.close() ; self.idx.close()
+        self.meta.update(lines=self.lines, bytes=self.pos, end=time.time())
+        Path(f"{self.base}.json").write_text(json.dumps(self.meta))
+        self._live.discard(self.base)
+        return f"{self.base}.seg"
+
+    # Queries ( any number of past sessions, nothing loaded whole )
+
+    @classmethod
+    def _metas(cls, root=None):
+        """[( start, base, meta )] oldest first; start falls back to the file mtime."""
+        out = []
+        for p in Path(root or cls.root()).glob("*.json"):
+            try:    meta = json.loads(p.read_text())
+            except (OSError, ValueError):    meta = {}
+            try:    out.append((meta.get("start") or p.stat().st_mtime, p.with_suffix(""), meta))
+            except OSError:    pass
+        return sorted(out, key=lambda m: m[:1])
+
+    @classmethod
+    def sessions(cls, root=None):    return [base for _, base, _ in cls._metas(root)]
+
+    @classmethod
+    def query(cls, channel=None, since=None, until=None, regex=None, sessions=None, root=None, limit=None):
+        """Yields ( session, epoch seconds, channel, line ); `since` / `until` are epoch seconds."""
+        chans = {cls.CHANNELS.index(c) for c in ([channel] if isinstance(channel, str) else channel)} if channel else None
+        rx = re.compile(regex.encode() if isinstance(regex, str) else regex) if regex else None
+        n = 0
+        for base in sessions or cls.sessions(root):
+            try:    meta = json.loads(Path(f"{base}.json").read_text())
+            except (OSError, ValueError):    continue
+            t0 = meta["start"]
+            if until and t0 > until or since and meta.get("end", time.time()) < since:    continue
+
+            try:
+                with open(f"{base}.idx", "rb") as fi, open(f"{base}.seg", "rb") as fs:
+                    if not os.fstat(fi.fileno()).st_size or not os.fstat(fs.fileno()).st_size:    continue
+                    with mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ) as idx, \
+                         mmap.mmap(fs.fileno(), 0, access=mmap.ACCESS_READ) as seg:
+                        usable = len(idx) // cls.IDX.size * cls.IDX.size
+                        for off, length, ms, ch in cls.IDX.iter_unpack(memoryview(idx)[:usable]):
+                            if chans is not None and ch not in chans:    continue
+                            ts = t0 + ms / 1000
+                            if since and ts < since or until and ts > until:    continue
+                            if off + length > len(seg) or rx and not rx.search(seg, off, off + length):    continue
+                            yield base.name, ts, cls.CHANNELS[ch], seg[off:off + length].decode(errors="replace")
+                            n += 1
+                            if limit and n >= limit:    return
+            except OSError:    continue
+
+    @classmethod
+    def prune(cls, keep=50, root=None):
+        """Drops all but the newest `keep` sessions, never one still being recorded."""
+        now, done = time.time(), []
+        for _, base, meta in cls._metas(root):
+            if base in cls._live:    continue
+            try:
+                if "end" not in meta and now - os.stat(f"{base}.seg").st_mtime < cls.LIVE_S:    continue
+            except OSError:    pass
+            done.append(base)
+        for base in done[:-keep or None]:
+            for ext in (".seg", ".idx", ".json"):
+                try:    os.unlink(f"{base}{ext}")
+                except OSError:    pass
+
+
+def _when(text):
+    """`90s` / `15m` / `2h` / `3d` ago, or epoch seconds."""
+    if not text:    return None
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    return time.time() - float(text[:-1]) * units[text[-1]] if text[-1] in units else float(text)
+
+def bench(n=1_000_000):
+    """Record throughput, then channel / regex query time over the recording."""
+    from GUI_W_LogPipe import LogPipe
+
+    data = ("\r\n".join(LogPipe.synthetic(n)) + "\r\n").encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        rec = Recorder("bench", root=tmp)
+        t0 = time.perf_counter()
+        for i in range(0, len(data), 1 << 16):    rec.feed(data[i:i + (1 << 16)])
+        rec.close() ; dt = time.perf_counter() - t0
+        print(f"⏺️ {n} lines, {len(data) / 2**20:.0f} MiB recorded in {dt:.2f}s ( {n / dt:,.0f} lines/s )")
+
+        for label, kw in [("channel=err", {"channel": "err"}), ("regex=MSVCP140", {"regex": "MSVCP140"}),
+                          ("err + regex", {"channel": "err", "regex": r"status c0000135"})]:
+            t0 = time.perf_counter() ; hits = sum(1 for _ in Recorder.query(root=tmp, **kw))
+            print(f"🔎 {label:16} {hits:7} hits in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:    bench(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000) ; sys.exit()
+    ap = argparse.ArgumentParser(description="Query recorded Wine sessions ( python3 GUI_W_Recorder.py bench [n] )")
+    ap.add_argument("-c", "--channel", action="append", choices=Recorder.CHANNELS)
+    ap.add_argument("-e", "--regex")
+    ap.add_argument("--since", help="e.g. 2h, 3d or epoch seconds")
+    ap.add_argument("--until")
+    ap.add_argument("-n", "--limit", type=int)
+    a = ap.parse_args()
+    for name, ts, ch, line in Recorder.query(a.channel, _when(a.since), _when(a.until), a.regex, limit=a.limit):
+        print(f"{name} {time.strftime('%H:%M:%S', time.localtime(ts))} {ch:5} {line}")
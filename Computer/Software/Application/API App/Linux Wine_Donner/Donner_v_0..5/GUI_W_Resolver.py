@@ -0,0 +1,187 @@
+
+import os
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+from GUI_W_VerbCache import VerbCache
+from GUI_W_Backends import Backends
+from GUI_W_Launch import Launch
+from GUI_W_Supervisor import Supervisor
+from GUI_W_PEScan import PEScan
+
+def _seed():
+    seed = {
+        "vcrun2015": ["msvcp140", "msvcp140_1", "msvcp140_2", "vcruntime140", "vcruntime140_1", "concrt140", "vcomp140"],
+        "vcrun2013": ["msvcp120", "msvcr120", "vcomp120"], "vcrun2012": ["msvcp110", "msvcr110", "vcomp110"],
+        "vcrun2010": ["msvcp100", "msvcr100", "vcomp100"], "vcrun2008": ["msvcp90", "msvcr90"],
+        "vcrun2005": ["msvcp80", "msvcr80"], "mfc42": ["mfc42", "mfc42u"],
+        "d3dx9": [f"d3dx9_{i}" for i in range(24, 44)] + ["d3dcompiler_43"],
+        "d3dx10": [f"d3dx10_{i}" for i in range(33, 44)], "d3dx11_43": ["d3dx11_42", "d3dx11_43"],
+        "d3dcompiler_47": ["d3dcompiler_47"], "xinput": ["xinput1_1", "xinput1_2", "xinput1_3"],
+        "xact": [f"xactengine{a}_{b}" for a in (2, 3) for b in range(10)] + [f"x3daudio1_{i}" for i in range(8)],
+        "physx": ["physxloader", "physxcore", "physxcooking"], "dxvk": ["d3d9", "d3d10core", "d3d11", "dxgi"],
+    }
+    return {f"{dll}.dll": {verb: 0.1} for verb, dlls in seed.items() for dll in dlls}
+
+
+class DllIndex:
+    """dll name -> {verb: score}, kept in ~/.cache/donner/resolver/index.json.
+
+    Sources, strongest first : DLLs a fix round made disappear ( learn ), the files of
+    each recorded VerbCache delta, non-builtin DLLs in the system32 / syswow64 of
+    installed prefixes ( shared between the verbs in their winetricks.log ) and a small
+    seed table of the usual redistributables.
+    """
+    DIRS = ("drive_c/windows/system32", "drive_c/windows/syswow64")
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else Utils.cache_dir("resolver") / "index.json"
+        try:    data = json.loads(self.path.read_text())
+        except (OSError, ValueError):    data = {}
+        self.dlls, self.scanned = data.get("dlls") or _seed(), data.get("scanned", {})
+
+    def _add(self, dll, verb, score):
+        d = self.dlls.setdefault(dll.lower(), {})
+        d[verb] = round(d.get(verb, 0) + score, 3)
+
+    def add_cache(self, cache):
+        """Exact : every DLL a recorded verb delta wrote."""
+        for meta in cache.entries():
+            manifest = json.loads((cache.store.manifests / f"{meta['key']}.json").read_text())
+            for rel in manifest:
+                if rel.lower().endswith(".dll") and os.path.dirname(rel).lower() in self.DIRS:
+                    self.dlls.setdefault(os.path.basename(rel).lower(), {})[meta["verb"]] = 1.0
+
+    def scan_prefix(self, prefix):
+        """Attributes the prefix's non-builtin DLLs to its winetricks verbs; skipped while unchanged."""
+        prefix = Path(prefix)
+        verbs = sorted(VerbCache.installed(prefix))
+        dirs = [prefix / d for d in self.DIRS if (prefix / d).is_dir()]
+        if not verbs or not dirs:    return 0
+        key = [os.stat(d).st_mtime_ns for d in dirs] + [os.stat(prefix / "winetricks.log").st_mtime_ns]
+        if self.scanned.get(str(prefix)) == key:    return 0
+
+        n = 0
+        for d in dirs:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.name.lower().endswith(".dll") and e.is_file() and not PEScan.is_builtin(e.path):
+                        for v in verbs:    self._add(e.name, v, 0.5 / len(verbs))
+                        n += 1
+        self.scanned[str(prefix)] = key
+        return n
+
+    def learn(self, dll, verbs):
+        for v in verbs:    self._add(dll, v, 1.0 / len(verbs))
+
+    def verbs_for(self, dll):
+        d = self.dlls.get(dll.lower() if dll.lower().endswith(".dll") else f"{dll.lower()}.dll", {})
+        return sorted(d, key=lambda v: -d[v])
+
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"dlls": self.dlls, "scanned": self.scanned})) ; os.replace(tmp, self.path)
+
+
+class DllResolver:
+    """Launch -> missing DLLs -> verbs -> install into the overlay -> launch again, until the
+    exe starts without missing DLLs or nothing new can be tried. Works in the exe's Temp
+    Prefix : the existing one is resolved in place ( never thrown away ), otherwise a new
+    overlay over `base` is created and left as the exe's working Temp Prefix."""
+
+    def __init__(self, exe, base, index=None, cache=None, log=print, timeout=20, rounds=6):
+        self.exe, self.base = os.path.abspath(exe), base
+        self.index, self.cache = index or DllIndex(), cache or VerbCache(log=log)
+        self.log, self.timeout, self.rounds = log, timeout, rounds
+
+    async def run(self):
+        t0, exe_dir = time.perf_counter(), os.path.dirname(self.exe)
+        root = Path(exe_dir) / ".wine_temp_noverlay"
+        merged = root / "merged"
+        if (merged / "drive_c").is_dir():    self.log(f"♻️ Resolving in the existing Temp Prefix: {merged}")
+        elif root.exists():    # Unmounted or half-built : the user's to delete, not ours
+            self.log(f"❌ {root} exists but holds no usable prefix; delete it or create the Temp Prefix first.")
+            return {"exe": self.exe, "ok": False, "verbs": [], "unresolved": [], "rounds": [], "seconds": 0, "error": "temp prefix unusable"}
+        else:    merged = await Supervisor.mount(self.base, root, self.log)
+
+        applied, rounds, last = [], [], None
+        static = (await Supervisor.blocking(PEScan(self.base).scan, self.exe)).get("missing", {})
+        if verbs := self._pick(static, applied):    # Imports missing on paper : fix them before the first launch
+            self.log(f"🔬 Import scan: {', '.join(static)} -> installing {', '.join(verbs)}")
+            await self.cache.install(merged, verbs)
+            applied += verbs ; last = (list(static), verbs)
+
+        for n in range(1, self.rounds + 1):
+            launch = Launch(exe_dir, self.exe, log=self.log, tprefix=str(merged), timeout=self.timeout)
+            await launch.run_async()
+            missing = [m if m.endswith(".dll") else f"{m}.dll" for m in launch.result.get("missing_dlls", [])]
+            rounds.append({"round": n, "missing": missing, "seconds": round(time.perf_counter() - t0, 2)})
+            if last:    # What the previous round's verbs fixed
+                for dll in set(last[0]) - set(missing):    self.index.learn(dll, last[1])
+            if not missing:    break
+
+            verbs = self._pick(missing, applied)
+            if not verbs:    break
+            self.log(f"🧩 Round {n}: {', '.join(missing)} -> installing {', '.join(verbs)}")
+            await self.cache.install(merged, verbs)
+            applied += verbs ; rounds[-1]["verbs"] = verbs ; last = (missing, verbs)
+
+        self.index.save()
+        ok = not rounds[-1]["missing"]
+        res = {"exe": self.exe, "ok": ok, "verbs": applied, "unresolved": sorted(set(rounds[-1]["missing"])),
+               "rounds": rounds, "seconds": round(time.perf_counter() - t0, 2)}
+        self.log(f"{'✅ Working prefix' if ok else '❌ Still missing ' + ', '.join(res['unresolved'])} after "
+                 f"{len(rounds)} run(s), {res['seconds']:.1f}s; verbs: {', '.join(applied) or 'none'}")
+        return res
+
+    def _pick(self, missing, applied):
+        """Best untried verb per missing DLL."""
+        verbs = []
+        for dll in missing:
+            cands = [v for v in self.index.verbs_for(dll) if v not in applied]
+            if cands and cands[0] not in verbs:    verbs.append(cands[0])
+        return verbs
+
+    def run_sync(self):    return Supervisor.shared().call(self.run())
+
+
+def bench(missing="msvcp140.dll,vcruntime140.dll,d3dx9_43.dll,xinput1_3.dll", seconds=2):
+    """Time-to-working-prefix with an empty verb cache ( winetricks runs ) and a warm one
+    ( deltas replayed ), against the fake Wine reporting `missing`."""
+    from GUI_W_FakeWine import FakeWine
+    from GUI_W_PEScan import _pe
+    with tempfile.TemporaryDirectory(dir=os.environ.get("DONNER_BENCH_DIR")) as tmp:
+        tmp = Path(tmp)
+        os.environ.update(FakeWine.install(tmp / "bin"), FAKE_WINE_MISSING=missing, FAKE_WINE_COLD="0.2",
+                          FAKE_WINE_RUN="0", FAKE_WINETRICKS_TIME=str(seconds))
+        base = tmp / "base"
+        (base / "drive_c" / "windows" / "system32").mkdir(parents=True)
+        (base / "system.reg").write_text("WINE REGISTRY Version 2\n\n#arch=win64\n\n")
+        (tmp / "game").mkdir() ; _pe(tmp / "game" / "game.exe", missing.split(",")[:2])    # Half of it visible on paper
+
+        index, cache, quiet = DllIndex(tmp / "index.json"), VerbCache(tmp / "verbs", log=lambda t: None), lambda t: None
+        times = []
+        for label in ("cold cache", "warm cache"):
+            if (tmp / "game" / ".wine_temp_noverlay").exists():    # A new Temp Prefix for the warm run too
+                Backends.destroy(tmp / "game" / ".wine_temp_noverlay")
+                from GUI_W_Teardown import Teardown ; Teardown.shared(log=quiet).wait()
+            res = DllResolver(tmp / "game" / "game.exe", base, index, cache, log=quiet, timeout=10).run_sync()
+            times.append(res["seconds"])
+            print(f"⏱️ {label}: {'working' if res['ok'] else 'NOT working'} after {len(res['rounds'])} runs in "
+                  f"{res['seconds']:.2f}s, verbs {res['verbs']}")
+        Backends.destroy(tmp / "game" / ".wine_temp_noverlay")
+        from GUI_W_Teardown import Teardown ; Teardown.shared(log=quiet).wait()
+        print(f"🚀 warm / cold time-to-working-prefix : {times[1] / times[0]:.2f}")
+
+
+if __name__ == "__main__":
+    # python3 GUI_W_Resolver.py GAME.exe BASE_PREFIX [prefix to index...]
+    if len(sys.argv) > 2:
+        index = DllIndex() ; index.add_cache(VerbCache())
+        for p in sys.argv[2:]:    index.scan_prefix(p)
+        sys.exit(0 if DllResolver(sys.argv[1], sys.argv[2], index).run_sync()["ok"] else 1)
+    bench()
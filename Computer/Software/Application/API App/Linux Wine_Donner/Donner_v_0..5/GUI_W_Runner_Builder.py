@@ -1,8 +1,8 @@
 
 import os
-import shutil
-import resource
+import re
 import subprocess
+from pathlib import Path
 
 class Utils:
     @staticmethod
@@ -16,15 +16,43 @@ class Utils:
             return mem_gb, cores
         except:    return 8, 4
 
+    @staticmethod
+    def cache_dir(*parts):
+        """Returns ( and creates ) a directory under ~/.cache/donner."""
+        root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "donner"
+        path = root.joinpath(*parts)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
 class Build:
+    OVERRIDES = {"DXVK": ("d3d9", "d3d10core", "d3d11", "dxgi"), "VKD3D": ("d3d12", "d3d12core")}
+    ICD_NAMES = {"0x10de": ("nvidia",), "0x1002": ("radeon", "amd"), "0x8086": ("intel",)}
 
     @staticmethod
-    def _command( exe_file, tprefix ):
+    def _command( exe_file, tprefix, cpus=None, profile=None ):
+        from GUI_W_Profile import LaunchProfile    # Lazy : both build on Utils
+
+        snap = (profile or LaunchProfile(exe_file)).snapshot()    # Cached unless profile / hardware changed
+        env = {**os.environ, **snap["env"], "WINEPREFIX": tprefix or ""}
+        if os.environ.get("WINEDLLOVERRIDES") and "WINEDLLOVERRIDES" in snap["env"]:    # User's own entries come first
+            env["WINEDLLOVERRIDES"] = f"{os.environ['WINEDLLOVERRIDES']};{snap['env']['WINEDLLOVERRIDES']}"
+        env.setdefault("VK_ICD_FILENAMES", "")
+
+        boosters = list(snap["wrap"])
+        if cpus and snap["taskset"]:    # Own core set from the session scheduler
+            boosters += ["taskset", "-c", ",".join(map(str, cpus))]
+        elif snap["mask"]:    boosters += ["taskset", snap["mask"]]
 
-        mem_gb, cores = Utils.get_ram_cpucores()
+        return boosters + ["wine", *snap["args"], exe_file], env
+
+    @staticmethod
+    def _tuning( hw, profile ):
+        """Tuning env ( without os.environ ), wrapper argv, default taskset mask and wine
+        args before the exe; compiled once per profile + hardware by LaunchProfile.snapshot."""
+        mem_gb, cores = hw["mem_gb"], hw["cores"]
 
         # 1. Base & Performance Environment
-        env = {**os.environ,"PYTHONUNBUFFERED": "1", "WINEPREFIX": tprefix or "","WINEDEBUG": "-all,err+all"}
+        env = {"PYTHONUNBUFFERED": "1", "WINEDEBUG": "-all,err+all"}
         env.update({  "WINEUPDATE":"0", "WINE_NO_PRELOAD": "1", "WINE_SKIP_CONFIG_CHECK": "1"  })
         
         env.update({        # 2. Scalability
@@ -48,7 +76,6 @@ class Build:
             "DXVK_MAX_FRAME_LATENCY": "1",
             "STAGING_SHARED_MEMORY": "1",
             "MESA_VK_WSI_PRESENT_MODE": "immediate",
-            "VK_ICD_FILENAMES": env.get("VK_ICD_FILENAMES", ""),
         })
 
         # 4. Dynamic Memory Tuning (Avoids OOM Crashes & Mono Lags)
@@ -57,54 +84,63 @@ class Build:
         else:              env["MONO_GC_PARAMS"] = "nursery-size=16m,soft-heap-limit=128m"
 
 
-        try:        # 5. Sync
-            soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
-            if hard >= 524288:
-                resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
-                env.update({
-                        "WINEESYNC": "1",
-                        "WINEFSYNC": "1",
-                        "WINE_SYNC_IPC": "1",
-                        "WINEPROXYSYNC": "1",
-                        "WINE_RT_PRIO": "90",
-                        "WINE_ASYNCHRONOUS_SENDMSG": "1",
-                        "PULSE_LATENCY_MSEC": "60",
-                    })
-        except:    pass
-
-
-        try:        # 6. GPU Auto-Tuner (Robust Vendor Detection)
-            v_ids = ""
-            for d in [f for f in os.listdir('/sys/class/drm/') if f.startswith('card')]:
-                p = f'/sys/class/drm/{d}/device/vendor'
-                if os.path.exists(p):
-                    with open(p) as f: v_ids += f.read().lower()
-
-            if "0x10de" in v_ids:    # NVIDIA: Low latency + Laptop support
-                env.update({
-                    "__GL_MaxFramesAllowed": "1",
-                    "__GL_THREADED_OPTIMIZATIONS": "1",
-                    "__GL_SHADER_DISK_CACHE_SIZE":"1024",
-                    "__GL_SHADER_DISK_CACHE_SKIP_CLEANUP":"1",
-                    "__NV_PRIME_RENDER_OFFLOAD": "1",
-                    "__VK_LAYER_NV_optimus": "NVIDIA_only"
+        if hw["nofile_hard"] >= 524288:        # 5. Sync ( RLIMIT_NOFILE is raised once by HwProfile )
+            env.update({
+                    "WINEESYNC": "1",
+                    "WINEFSYNC": "1",
+                    "WINE_SYNC_IPC": "1",
+                    "WINEPROXYSYNC": "1",
+                    "WINE_RT_PRIO": "90",
+                    "WINE_ASYNCHRONOUS_SENDMSG": "1",
+                    "PULSE_LATENCY_MSEC": "60",
                 })
-            if "0x1002" in v_ids:   # AMD
-                env.update({"mesa_glthread": "true", "RADV_PERFTEST": "gpl,sam", "AMD_DEBUG": "precompile"})
-            if "0x8086" in v_ids:   # Intel
-                env.update({"mesa_glthread": "true", "INTEL_DEBUG": "noccs"})
 
-        except:    pass
 
+        v_ids = " ".join(hw["gpu_vendors"])        # 6. GPU Auto-Tuner (Vendor ids from the cached profile)
+
+        if "0x10de" in v_ids:    # NVIDIA: Low latency + Laptop support
+            env.update({
+                "__GL_MaxFramesAllowed": "1",
+                "__GL_THREADED_OPTIMIZATIONS": "1",
+                "__GL_SHADER_DISK_CACHE_SIZE":"1024",
+                "__GL_SHADER_DISK_CACHE_SKIP_CLEANUP":"1",
+                "__NV_PRIME_RENDER_OFFLOAD": "1",
+                "__VK_LAYER_NV_optimus": "NVIDIA_only"
+            })
+        if "0x1002" in v_ids:   # AMD
+            env.update({"mesa_glthread": "true", "RADV_PERFTEST": "gpl,sam", "AMD_DEBUG": "precompile"})
+        if "0x8086" in v_ids:   # Intel
+            env.update({"mesa_glthread": "true", "INTEL_DEBUG": "noccs"})
 
-        boosters = []        # 7. Command Assembler
 
-        if shutil.which("ionice"): boosters = ["ionice", "-c", "2", "-n", "0"]
+        on = {t for t, v in profile.toggles.items() if v}    # 7. Checkbox toggles ( validated per prefix by LaunchProfile.check )
+        dlls = [d for t in ("DXVK", "VKD3D") if t in on for d in Build.OVERRIDES[t]]
+        if dlls:    env["WINEDLLOVERRIDES"] = f"{','.join(dlls)}=n,b"    # Native DXVK / VKD3D-Proton, Wine's as fallback
+        if "Vulkan" in on and (icds := Build.icds(hw)):
+            env["VK_ICD_FILENAMES"] = env["VK_DRIVER_FILES"] = ":".join(icds)
 
-        if cores > 2 and shutil.which("taskset"):    # 8. Prioritizing Core Affinity
+        env.update(profile.flags)    # 8. Profile overrides ( A/B tuning ) win
+
+        boosters, mask = [], None        # 9. Wrappers
+
+        if hw["ionice"]: boosters = ["ionice", "-c", "2", "-n", "0"]
+        if "Gamemode" in on and hw.get("gamemoderun"):    boosters = ["gamemoderun"] + boosters
+
+        if cores > 2 and hw["taskset"]:    # 10. Prioritizing Core Affinity
             mask = "0xFE" if cores > 8 else hex((1 << cores) - 2)
-            boosters += ["taskset", mask]
 
-        cmd = boosters + ["wine", exe_file]        # 9. Assemble final command
-        
-        return cmd, env
+        args, res = [], re.fullmatch(r"(\d+)x(\d+)", (profile.resolution or "").replace(" ", ""))
+        if res and hw.get("gamescope"):    # 11. Resolution : gamescope renders at it, FSR upscales to the screen
+            try:    strength = min(5, max(0, int(float(env.get("WINE_FULLSCREEN_FSR_STRENGTH") or 2))))
+            except ValueError:    strength = 2    # Unparsable profile flag : Wine's default
+            sharp = str(4 * strength)    # Wine 0-5 -> gamescope 0-20
+            boosters = ["gamescope", "-w", res[1], "-h", res[2], "-f", "-F", "fsr", "--fsr-sharpness", sharp, "--"] + boosters
+        elif res:    args = ["explorer", f"/desktop=Donner,{res[1]}x{res[2]}"]    # Wine virtual desktop
+
+        return env, boosters, mask, args
+
+    @staticmethod
+    def icds(hw):
+        """ICD manifests of the host's GPU vendors ( lavapipe and the rest left out )."""
+        names = [n for v in hw["gpu_vendors"] for n in Build.ICD_NAMES.get(v, ())]
+        return [i for i in hw.get("vk_icds") or [] if any(n in os.path.basename(i).lower() for n in names)]
@@ -0,0 +1,133 @@
+
+import os
+import sys
+import glob
+import time
+import heapq
+import itertools
+import threading
+
+class CpuTopology:
+    """Physical cores from /sys/devices/system/cpu, grouped with their SMT siblings and NUMA node."""
+    ROOT = "/sys/devices/system/cpu"
+
+    @staticmethod
+    def parse_list(text):
+        cpus = []
+        for part in filter(None, text.strip().split(",")):
+            lo, _, hi = part.partition("-")
+            cpus += range(int(lo), int(hi or lo) + 1)
+        return cpus
+
+    @staticmethod
+    def _read(path, default=None):
+        try:
+            with open(path) as f: return f.read().strip()
+        except OSError:    return default
+
+    @classmethod
+    def cores(cls):
+        """[(node, package, core_id, [cpus])] sorted so neighbours share a node/package."""
+        allowed = os.sched_getaffinity(0)
+        node_of = {}
+        for node in glob.glob("/sys/devices/system/node/node[0-9]*"):
+            for cpu in cls.parse_list(cls._read(f"{node}/cpulist", "")):    node_of[cpu] = int(node.rsplit("node", 1)[1])
+
+        groups = {}
+        for cpu in sorted(allowed):
+            topo = f"{cls.ROOT}/cpu{cpu}/topology"
+            pkg = int(cls._read(f"{topo}/physical_package_id", "0"))
+            core = int(cls._read(f"{topo}/core_id", str(cpu)))
+            groups.setdefault((node_of.get(cpu, 0), pkg, core), []).append(cpu)
+        return sorted((n, p, c, cpus) for (n, p, c), cpus in groups.items())
+
+    @classmethod
+    def partition(cls, jobs, reserve=1):
+        """`jobs` disjoint cpu lists; SMT siblings stay together, a job never spans two NUMA
+        nodes unless it owns them whole, and the first `reserve` physical cores are left to
+        the desktop ( the old 0xFE taskset mask )."""
+        cores = cls.cores()
+        if len(cores) > reserve + 1:    cores = cores[reserve:]
+        jobs = max(1, min(jobs, len(cores)))
+
+        nodes = {}
+        for core in cores:    nodes.setdefault(core[0], []).append(core[3])
+        nodes = sorted(nodes.values(), key=len, reverse=True)
+
+        if jobs <= len(nodes):    # Whole nodes per job
+            return [sorted(c for node in nodes[j::jobs] for core in node for c in core) for j in range(jobs)]
+
+        share = [max(1, len(n) * jobs // len(cores)) for n in nodes]     # Jobs per node, by size
+        for i in sorted(range(len(nodes)), key=lambda i: len(nodes[i]) / share[i], reverse=True)[:max(0, jobs - sum(share))]:
+            share[i] += 1
+
+        out = []
+        for node, k in zip(nodes, share):     # Contiguous chunks of each node
+            size, extra, i = *divmod(len(node), k), 0
+            for j in range(k):
+                n = size + (j < extra)
+                out.append(sorted(c for core in node[i:i + n] for c in core)) ; i += n
+        return [c for c in out if c][:jobs]
+
+
+class Job:
+    def __init__(self, jid, exe, priority):
+        self.id, self.exe, self.priority = jid, exe, priority
+        self.state, self.cpus, self.ok = "queued", None, None
+        self.queued, self.started, self.ended = time.monotonic(), None, None
+
+    def elapsed(self):
+        if not self.started:    return 0.0
+        return (self.ended or time.monotonic()) - self.started
+
+
+class SessionScheduler:
+    """Runs exe jobs with at most `max_jobs` in parallel, each pinned to its own core set.
+
+    runner(job, finish) must start the job without blocking and call finish(ok) when it ends;
+    on_change(job) is called on every state change.
+    """
+
+    def __init__(self, runner, max_jobs=None, on_change=None):
+        self.runner, self.on_change = runner, on_change or (lambda job: None)
+        physical = len(CpuTopology.cores())
+        self.slots = CpuTopology.partition(max_jobs or max(1, min(4, physical // 2)))
+        self.free = list(range(len(self.slots)))
+        self.queue, self.jobs = [], []
+        self.ids, self.lock = itertools.count(1), threading.RLock()
+
+    def submit(self, exe, priority=0):
+        """Higher priority runs first; equal priorities keep submission order."""
+        with self.lock:
+            job = Job(next(self.ids), exe, priority)
+            self.jobs.append(job)
+            heapq.heappush(self.queue, (-priority, job.id, job))
+        self.on_change(job)
+        self._pump()
+        return job
+
+    def _pump(self):
+        while True:
+            with self.lock:
+                if not self.queue or not self.free:    return
+                _, _, job = heapq.heappop(self.queue)
+                slot = self.free.pop(0)
+                job.state, job.cpus, job.started = "running", self.slots[slot], time.monotonic()
+            self.on_change(job)
+            try:    self.runner(job, lambda ok, job=job, slot=slot: self._finish(job, slot, ok))
+            except Exception:    self._finish(job, slot, False)
+
+    def _finish(self, job, slot, ok):
+        with self.lock:
+            job.state, job.ok, job.ended = "done" if ok else "failed", ok, time.monotonic()
+            self.free.append(slot) ; self.free.sort()
+        self.on_change(job)
+        self._pump()
+
+    def pending(self):
+        with self.lock:    return sum(j.state in ("queued", "running") for j in self.jobs)
+
+
+if __name__ == "__main__":
+    for n, p, c, cpus in CpuTopology.cores():    print(f"node {n} pkg {p} core {c}: cpus {cpus}")
+    print("partition:", CpuTopology.partition(int(sys.argv[1]) if len(sys.argv) > 1 else 2))
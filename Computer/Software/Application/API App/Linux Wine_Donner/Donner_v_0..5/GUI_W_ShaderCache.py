@@ -0,0 +1,285 @@
+
+import os
+import re
+import sys
+import json
+import time
+import fcntl
+import shutil
+import struct
+import hashlib
+import tempfile
+import statistics
+from pathlib import Path
+from contextlib import contextmanager
+
+from GUI_W_Runner_Builder import Utils
+from GUI_W_PrefixStore import FICLONE, disk_usage
+
+class ShaderCache:
+    """Shader / pipeline caches of one exe on one GPU, kept outside the disposable prefix.
+
+    ~/.cache/donner/shaders/<gpu>/<exe>/{dxvk,vkd3d,mesa,nvidia} are handed to the game
+    through the drivers' cache path variables. Stray DXVK state caches ( DXVK's default
+    is next to the exe ) are merged in without duplicate entries, identical cache files
+    across exes share their extents through reflinks ( copy-on-write : drivers rewrite
+    some files in place ), and whole exe caches are evicted least recently used first
+    once the store exceeds its budget ( DONNER_SHADER_BUDGET_MB, 4 GiB ). index.json and
+    hashes.json change under an flock on the store, so parallel launches can share it.
+    """
+    KINDS = {
+        "dxvk": ("DXVK_STATE_CACHE_PATH",),
+        "vkd3d": ("VKD3D_SHADER_CACHE_PATH",),
+        "mesa": ("MESA_SHADER_CACHE_DIR", "MESA_GLSL_CACHE_DIR"),
+        "nvidia": ("__GL_SHADER_DISK_CACHE_PATH",),
+    }
+    MAGIC = b"DXVK"
+    COMPILE_MS = 20.0    # One pipeline compiled at draw time, when telemetry has no frame times
+    BUDGET = 4 << 30
+
+    def __init__(self, exe, hw=None, root=None, budget=None, log=print):
+        if hw is None:
+            from GUI_W_HwProfile import HwProfile ; hw = HwProfile.get()
+        self.exe, self.log = os.path.abspath(exe), log
+        self.root = Path(root) if root else Utils.cache_dir("shaders")
+        self.budget = budget or (int(os.environ.get("DONNER_SHADER_BUDGET_MB", 0)) << 20) or self.BUDGET
+        try:    size = os.path.getsize(self.exe)
+        except OSError:    size = 0
+        self.key = f"{self.gpu_key(hw)}/{Path(self.exe).stem}-{size:x}"    # Same build of a game anywhere on disk
+        self.dir, self.before = self.root / self.key, None
+
+    @staticmethod
+    def gpu_key(hw):
+        ids = hw.get("vulkan") or hw.get("gpu_vendors") or ["generic"]
+        slug = re.sub(r"[^\w.-]+", "_", ids[0])[:32]
+        return f"{slug}-{hashlib.sha1(json.dumps([hw.get('gpu_vendors'), hw.get('vulkan')]).encode()).hexdigest()[:8]}"
+
+    # DXVK state cache : "DXVK" u32 version u32 entry size, then ( v8+ ) u32 stage mask / size, sha1, data
+
+    @classmethod
+    def dxvk_entries(cls, path):
+        """( version, entry size, [( key, raw entry )] ); None for a missing or foreign file."""
+        try:    data = Path(path).read_bytes()
+        except OSError:    return None
+        if len(data) < 12 or data[:4] != cls.MAGIC:    return None
+        version, size = struct.unpack_from("<II", data, 4)
+        out, o = [], 12
+        while o < len(data):
+            if version >= 8:
+                n = struct.unpack_from("<I", data, o)[0] >> 8 if o + 24 <= len(data) else 0
+                end = o + 24 + n
+                if not n or end > len(data):    break    # Torn tail of an interrupted write
+                out.append((data[o + 4:o + 24], data[o:end])) ; o = end
+            else:
+                if not size or o + size > len(data):    break
+                raw = data[o:o + size] ; out.append((hashlib.sha1(raw).digest(), raw)) ; o += size
+        return version, size, out
+
+    @classmethod
+    def dxvk_merge(cls, dst, *sources):
+        """Unique entries of dst + sources ( same cache version only ) written to dst; returns counts."""
+        base = cls.dxvk_entries(dst)
+        head, seen, entries, dupes = (base[:2] if base else None), set(), [], 0
+        for src in ([dst] if base else []) + list(sources):
+            got = cls.dxvk_entries(src)
+            if not got or head and got[:2] != head:    continue    # Older / newer DXVK : cannot mix
+            head = head or got[:2]
+            for key, raw in got[2]:
+                if key in seen:    dupes += 1 ; continue
+                seen.add(key) ; entries.append(raw)
+        if head:    cls._write(dst, cls.MAGIC + struct.pack("<II", *head) + b"".join(entries))
+        return {"entries": len(entries), "dupes": dupes}
+
+    # Session
+
+    def counts(self):
+        """Cached items per kind : DXVK pipelines, files elsewhere ( vkd3d : KiB, one growing file )."""
+        out = {}
+        for kind in self.KINDS:
+            d = self.dir / kind
+            if kind == "dxvk":    out[kind] = sum(len((self.dxvk_entries(p) or (0, 0, []))[2]) for p in d.glob("*.dxvk-cache"))
+            elif kind == "vkd3d":    out[kind] = sum(p.stat().st_size for p in d.glob("*") if p.is_file()) >> 10
+            else:    out[kind] = sum(len(fs) for _, _, fs in os.walk(d))
+        return out
+
+    def begin(self):
+        """Adopts stray caches, notes the starting counts; returns the env for the launch."""
+        for kind in self.KINDS:    (self.dir / kind).mkdir(parents=True, exist_ok=True)
+        for stray in Path(self.exe).parent.glob("*.dxvk-cache"):    # DXVK's default spot, or shipped with the game
+            st = self._read_index(self.root).get(self.key, {}).get("adopted", {}).get(stray.name)
+            if st != stray.stat().st_mtime_ns:
+                res = self.dxvk_merge(self.dir / "dxvk" / stray.name, stray)
+                self.log(f"🧊 Merged {stray.name} into the shader store ( {res['entries']} pipelines, {res['dupes']} duplicates dropped )")
+                self._touch(adopted={stray.name: stray.stat().st_mtime_ns})
+        self.before = self.counts()
+        self._touch()
+
+        env = {var: str(self.dir / kind) for kind, names in self.KINDS.items() for var in names}
+        env.update({"DXVK_STATE_CACHE": "1", "__GL_SHADER_DISK_CACHE": "1", "__GL_SHADER_DISK_CACHE_SKIP_CLEANUP": "1",
+                    "MESA_SHADER_CACHE_MAX_SIZE": f"{max(1, self.budget >> 30)}G"})
+        return env
+
+    def end(self, tel=None):
+        """Hit ratio ( cached / cached + compiled during the run ) and the stutter it saved."""
+        if self.before is None:    return {}
+        after = self.counts()
+        items = [k for k in self.KINDS if k != "vkd3d"]
+        hits, new = sum(self.before[k] for k in items), sum(max(0, after[k] - self.before[k]) for k in items)
+        cost, src = self.COMPILE_MS, "typical"
+        frames = [f for f in (tel.cols["frame_ms"] if tel else []) if f == f]
+        if new and len(frames) > 4:    # Frame-time spikes over the median, spread over the new pipelines
+            med = statistics.median(frames)
+            spikes = sum(f - 2 * med for f in frames if f > 2 * med)
+            if spikes:    cost, src = spikes / new, "measured"
+        rep = {"before": self.before, "after": after, "hits": hits, "compiled": new,
+               "hit_ratio": round(hits / (hits + new), 3) if hits + new else None,
+               "stutter_saved_ms": round(hits * cost), "compile_ms": round(cost, 1), "cost": src}
+        self._touch(runs=1, hits=hits, compiled=new)
+        rep.update(self.maintain(self.root, self.budget, self.log, keep=self.key))
+        return rep
+
+    @staticmethod
+    def format(rep):
+        if not rep or rep["hit_ratio"] is None:    return "🧊 Shader cache: nothing cached or compiled yet."
+        return (f"🧊 Shader cache: {rep['hit_ratio'] * 100:.0f}% hit ( {rep['hits']} cached, {rep['compiled']} compiled this run ), "
+                f"~{rep['stutter_saved_ms'] / 1000:.1f}s of stutter saved at {rep['compile_ms']:.0f} ms/compile ( {rep['cost']} )")
+
+    # Store-wide : index, dedupe, LRU
+
+    @staticmethod
+    @contextmanager
+    def _locked(root):
+        """Exclusive flock on the store, across threads and processes."""
+        with open(Path(root) / ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:    yield
+            finally:    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _write(path, data):
+        fd, tmp = tempfile.mkstemp(".tmp", dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:    f.write(data.encode() if isinstance(data, str) else data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_index(root):
+        try:    return json.loads((Path(root) / "index.json").read_text())
+        except (OSError, ValueError):    return {}
+
+    def _touch(self, adopted=None, **add):
+        with self._locked(self.root):
+            idx = self._read_index(self.root)
+            e = idx.setdefault(self.key, {"exe": self.exe})
+            e["used"] = time.time()
+            for k, v in add.items():    e[k] = e.get(k, 0) + v
+            if adopted:    e.setdefault("adopted", {}).update(adopted)
+            self._write(self.root / "index.json", json.dumps(idx))
+
+    @staticmethod
+    def _reflink(src, dst):
+        with open(src, "rb") as s, open(dst, "wb") as d:    fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        shutil.copystat(src, dst)
+
+    @classmethod
+    def dedupe(cls, root):
+        """Reflinks identical cache files across the store ( size match first, then sha1, kept
+        per inode in hashes.json so a file is read once ); returns bytes saved. Never hardlinks :
+        a driver rewriting one game's file must not change another's. Call under _locked()."""
+        root = Path(root)
+        try:    known = {k: v if isinstance(v, list) else [v, False] for k, v in json.loads((root / "hashes.json").read_text()).items()}
+        except (OSError, ValueError):    known = {}
+        by_size, digests = {}, {}
+        for dirpath, _, files in os.walk(root):
+            for f in files:
+                p = os.path.join(dirpath, f)
+                st = os.lstat(p)
+                if st.st_size > 4096 and not f.endswith((".json", ".tmp", ".dxvk-cache")) and "vkd3d" not in dirpath:
+                    by_size.setdefault(st.st_size, []).append((p, f"{st.st_ino}-{st.st_mtime_ns}"))
+        saved, cloned = 0, {}
+        for size, group in by_size.items():
+            if len(group) < 2:    continue
+            first = {}
+            for p, ino in group:
+                if ino not in digests:
+                    if ino not in known:
+                        with open(p, "rb") as f:    known[ino] = [hashlib.sha1(f.read()).hexdigest(), False]
+                    digests[ino] = known[ino][0]
+                keep = first.setdefault(digests[ino], (p, ino))
+                if keep[1] == ino or known[ino][1]:    continue    # Already sharing extents
+                fd, tmp = tempfile.mkstemp(".tmp", dir=os.path.dirname(p)) ; os.close(fd)
+                try:    cls._reflink(keep[0], tmp)
+                except OSError:    os.unlink(tmp) ; break    # No reflinks on this filesystem
+                os.replace(tmp, p) ; saved += size
+                st = os.lstat(p) ; cloned[f"{st.st_ino}-{st.st_mtime_ns}"] = [digests[ino], True]
+        cls._write(root / "hashes.json", json.dumps({**{k: v for k, v in known.items() if k in digests}, **cloned}))    # Live inodes only
+        return saved
+
+    @classmethod
+    def maintain(cls, root, budget, log=print, keep=None):
+        """Dedupe, then evict least recently used exe caches until the store fits `budget`;
+        `keep` ( the cache the finishing run just wrote ) is never evicted."""
+        root = Path(root)
+        with cls._locked(root):
+            saved = cls.dedupe(root)
+            idx = cls._read_index(root)
+            used, evicted = disk_usage(root), []
+            for key in sorted((k for k in idx if k != keep), key=lambda k: idx[k].get("used", 0)):
+                if used <= budget:    break
+                shutil.rmtree(root / key, ignore_errors=True) ; evicted.append(key) ; del idx[key]
+                used = disk_usage(root)
+            if evicted:    cls._write(root / "index.json", json.dumps(idx))
+        if evicted:
+            log(f"🧹 Shader store over budget : evicted {', '.join(evicted)} ( now {used / 2**20:.0f} MiB )")
+        return {"deduped_bytes": saved, "evicted": evicted, "bytes": used}
+
+
+def _dxvk_file(path, keys, version=15):
+    entries = b"".join(struct.pack("<I", (len(k) + 100) << 8 | 0x1F) + hashlib.sha1(k).digest() + k + bytes(100) for k in keys)
+    Path(path).write_bytes(ShaderCache.MAGIC + struct.pack("<II", version, 0) + entries)
+
+def bench(sessions=5, pipelines=2000):
+    """Simulated sessions of two games : each run reuses the cache and compiles a shrinking
+    tail of new pipelines; stray caches are merged, shared Mesa files deduped, LRU evicted."""
+    hw = {"gpu_vendors": ["0x1002"], "vulkan": ["AMD Radeon RX 6600 (RADV NAVI23)"]}
+    quiet = lambda t: None
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        games = []
+        for g in ("alpha", "beta"):
+            (tmp / g).mkdir() ; exe = tmp / g / f"{g}.exe" ; exe.write_bytes(b"MZ" + g.encode())
+            games.append(exe)
+        _dxvk_file(tmp / "alpha" / "alpha.dxvk-cache", [f"p{i}".encode() for i in range(500)])    # Stray, from an older setup
+
+        deduped = 0
+        for s in range(sessions):
+            for exe in games:
+                sc = ShaderCache(exe, hw, root=tmp / "store", budget=1 << 30, log=quiet)
+                env = sc.begin()
+                dxvk = Path(env["DXVK_STATE_CACHE_PATH"]) / f"{exe.stem}.dxvk-cache"
+                known = [k for _, raw in (ShaderCache.dxvk_entries(dxvk) or (0, 0, []))[2] for k in [raw[24:-100]]]
+                new = [f"p{i}".encode() for i in range(len(known), min(pipelines, len(known) + pipelines // (2 ** (s + 1))))]
+                _dxvk_file(dxvk, known + new)    # What DXVK would have appended during the run
+                mesa = Path(env["MESA_SHADER_CACHE_DIR"])
+                for i in range(len(new) // 10):    # Every other one an engine shader, identical in both games
+                    p = mesa / f"{i % 256:02x}" / f"{exe.stem}-{s}-{i}" ; p.parent.mkdir(exist_ok=True)
+                    p.write_bytes(f"{s}-{i}".encode().ljust(8192, b"\0") if i % 2 else os.urandom(8192))
+                rep = sc.end() ; deduped += rep["deduped_bytes"]
+                print(f"   run {s + 1} {exe.stem:5} : {ShaderCache.format(rep)}")
+
+        used = disk_usage(tmp / "store")
+        print(f"🔗 dedupe saved {deduped / 2**20:.1f} MiB, store {used / 2**20:.1f} MiB")
+        t0 = time.perf_counter() ; st = ShaderCache.maintain(tmp / "store", used * 3 // 4, print)
+        print(f"📦 budget {used * 3 // 4 / 2**20:.1f} MiB : {st['bytes'] / 2**20:.1f} MiB kept, evicted {st['evicted']} "
+              f"( {(time.perf_counter() - t0) * 1000:.0f} ms )")
+
+
+if __name__ == "__main__":
+    # python3 GUI_W_ShaderCache.py           benchmark
+    # python3 GUI_W_ShaderCache.py status    per-exe usage of the shader store
+    if sys.argv[1:2] == ["status"]:
+        root = Utils.cache_dir("shaders")
+        idx = ShaderCache._read_index(root)
+        for key, e in sorted(idx.items(), key=lambda kv: -kv[1].get("used", 0)):
+            print(f"{key:60} {disk_usage(root / key) / 2**20:8.1f} MiB  {e.get('runs', 0)} runs  "
+                  f"last {time.strftime('%Y-%m-%d %H:%M', time.localtime(e.get('used', 0)))}")
+    else:    bench()
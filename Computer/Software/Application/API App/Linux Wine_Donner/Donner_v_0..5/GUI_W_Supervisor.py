@@ -0,0 +1,146 @@
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+class Supervisor:
+    """One asyncio loop on one thread that owns every child process of the app.
+
+    Games, wineboot, winetricks and mounts run as coroutines on it : output streams
+    line by line, every job can be cancelled or time out, and either way its whole
+    process group is killed. Blocking Python steps ( pkexec mounts, prefix stores )
+    go to a small bounded executor instead of a fresh QThread per action.
+    """
+    _shared = None
+
+    def __init__(self, blocking=4):
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(ThreadPoolExecutor(blocking, thread_name_prefix="donner-io"))
+        self.tasks = set()
+        threading.Thread(target=self.loop.run_forever, daemon=True, name="donner-supervisor").start()
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:    cls._shared = cls()
+        return cls._shared
+
+    def submit(self, coro, on_done=None):
+        """Schedules `coro` from any thread; on_done(result) gets False for errors / cancels.
+        Returns a concurrent Future : .cancel() cancels the coroutine."""
+        fut = asyncio.run_coroutine_threadsafe(self._track(coro), self.loop)
+        if on_done:
+            fut.add_done_callback(lambda f: on_done(False if f.cancelled() or f.exception() else f.result()))
+        return fut
+
+    def call(self, coro):
+        """Runs `coro` to completion from synchronous code. On the Supervisor's own threads,
+        where waiting on the loop would hold an executor thread it needs, it gets a private loop."""
+        if threading.current_thread().name.startswith("donner-"):    return asyncio.run(coro)
+        return self.submit(coro).result()
+
+    async def _track(self, coro):
+        task = asyncio.current_task() ; self.tasks.add(task)
+        try:    return await coro
+        finally:    self.tasks.discard(task)
+
+    def shutdown(self, timeout=5):
+        """Cancels every job ( killing its processes ) and waits for them to unwind."""
+        async def cancel_all():
+            for t in list(self.tasks):    t.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        try:    asyncio.run_coroutine_threadsafe(cancel_all(), self.loop).result(timeout)
+        except Exception:    pass
+
+    # Coroutines
+
+    @staticmethod
+    async def blocking(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    @staticmethod
+    async def kill(proc, grace=2):
+        """SIGTERM then SIGKILL to the process group of `proc` ( asyncio or Popen )."""
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:    os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):    return
+            t0 = time.monotonic()
+            while time.monotonic() - t0 < grace:
+                if (proc.returncode if isinstance(proc, asyncio.subprocess.Process) else proc.poll()) is not None:    return
+                await asyncio.sleep(0.05)
+
+    @classmethod
+    async def run(cls, argv, env=None, cwd=None, timeout=None, on_line=None):
+        """Runs `argv` in its own session, streaming merged stdout/stderr lines to on_line;
+        returns the exit code. On timeout or cancellation the group is killed and the
+        TimeoutError / CancelledError propagates."""
+        proc = await asyncio.create_subprocess_exec(
+            *argv, env=env, cwd=cwd, start_new_session=True,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        async def stream():
+            async for raw in proc.stdout:
+                if on_line:    on_line(raw.decode(errors="ignore").rstrip())
+            return await proc.wait()
+
+        try:    return await asyncio.wait_for(stream(), timeout)
+        except BaseException:
+            await cls.kill(proc) ; raise
+
+    @classmethod
+    async def wineboot(cls, prefix, env=None, on_line=None, timeout=300):
+        env = {**(env or os.environ), "WINEPREFIX": str(prefix), "WINEDEBUG": "-all"}
+        code = await cls.run(["wineboot", "-u"], env, timeout=timeout, on_line=on_line)
+        await cls.run(["wineserver", "-w"], env, timeout=timeout)
+        return code
+
+    @classmethod
+    async def winetricks(cls, prefix, verbs, env=None, on_line=None, timeout=1800):
+        env = {**(env or os.environ), "WINEPREFIX": str(prefix)}
+        code = await cls.run(["winetricks", "-q", *verbs], env, timeout=timeout, on_line=on_line)
+        await cls.run(["wineserver", "-w"], env, timeout=timeout)
+        return code
+
+    @classmethod
+    async def mount(cls, base, root, log=print):
+        from GUI_W_Backends import Backends    # pkexec prompts block : executor thread
+        return await cls.blocking(lambda: Backends.create(base, root, log=log))
+
+
+def bench(jobs=50, seconds=0.2):
+    """Per-job overhead : a thread + subprocess.run per job vs coroutines on one loop."""
+    argv = [sys.executable, "-c", f"import time; print('tick'); time.sleep({seconds})"]
+
+    t0, peak = time.perf_counter(), [0]
+    def one():    subprocess.run(argv, capture_output=True)
+    threads = [threading.Thread(target=one) for _ in range(jobs)]
+    for t in threads:    t.start()
+    peak[0] = threading.active_count()
+    for t in threads:    t.join()
+    t_threads = time.perf_counter() - t0
+
+    sup, lines = Supervisor(), []
+    async def many():    return await asyncio.gather(*(Supervisor.run(argv, on_line=lines.append) for _ in range(jobs)))
+    t0 = time.perf_counter()
+    fut = sup.submit(many())
+    time.sleep(seconds / 2) ; peak_async = threading.active_count()
+    fut.result()
+    t_async = time.perf_counter() - t0
+
+    async def cancel_me():    return await Supervisor.run([sys.executable, "-c", "import time; time.sleep(60)"], timeout=0.3)
+    t0 = time.perf_counter()
+    try:    sup.submit(cancel_me()).result()
+    except asyncio.TimeoutError:    pass
+    t_kill = time.perf_counter() - t0
+
+    print(f"🧵 threads   : {jobs} jobs in {t_threads:.2f}s, {peak[0]} threads, {(t_threads - seconds) / jobs * 1000:.1f} ms/job overhead")
+    print(f"🌀 supervisor: {jobs} jobs in {t_async:.2f}s, {peak_async} threads, {(t_async - seconds) / jobs * 1000:.1f} ms/job overhead, {len(lines)} lines streamed")
+    print(f"⏱️ timeout -> group killed after {t_kill:.2f}s")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,178 @@
+
+import os
+import sys
+import time
+import shlex
+import queue
+import tempfile
+import threading
+import subprocess
+from shutil import which
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+class Teardown:
+    """Prefix removal that returns instantly.
+
+    trash() renames the prefix into a `.donner-trash` dir next to it ( same filesystem,
+    so the rename is atomic ), then a background thread reclaims the space : all pending
+    overlay unmounts of a batch go through one elevated helper call, and the files are
+    deleted in parallel as the user. Only leftovers the user cannot remove ( the root
+    owned overlay work dir ) cost a second elevated call. A batch closes once no delete
+    arrived for `quiet` seconds ( at most `hold` after its first ), or right away in wait().
+    """
+    TRASH = ".donner-trash"
+    _shared = None
+
+    def __init__(self, workers=8, quiet=5.0, hold=60.0, log=print):
+        self.workers, self.quiet, self.hold, self.log = workers, quiet, hold, log
+        self.q, self.busy, self.flush = queue.Queue(), threading.Event(), threading.Event()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    @classmethod
+    def shared(cls, log=None):
+        if cls._shared is None:    cls._shared = cls()
+        if log:    cls._shared.log = log
+        return cls._shared
+
+    @classmethod
+    def drain(cls, timeout=None):
+        """Waits for the shared instance, if one was ever started ( app exit )."""
+        if cls._shared:    cls._shared.wait(timeout)
+
+    def trash(self, target):
+        target = Path(target).absolute()
+        bin_ = target.parent / self.TRASH
+        bin_.mkdir(exist_ok=True)
+        for old in bin_.iterdir():    self.q.put(old)     # Leftovers of an earlier session
+
+        dst = bin_ / f"{target.name}-{time.time_ns()}"
+        os.rename(target, dst)
+        self.busy.set() ; self.q.put(dst)
+        return dst
+
+    def _loop(self):
+        while True:
+            batch = {self.q.get()}
+            start = last = time.monotonic()
+            while not self.flush.is_set():    # Debounce : every new delete restarts the window, up to `hold`
+                left = min(last + self.quiet, start + self.hold) - time.monotonic()
+                if left <= 0:    break
+                try:    batch.add(self.q.get(timeout=min(left, 0.1))) ; last = time.monotonic()
+                except queue.Empty:    pass
+            while not self.q.empty():    batch.add(self.q.get())
+            try:    self._reclaim(sorted(p for p in batch if os.path.lexists(p)))
+            except Exception as e:    self.log(f"❌ Teardown failed: {e}")
+            finally:
+                if self.q.empty():    self.busy.clear()
+
+    @staticmethod
+    def mounts_under(roots):
+        """Mountpoints below `roots`, deepest first ( from /proc/self/mountinfo, no fork )."""
+        roots, found = [str(r) + "/" for r in roots], []
+        try:
+            with open("/proc/self/mountinfo") as f:
+                for line in f:
+                    mp = line.split()[4].replace("\\040", " ")
+                    if any((mp + "/").startswith(r) for r in roots):    found.append(mp)
+        except OSError:    pass
+        return sorted(found, key=len, reverse=True)
+
+    @staticmethod
+    def elevated(script):
+        """One pkexec call for a whole batch of privileged steps ( none needed when already root )."""
+        sudo = ["pkexec"] if os.geteuid() else []
+        try:    return subprocess.run(sudo + ["bash", "-c", script], capture_output=True).returncode == 0
+        except OSError:    return False
+
+    def _reclaim(self, roots):
+        if not roots:    return
+        mounts = self.mounts_under(roots)
+        if mounts:
+            fuse = [m for m in mounts if subprocess.run(["fusermount", "-u", m], capture_output=True).returncode == 0] \
+                if which("fusermount") else []
+            rest = [m for m in mounts if m not in fuse]
+            if rest:
+                self.log(f"🔐 Unmounting {len(rest)} overlay(s) in one elevated call...")
+                self.elevated("; ".join(f"umount -l {shlex.quote(m)}" for m in rest))
+
+        t0, stats, failed = time.monotonic(), {"files": 0, "bytes": 0}, []
+        for root in roots:    self._rmtree(root, stats, failed, t0)
+
+        if failed:
+            left = sorted({r for r in roots if os.path.lexists(r)})
+            self.log(f"🔐 {len(failed)} root-owned entries left, removing in one elevated call...")
+            self.elevated("rm -rf " + " ".join(shlex.quote(str(r)) for r in left))
+
+        for bin_ in {os.path.dirname(r) for r in roots}:    # Drop emptied trash dirs
+            try:    os.rmdir(bin_)
+            except OSError:    pass
+
+        dt = max(time.monotonic() - t0, 1e-6)
+        self.log(f"✅ Reclaimed {stats['files']} files, {stats['bytes'] / 2**20:.1f} MiB in {dt:.1f}s "
+                 f"( {stats['files'] / dt:,.0f} files/s, {stats['bytes'] / 2**20 / dt:.1f} MiB/s )")
+
+    def _rmtree(self, root, stats, failed, t0):
+        dirs, stack, lock = [], [str(root)], threading.Lock()
+        dev = os.lstat(root).st_dev
+        last = [time.monotonic()]
+
+        def unlink_all(paths):
+            n = size = 0
+            for p, sz in paths:
+                try:    os.unlink(p) ; n += 1 ; size += sz
+                except FileNotFoundError:    pass
+                except OSError:    failed.append(p)
+            with lock:
+                stats["files"] += n ; stats["bytes"] += size
+                now = time.monotonic()
+                if now - last[0] > 1:
+                    last[0] = now
+                    self.log(f"🧹 {stats['files']} files, {stats['bytes'] / 2**20:.0f} MiB ( {stats['bytes'] / 2**20 / (now - t0):.0f} MiB/s )")
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            while stack:    # One task per directory's files; directories removed afterwards, deepest first
+                d = stack.pop() ; dirs.append(d) ; files = []
+                try:
+                    with os.scandir(d) as it:
+                        for e in it:
+                            st = e.stat(follow_symlinks=False)
+                            if e.is_dir(follow_symlinks=False):
+                                if st.st_dev == dev:    stack.append(e.path)     # Never descend into a live mount
+                                else:    failed.append(e.path)
+                            else:    files.append((e.path, st.st_size))
+                except OSError:    failed.append(d) ; continue
+                if files:    pool.submit(unlink_all, files)
+
+        for d in reversed(dirs):
+            try:    os.rmdir(d)
+            except FileNotFoundError:    pass
+            except OSError:    failed.append(d)
+
+    def wait(self, timeout=None):
+        """Closes the pending batch now and blocks until the queue is drained ( session end /
+        app exit )."""
+        deadline = time.monotonic() + (timeout or 1e9)
+        self.flush.set()
+        try:
+            while (not self.q.empty() or self.busy.is_set()) and time.monotonic() < deadline:    time.sleep(0.05)
+        finally:    self.flush.clear()
+
+
+def bench(files=50_000):
+    """Time to return from delete ( rename ) vs background reclaim, on a synthetic prefix."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "prefix"
+        for i in range(files):
+            d = root / "drive_c" / f"d{i % 200}"
+            if i < 200:    d.mkdir(parents=True)
+            (d / f"f{i}").write_bytes(b"x" * (i % 64 * 1024))
+
+        td = Teardown()
+        t0 = time.perf_counter() ; td.trash(root) ; instant = time.perf_counter() - t0
+        td.wait()
+        print(f"⚡ delete returned in {instant * 1000:.2f} ms; reclaim total {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,201 @@
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import array
+import threading
+import subprocess
+import tempfile
+
+class Telemetry:
+    """Samples a launched game's process group from /proc on an adaptive interval.
+
+    Per sample : CPU % ( summed over the group ), RSS, cumulative disk I/O, context
+    switches per second, threads and processes, plus the latest FPS / frame time seen
+    in the game output ( DXVK HUD / MangoHud style lines fed through feed_line ).
+    Columns are kept as float32 arrays and saved as one compact columnar file.
+    """
+    COLS = ("t", "cpu", "rss_mb", "read_mb", "write_mb", "ctx_s", "threads", "procs", "fps", "frame_ms")
+    SPARK = "▁▂▃▄▅▆▇█"
+    MAGIC = b"DTEL1\n"
+    RX_FPS = re.compile(rb"(?i)\bfps\s*[:=]\s*([\d.]+)")
+    RX_FRAME = re.compile(rb"(?i)frame\s*-?time\s*[:=]\s*([\d.]+)\s*ms")
+    TICK, PAGE = os.sysconf("SC_CLK_TCK"), os.sysconf("SC_PAGE_SIZE")
+
+    def __init__(self, pgid, min_iv=0.25, max_iv=2.0, on_sample=None):
+        self.pgid, self.min_iv, self.max_iv, self.on_sample = pgid, min_iv, max_iv, on_sample
+        self.cols = {c: array.array("f") for c in self.COLS}
+        self.pids, self.fps, self.frame = set(), math.nan, math.nan
+        self.stop_ev, self.thread, self.cost = threading.Event(), None, 0.0
+
+    def feed_line(self, line):
+        """LogPipe sink : picks FPS / frame-time figures out of the game output."""
+        if "fps" not in line.lower() and "frame" not in line.lower():    return
+        raw = line.encode(errors="ignore")
+        if m := self.RX_FPS.search(raw):    self.fps = float(m.group(1))
+        if m := self.RX_FRAME.search(raw):    self.frame = float(m.group(1))
+
+    def _scan(self):
+        """Members of the process group ( full /proc scan; cheap reuse in between )."""
+        found = set()
+        for d in os.listdir("/proc"):
+            if d.isdigit():
+                try:
+                    with open(f"/proc/{d}/stat", "rb") as f:    st = f.read()
+                    if int(st[st.rindex(b")") + 2:].split()[2]) == self.pgid:    found.add(int(d))
+                except (OSError, ValueError):    pass
+        self.pids = found
+
+    def _read(self):
+        ticks = rss = rd = wr = ctx = threads = 0
+        for pid in list(self.pids):
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as f:    st = f.read()
+                fields = st[st.rindex(b")") + 2:].split()
+                ticks += int(fields[11]) + int(fields[12]) ; threads += int(fields[17]) ; rss += int(fields[21])
+                with open(f"/proc/{pid}/status", "rb") as f:
+                    for line in f:
+                        if line.startswith((b"voluntary_ctxt", b"nonvoluntary_ctxt")):    ctx += int(line.split()[1])
+                try:
+                    with open(f"/proc/{pid}/io", "rb") as f:
+                        for line in f:
+                            if line.startswith(b"read_bytes"):    rd += int(line.split()[1])
+                            elif line.startswith(b"write_bytes"):    wr += int(line.split()[1])
+                except OSError:    pass     # io needs ptrace access, not fatal
+            except (OSError, ValueError, IndexError):    self.pids.discard(pid)
+        return ticks, rss * self.PAGE, rd, wr, ctx, threads
+
+    def _begin(self):
+        self.t0 = self.last_t = time.monotonic()
+        self._scan()
+        self.last, self.iv, self.n = self._read(), self.min_iv, 0
+        return self.iv
+
+    def _step(self):
+        """One sample; returns the next interval, None once the group is gone."""
+        c0 = time.thread_time()
+        self.n += 1
+        if self.n % 4 == 0 or not self.pids:    self._scan()
+        if not self.pids:    return None
+        now, cur, last = time.monotonic(), self._read(), self.last
+        dt = max(now - self.last_t, 1e-6)
+        cpu = max(0, cur[0] - last[0]) / self.TICK / dt * 100
+        row = (now - self.t0, cpu, cur[1] / 2**20, cur[2] / 2**20, cur[3] / 2**20,
+               max(0, cur[4] - last[4]) / dt, cur[5], len(self.pids), self.fps, self.frame)
+        prev = [self.cols["cpu"][-1], self.cols["rss_mb"][-1]] if len(self.cols["t"]) else None
+        if self.stop_ev.is_set():    return None    # stop() while this sample ran off-thread
+        for c, v in zip(self.COLS, row):    self.cols[c].append(v)
+        self.last, self.last_t = cur, now
+
+        steady = prev and abs(cpu - prev[0]) < 5 and abs(row[2] - prev[1]) < max(1, prev[1] * 0.02)
+        self.iv = min(self.max_iv, self.iv * 1.5) if steady else self.min_iv    # Back off while nothing changes
+        self.cost += time.thread_time() - c0
+        if self.on_sample:    self.on_sample(self)
+        return self.iv
+
+    def _loop(self):
+        self._begin()
+        iv = self.iv
+        while not self.stop_ev.wait(iv):
+            iv = self._step()
+            if iv is None:    break
+
+    def start(self, loop=None):
+        """Samples on its own thread, or paced by call_later on `loop` ( Supervisor games ) with
+        each /proc sample run in the loop's executor, so the loop never walks /proc."""
+        if loop is None:
+            self.thread = threading.Thread(target=self._loop, daemon=True) ; self.thread.start()
+            return self
+
+        def run(fn):
+            if not self.stop_ev.is_set():    loop.run_in_executor(None, fn).add_done_callback(done)
+        def done(fut):
+            iv = None if fut.cancelled() or fut.exception() or self.stop_ev.is_set() else fut.result()
+            if iv:    self.timer = loop.call_later(iv, run, self._step)
+        run(self._begin)
+        return self
+
+    def stop(self):
+        self.stop_ev.set()
+        if self.thread:    self.thread.join(timeout=5)
+        elif getattr(self, "timer", None):    self.timer.cancel()
+
+    # Output
+
+    @classmethod
+    def spark(cls, values, width=32):
+        vals = [v for v in values[-width:] if not math.isnan(v)]
+        if not vals:    return ""
+        lo, hi = min(vals), max(vals)
+        return "".join(cls.SPARK[int((v - lo) / (hi - lo) * 7) if hi > lo else 0] for v in vals)
+
+    def render(self):
+        c = self.cols
+        if not len(c["t"]):    return "📡 waiting for samples..."
+        parts = [f"CPU {self.spark(c['cpu'])} {c['cpu'][-1]:.0f}%", f"RSS {self.spark(c['rss_mb'])} {c['rss_mb'][-1]:.0f} MiB"]
+        if not math.isnan(c["fps"][-1]):    parts.append(f"FPS {self.spark(c['fps'])} {c['fps'][-1]:.0f}")
+        parts.append(f"thr {c['threads'][-1]:.0f}")
+        return "  ".join(parts)
+
+    def summary(self):
+        c, n = self.cols, len(self.cols["t"])
+        if not n:    return "📡 Telemetry: no samples ( process ended too early )."
+        fps = [v for v in c["fps"] if not math.isnan(v)]
+        frame = sorted(v for v in c["frame_ms"] if not math.isnan(v))
+        out = (f"📡 Telemetry: {n} samples over {c['t'][-1]:.0f}s, CPU avg {sum(c['cpu']) / n:.0f}% "
+               f"peak {max(c['cpu']):.0f}%, RSS peak {max(c['rss_mb']):.0f} MiB, "
+               f"I/O {c['read_mb'][-1]:.0f}/{c['write_mb'][-1]:.0f} MiB r/w, threads peak {max(c['threads']):.0f}")
+        if fps:    out += f", FPS avg {sum(fps) / len(fps):.1f}"
+        if frame:    out += f", frame time p99 {frame[min(len(frame) - 1, int(len(frame) * 0.99))]:.1f} ms"
+        return out + f" ( sampler {self.cost / max(c['t'][-1], 1e-6) * 100:.2f}% CPU )"
+
+    def save(self, path, meta=None):
+        """Header line ( JSON ) then each column as raw little-endian float32."""
+        n = len(self.cols["t"])
+        head = json.dumps({"cols": self.COLS, "n": n, "meta": meta or {}}).encode()
+        fd, tmp = tempfile.mkstemp(".tmp", dir=os.path.dirname(str(path)) or ".")    # Concurrent saves never share a temp file
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.MAGIC + head + b"\n")
+            for c in self.COLS:
+                col = self.cols[c]
+                if sys.byteorder != "little":    col = array.array("f", col) ; col.byteswap()
+                col.tofile(f)
+        os.replace(tmp, path)
+        return str(path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:    raise ValueError(f"not a telemetry file: {path}")
+            head = json.loads(f.readline())
+            cols = {}
+            for c in head["cols"]:
+                a = array.array("f") ; a.fromfile(f, head["n"])
+                if sys.byteorder != "little":    a.byteswap()
+                cols[c] = a
+        return head["meta"], cols
+
+
+def bench(seconds=5):
+    """Sampler overhead against a busy multi-process group."""
+    code = "import os,time\nfor _ in range(2): os.fork()\nend=time.time()+%d\nwhile time.time()<end: print('fps: 59.9 frametime: 16.7 ms', flush=True) if int(time.time()*10)%%10==0 else None" % seconds
+    p = subprocess.Popen([sys.executable, "-c", code], start_new_session=True, stdout=subprocess.PIPE, text=True)
+    tel = Telemetry(p.pid, on_sample=lambda t: None).start()
+    for line in p.stdout:    tel.feed_line(line)
+    p.wait() ; tel.stop()
+    path = tel.save(f"/tmp/donner-bench-{os.getpid()}.dtel")
+    meta, cols = Telemetry.load(path)
+    print(tel.render()) ; print(tel.summary())
+    print(f"💾 {os.path.getsize(path)} bytes for {len(cols['t'])} samples x {len(cols)} columns")
+    os.unlink(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):    # python3 GUI_W_Telemetry.py session.dtel
+        meta, cols = Telemetry.load(sys.argv[1])
+        print(meta)
+        for c in Telemetry.COLS[1:]:    print(f"{c:9} {Telemetry.spark(cols[c], 64)}")
+    else:    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,242 @@
+
+import os
+import re
+import sys
+import json
+import hashlib
+import time
+import shutil
+import fnmatch
+import tempfile
+from pathlib import Path
+
+from GUI_W_Runner_Builder import Utils
+from GUI_W_PrefixStore import PrefixStore
+from GUI_W_Delta import UpperDelta
+from GUI_W_Supervisor import Supervisor
+
+class RegFile:
+    """Wine .reg text as {key: [header line, {value name: raw lines}]}, keys lower-cased."""
+    RX_NAME = re.compile(r'^("(?:[^"\\]|\\.)*"|@)=')
+
+    def __init__(self, text=""):
+        self.head, self.sections = [], {}
+        cur = last = None ; cont = False
+        for line in text.split("\n"):
+            if cont and last is not None:    # "...",\ continues on the next line
+                cur[1][last] += "\n" + line ; cont = line.endswith("\\") ; continue
+            if line.startswith("["):
+                cur, last = [line, {}], None
+                self.sections[line[1:line.rindex("]")].lower()] = cur ; continue
+            if cur is None:    self.head.append(line) ; continue
+            if not line:    last = None ; continue
+            m = self.RX_NAME.match(line)
+            last = m.group(1).lower() if m else line.split("=", 1)[0]    # #time / #class meta lines
+            cur[1][last] = line ; cont = line.endswith("\\")
+
+    @classmethod
+    def read(cls, path):
+        try:    return cls(Path(path).read_text(errors="surrogateescape"))
+        except OSError:    return cls()
+
+    def dump(self):
+        out = ["\n".join(self.head or ["WINE REGISTRY Version 2", ""])]
+        for head, values in self.sections.values():    out.append("\n".join([head, *values.values()]) + "\n")
+        return "\n".join(out)
+
+    def write(self, path):
+        tmp = f"{path}.donner-tmp"
+        Path(tmp).write_text(self.dump(), errors="surrogateescape") ; os.replace(tmp, path)
+
+    def diff(self, before):
+        """{"set": {key: [header, {name: raw}]}, "del": {key: [names]}, "drop": [keys]} from `before` to self."""
+        out = {"set": {}, "del": {}, "drop": [k for k in before.sections if k not in self.sections]}
+        for k, (head, values) in self.sections.items():
+            if k not in before.sections:    out["set"][k] = [head, values] ; continue
+            old = before.sections[k][1]
+            changed = {n: v for n, v in values.items() if old.get(n) != v and n != "#time"}    # Wine bumps #time on every write
+            gone = [n for n in old if n not in values]
+            if changed:    out["set"][k] = [head, changed]
+            if gone:    out["del"][k] = gone
+        return out
+
+    def apply(self, delta):
+        for k, (head, values) in delta["set"].items():
+            self.sections.setdefault(k, [head, {}])[1].update(values)
+        for k, names in delta["del"].items():
+            for n in names:    self.sections.get(k, [None, {}])[1].pop(n, None)
+        for k in delta["drop"]:    self.sections.pop(k, None)
+
+
+class VerbCache:
+    """Winetricks verbs recorded once as prefix deltas, then replayed without the installers.
+
+    A verb's delta ( files it added or changed, files it removed, registry values it
+    set ) is keyed by verb, Wine version, prefix arch and the verbs already installed
+    when it was recorded : a delta taken on top of other verbs lacks their files, so it
+    only replays onto a prefix with that same set. Files go into a PrefixStore
+    under the artifact directory ( DONNER_VERB_STORE, else ~/.cache/donner/verbs ),
+    registry changes are merged value by value into the target's .reg files and
+    winetricks.log is appended, so winetricks itself still sees the verb as installed.
+    The directory is self-contained : copy it to another machine to install offline.
+    """
+    SKIP = UpperDelta.EXCLUDE + ("*.reg", "winetricks.log", ".update-timestamp")
+    REGS = ("system.reg", "user.reg", "userdef.reg")
+
+    def __init__(self, root=None, log=print):
+        self.root = Path(root or os.environ.get("DONNER_VERB_STORE") or Utils.cache_dir("verbs"))
+        self.store, self.log = PrefixStore(self.root), log
+        self.deltas = self.root / "deltas" ; self.deltas.mkdir(exist_ok=True)
+
+    @staticmethod
+    def key(verb, wine, arch, prior=()):
+        """`prior` : winetricks.log verbs of the prefix before `verb` ( "clean" when none )."""
+        on = hashlib.sha1(" ".join(sorted(prior)).encode()).hexdigest()[:8] if prior else "clean"
+        return "-".join((verb, arch, re.sub(r"[^\w.+-]+", "_", wine), "on", on))
+
+    @staticmethod
+    def arch(prefix):
+        for line in RegFile.read(Path(prefix) / "system.reg").head:
+            if line.startswith("#arch="):    return line[6:].strip()
+        return os.environ.get("WINEARCH", "win64")
+
+    @staticmethod
+    def installed(prefix):
+        try:    return set((Path(prefix) / "winetricks.log").read_text().split())
+        except OSError:    return set()
+
+    def has(self, key):    return (self.deltas / f"{key}.json").exists() and self.store.has(key)
+
+    def entries(self):
+        return [json.loads(p.read_text()) for p in sorted(self.deltas.glob("*.json"))]
+
+    # Capture
+
+    @classmethod
+    def _state(cls, prefix):
+        """( {relpath: (size, mtime) | "-> target"}, {reg name: RegFile} ) of a prefix."""
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(prefix):
+            rel_dir = os.path.relpath(dirpath, prefix)
+            for n in filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+                rel = os.path.normpath(os.path.join(rel_dir, n))
+                if any(fnmatch.fnmatch(rel, g) for g in cls.SKIP):    continue
+                p = os.path.join(dirpath, n)
+                st = os.lstat(p)
+                files[rel] = f"-> {os.readlink(p)}" if os.path.islink(p) else (st.st_size, st.st_mtime_ns)
+        return files, {r: RegFile.read(Path(prefix) / r) for r in cls.REGS}
+
+    @classmethod
+    def snapshot(cls, prefix):    return (*cls._state(prefix), cls.installed(prefix))
+
+    def capture(self, prefix, key, before, verb, seconds=0):
+        """Stores what changed in `prefix` since `before` ( a snapshot() ) as delta `key`."""
+        (old_files, old_regs, old_log), (files, regs) = before, self._state(prefix)
+        changed = [r for r, v in files.items() if old_files.get(r) != v]
+        work = Path(tempfile.mkdtemp(prefix=f"capture-{verb}-", dir=self.root))
+        try:
+            for rel in changed:
+                src, dst = Path(prefix) / rel, work / rel
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                if src.is_symlink():    os.symlink(os.readlink(src), dst)
+                else:    PrefixStore.clone(src, dst)
+            for d, _, _ in os.walk(work):
+                if d != str(work):    shutil.copymode(Path(prefix) / os.path.relpath(d, work), d)
+            stats = self.store.ingest(work, key)
+        finally:    shutil.rmtree(work, ignore_errors=True)
+
+        meta = {
+            "key": key, "verb": verb, "files": len(changed), "new_bytes": stats["new_bytes"],
+            "deleted": [r for r in old_files if r not in files],
+            "reg": {r: regs[r].diff(old_regs[r]) for r in self.REGS if regs[r].sections or old_regs[r].sections},
+            "log": sorted(self.installed(prefix) - old_log), "on": sorted(old_log), "seconds": round(seconds, 2), "created": time.time(),
+        }
+        tmp = self.deltas / f"{key}.tmp"
+        tmp.write_text(json.dumps(meta)) ; os.replace(tmp, self.deltas / f"{key}.json")
+        return meta
+
+    # Replay
+
+    def replay(self, prefix, key):
+        """Applies delta `key` to `prefix` ( wineserver must not be running on it )."""
+        prefix, meta = Path(prefix), json.loads((self.deltas / f"{key}.json").read_text())
+        self.store.checkout(key, prefix)
+        for rel in meta["deleted"]:
+            try:    os.unlink(prefix / rel)
+            except OSError:    pass
+        for name, delta in meta["reg"].items():
+            reg = RegFile.read(prefix / name) ; reg.apply(delta) ; reg.write(prefix / name)
+        if missing := [v for v in meta["log"] if v not in self.installed(prefix)]:
+            with open(prefix / "winetricks.log", "a") as f:    f.write("".join(v + "\n" for v in missing))
+        return meta
+
+    async def install(self, prefix, verbs, env=None, on_line=None):
+        """Replays cached verbs, runs ( and records ) the rest; returns {verb: ok}."""
+        prefix = Path(prefix).resolve()
+        wine, arch = await Supervisor.blocking(PrefixStore.wine_version), self.arch(prefix)
+        env = {**(env or os.environ), "WINEPREFIX": str(prefix)}
+        if shutil.which("wineserver"):    await Supervisor.run(["wineserver", "-w"], env, timeout=60)    # Registry is merged on disk
+        results = {}
+
+        for verb in verbs:
+            if verb in self.installed(prefix):
+                self.log(f"✔️ {verb}: already installed") ; results[verb] = True ; continue
+            key, t0 = self.key(verb, wine, arch, self.installed(prefix)), time.perf_counter()
+            if self.has(key):
+                meta = await Supervisor.blocking(self.replay, prefix, key)
+                self.log(f"⚡ {verb}: replayed {meta['files']} files from cache in {time.perf_counter() - t0:.2f}s "
+                         f"( winetricks took {meta['seconds']:.1f}s )")
+                results[verb] = True ; continue
+
+            self.log(f"⬇️ {verb}: not cached, running winetricks...")
+            before = await Supervisor.blocking(self.snapshot, prefix)
+            code = await Supervisor.winetricks(prefix, [verb], env, on_line=on_line or self.log)
+            if code:
+                self.log(f"❌ {verb}: winetricks exited with {code}") ; results[verb] = False ; continue
+            meta = await Supervisor.blocking(self.capture, prefix, key, before, verb, time.perf_counter() - t0)
+            self.log(f"📦 {verb}: recorded {meta['files']} files, {meta['new_bytes'] / 2**20:.1f} MiB as {key}")
+            results[verb] = True
+        return results
+
+    def install_sync(self, prefix, verbs, env=None, on_line=None):
+        return Supervisor.shared().call(self.install(prefix, verbs, env, on_line))
+
+
+def bench(verbs=("vcrun2015", "dxvk"), seconds=2):
+    """winetricks ( fake, `seconds` per verb ) into one prefix, then a cached replay into a
+    fresh one; both must end up with the same files and registry."""
+    from GUI_W_FakeWine import FakeWine
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        env = {**FakeWine.install(tmp / "bin"), "FAKE_WINETRICKS_TIME": str(seconds)}
+        os.environ["PATH"] = env["PATH"]
+        prefixes = []
+        for name in ("a", "b"):
+            p = tmp / name ; prefixes.append(p)
+            s32 = p / "drive_c" / "windows" / "system32" ; s32.mkdir(parents=True)
+            for i in range(200):    (s32 / f"lib{i}.dll").write_bytes(b"MZ" * 2048)
+            (p / "system.reg").write_text("WINE REGISTRY Version 2\n;; All keys relative to \\\\Machine\n\n#arch=win64\n\n"
+                                          "[Software\\\\Wine] 1700000000\n#time=1d9\n\"Version\"=\"win10\"\n\n")
+            (p / "user.reg").write_text("WINE REGISTRY Version 2\n\n[Control Panel\\\\Desktop] 1700000000\n\"Wallpaper\"=\"\"\n\n")
+
+        cache = VerbCache(tmp / "verbs", log=lambda t: print("   " + t))
+        t0 = time.perf_counter() ; cache.install_sync(prefixes[0], verbs, env) ; cold = time.perf_counter() - t0
+        t0 = time.perf_counter() ; cache.install_sync(prefixes[1], verbs, env) ; warm = time.perf_counter() - t0
+
+        a, b = (VerbCache._state(p) for p in prefixes)
+        same = {r: v[0] for r, v in a[0].items()} == {r: v[0] for r, v in b[0].items()} and \
+               all(a[1][r].sections == b[1][r].sections for r in VerbCache.REGS) and \
+               VerbCache.installed(prefixes[0]) == VerbCache.installed(prefixes[1])
+        print(f"⏱️ {len(verbs)} verbs : winetricks {cold:.2f}s, cached replay {warm:.2f}s ( {cold / warm:.0f}x ), "
+              f"prefixes {'identical' if same else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    # python3 GUI_W_VerbCache.py                         benchmark
+    # python3 GUI_W_VerbCache.py list                    cached verbs
+    # python3 GUI_W_VerbCache.py PREFIX verb [verb...]   install through the cache
+    if sys.argv[1:2] == ["list"]:
+        for m in VerbCache().entries():
+            print(f"{m['key']:40} {m['files']:5} files  {m['new_bytes'] / 2**20:7.1f} MiB  winetricks {m['seconds']:.0f}s")
+    elif len(sys.argv) > 2:    sys.exit(0 if all(VerbCache().install_sync(sys.argv[1], sys.argv[2:]).values()) else 1)
+    else:    bench()
@@ -0,0 +1,186 @@
+
+import os
+import sys
+import time
+import atexit
+import tempfile
+import threading
+import statistics
+import subprocess
+
+class WineServerKeeper:
+    """Opt-in warm start : one persistent `wineserver -f -p` per prefix, reused across launches.
+
+    begin()/end() bracket each launch; a server idle for `idle` seconds, or still
+    running at exit, is stopped with `wineserver -k`.
+    """
+
+    def __init__(self, idle=600, log=print):
+        self.idle, self.log = idle, log
+        self.lock = threading.Lock()
+        self.servers = {}      # prefix -> {"proc", "env", "busy", "last"}
+        self.closed = False
+        threading.Thread(target=self._reaper, daemon=True).start()
+        atexit.register(self.shutdown)
+
+    @staticmethod
+    def socket_path(prefix):
+        """Where wineserver listens for `prefix` ( same naming as Wine's server.c )."""
+        st = os.stat(prefix)
+        return f"/tmp/.wine-{os.getuid()}/server-{st.st_dev:x}-{st.st_ino:x}/socket"
+
+    def healthy(self, prefix):
+        s = self.servers.get(prefix)
+        try:    return bool(s) and bool(s["proc"]) and s["proc"].poll() is None and os.path.exists(self.socket_path(prefix))
+        except OSError:    return False
+
+    def begin(self, prefix, env=None):
+        """Makes sure a live server backs `prefix`; returns True when it was already warm.
+
+        Only the bookkeeping runs under the lock : starting the server and wineboot happen
+        outside it, and other callers for the same prefix wait for that start to finish.
+        """
+        with self.lock:
+            s = self.servers.get(prefix)
+            if s and (not s["ready"].is_set() or self.healthy(prefix)):
+                s["busy"] += 1 ; s["last"] = time.monotonic() ; warm = s["ready"].is_set()
+            else:
+                dead = self.servers.pop(prefix, None)
+                env = {**(env or os.environ), "WINEPREFIX": prefix}
+                s = self.servers[prefix] = {"proc": None, "env": env, "busy": 1, "last": time.monotonic(),
+                                            "ready": threading.Event()}
+                warm = None
+        if warm is not None:
+            s["ready"].wait()
+            return warm
+
+        self._kill(dead)
+        try:
+            s["proc"] = subprocess.Popen(["wineserver", "-f", "-p"], env=env, start_new_session=True,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            deadline = time.monotonic() + 5
+            while not self.healthy(prefix) and time.monotonic() < deadline:    time.sleep(0.02)
+            if not self.healthy(prefix):    self.log("⚠️ wineserver did not come up, launching cold.")
+            else:    self._boot(env)
+        except OSError:
+            with self.lock:
+                if self.servers.get(prefix) is s:    del self.servers[prefix]
+            raise
+        finally:
+            s["ready"].set()
+        with self.lock:    orphan = self.servers.get(prefix) is not s    # stop() / shutdown() during the start
+        if orphan:    self._kill(s)
+        return False
+
+    @staticmethod
+    def _boot(env):
+        """Starts the prefix services once so later launches find them running."""
+        try:    subprocess.run(["wineboot"], env=env, capture_output=True, timeout=60)
+        except (OSError, subprocess.SubprocessError):    pass
+
+    def end(self, prefix):
+        with self.lock:
+            s = self.servers.get(prefix)
+            if s:    s["busy"] = max(0, s["busy"] - 1) ; s["last"] = time.monotonic()
+
+    def stop(self, prefix):
+        with self.lock:    s = self.servers.pop(prefix, None)
+        self._kill(s)
+
+    @staticmethod
+    def _kill(s):
+        if not s or not s["proc"]:    return
+        try:    subprocess.run(["wineserver", "-k"], env=s["env"], capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):    pass
+        try:    s["proc"].terminate() ; s["proc"].wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):    s["proc"].kill()
+
+    def _reaper(self):
+        while not self.closed:
+            time.sleep(min(30, self.idle / 4))
+            with self.lock:
+                now = time.monotonic()
+                idle = [p for p, s in self.servers.items() if not s["busy"] and now - s["last"] > self.idle]
+                stale = [(p, self.servers.pop(p)) for p in idle]
+            for prefix, s in stale:
+                self._kill(s) ; self.log(f"💤 Stopped idle wineserver: {prefix}")
+
+    def shutdown(self):
+        with self.lock:
+            self.closed = True
+            servers = list(self.servers.values()) ; self.servers.clear()
+        for s in servers:    self._kill(s)
+
+
+def bench(runs=5):
+    """Time-to-first-window with the fake Wine stub : cold `wine` vs a warm persistent server."""
+    from GUI_W_FakeWine import FakeWine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = FakeWine.install(f"{tmp}/bin")
+        prefix = f"{tmp}/prefix" ; os.makedirs(prefix)
+        env = {**env, "WINEPREFIX": prefix, "FAKE_WINE_COLD": "0.8", "FAKE_WINE_WARM": "0.05"}
+
+        def launch():
+            t0 = time.perf_counter()
+            p = subprocess.Popen(["wine", "game.exe"], env=env, stdout=subprocess.PIPE, text=True)
+            for line in p.stdout:
+                if "window shown" in line:    dt = time.perf_counter() - t0
+            p.wait()
+            return dt
+
+        cold = [launch() for _ in range(runs)]
+        keeper = WineServerKeeper()
+        t0 = time.perf_counter() ; keeper.begin(prefix, env) ; keeper.end(prefix)
+        start = time.perf_counter() - t0
+        warm = []
+        for _ in range(runs):
+            keeper.begin(prefix, env) ; warm.append(launch()) ; keeper.end(prefix)
+        keeper.shutdown()
+
+    print(f"⏱️ time-to-first-window : cold median {statistics.median(cold) * 1000:.0f} ms, "
+          f"warm median {statistics.median(warm) * 1000:.0f} ms ( server start {start * 1000:.0f} ms, {runs} runs )")
+
+def check():
+    """Keeper behaviour against the fake Wine stub : reuse, restart after a crash, no lock held
+    through wineboot, idle reaping and shutdown."""
+    from concurrent.futures import ThreadPoolExecutor
+    from GUI_W_FakeWine import FakeWine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**FakeWine.install(f"{tmp}/bin"), "FAKE_WINE_BOOT": "0"}
+        a, b = f"{tmp}/a", f"{tmp}/b" ; os.makedirs(a) ; os.makedirs(b)
+        keeper = WineServerKeeper(idle=0.2, log=lambda t: None)
+
+        assert keeper.begin(a, env) is False, "first begin must start a server"
+        pid = keeper.servers[a]["proc"].pid
+        assert keeper.begin(a, env) is True and keeper.servers[a]["proc"].pid == pid, "warm server not reused"
+        keeper.end(a) ; keeper.end(a)
+
+        keeper.servers[a]["proc"].kill() ; keeper.servers[a]["proc"].wait()
+        assert keeper.begin(a, env) is False, "dead server reported warm"
+        assert keeper.servers[a]["proc"].pid != pid and keeper.healthy(a), "dead server not restarted"
+
+        slow = {**env, "FAKE_WINE_BOOT": "1.5"}
+        with ThreadPoolExecutor(3) as ex:
+            first = ex.submit(keeper.begin, b, slow) ; time.sleep(0.3)
+            second = ex.submit(keeper.begin, b, slow)
+            t0 = time.monotonic() ; keeper.end(a) ; assert keeper.begin(a, env) is True
+            assert time.monotonic() - t0 < 0.5, "lock held through another prefix's wineboot"
+            assert first.result() is False and second.result() is False, "second caller skipped the start"
+        assert keeper.servers[b]["busy"] == 2, "concurrent starts of one prefix not shared"
+        keeper.end(a) ; keeper.end(b) ; keeper.end(b)
+
+        sock = keeper.socket_path(a)
+        deadline = time.monotonic() + 5
+        while keeper.servers and time.monotonic() < deadline:    time.sleep(0.05)
+        assert not keeper.servers and not os.path.exists(sock), "idle servers not reaped"
+
+        keeper.begin(a, env) ; keeper.shutdown()
+        assert not keeper.servers and not os.path.exists(sock), "shutdown left a server running"
+    print("✅ WineServerKeeper checks passed")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["check"]:    check()
+    else:    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
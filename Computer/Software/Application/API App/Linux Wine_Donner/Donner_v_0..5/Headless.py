@@ -0,0 +1,119 @@
+
+# Headless Launch-and-Analyze : no Qt, many executables, JSON Lines out.
+#
+#   python3 Headless.py manifest.txt --prefix ~/BasePrefix -j 4 --timeout 90 -o results.jsonl
+#   python3 Headless.py ~/Installers --fake-wine          ( directory : every *.exe below it )
+#   python3 Headless.py check                              ( end-to-end assertions against the stub Wine )
+#
+# Manifest : one exe per line ( # comments ), or JSON lines {"exe": ..., "timeout": ..., "profile": ...}.
+
+import os
+import sys
+import json
+import contextlib
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from GUI_W_Launch import Launch
+from GUI_W_PrefixOps import PrefixOps
+from GUI_W_Teardown import Teardown
+from GUI_W_Profile import LaunchProfile
+
+def read_manifest(src):
+    src = Path(src)
+    if src.is_dir():    return [{"exe": str(p)} for p in sorted(src.rglob("*.exe"))]
+
+    jobs = []
+    for line in src.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):    continue
+        jobs.append(json.loads(line) if line.startswith("{") else {"exe": line})
+    return jobs
+
+def run_job(job, prefix, bprefix, temp_prefix, timeout, verbose, profile="default"):
+    exe = os.path.abspath(job["exe"])
+    exe_dir, lines = os.path.dirname(exe), []
+    log = (lambda t: print(f"[{os.path.basename(exe)}] {t}", file=sys.stderr, flush=True)) if verbose else lines.append
+
+    try:
+        name, _, v = job.get("profile", profile).partition("@")    # name[@version], see GUI_W_Profile.py
+        prof = LaunchProfile.load(exe, name, int(v) if v else None)
+    except ValueError as e:    return {"exe": exe, "ok": False, "error": str(e)}
+
+    created = False
+    if temp_prefix and not prefix:    # Exe-local overlay Temp Prefix, removed again afterwards
+        created = PrefixOps(3, exe_dir, bprefix, log=log).run()
+        if not created:    return {"exe": exe, "ok": False, "error": "temp prefix creation failed"}
+
+    try:
+        launch = Launch(exe_dir, exe, log=log, tprefix=prefix, timeout=job.get("timeout", timeout), profile=prof)
+        ok = launch.run()
+        return {"exe": exe, "ok": ok, **launch.result}
+    finally:
+        if created:
+            PrefixOps(4, exe_dir, bprefix, log=log).run()
+            Teardown.shared(log=log).wait()    # The worker process may exit right after
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless Launch-and-Analyze over many executables.")
+    ap.add_argument("manifest", help="manifest file or a directory to scan for *.exe")
+    ap.add_argument("-o", "--out", help="JSON Lines output ( default : stdout )")
+    ap.add_argument("-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    ap.add_argument("--timeout", type=float, default=90, help="seconds each exe may run ( v0.4 : 90 )")
+    ap.add_argument("--prefix", help="WINEPREFIX to run every job in")
+    ap.add_argument("--base", help="Base Prefix for --temp-prefix overlays")
+    ap.add_argument("--temp-prefix", action="store_true", help="create / delete an exe-local overlay per job")
+    ap.add_argument("--profile", default="default", help="launch profile name[@version] ( A/B runs )")
+    ap.add_argument("--fake-wine", action="store_true", help="run against the stub Wine ( tests / CI )")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    a = ap.parse_args(argv)
+
+    jobs = read_manifest(a.manifest)
+    t0, ok = time.monotonic(), 0
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(open(a.out, "a")) if a.out else sys.stdout
+        if a.fake_wine:    # Stub bin dir for this run only, PATH restored afterwards
+            from GUI_W_FakeWine import FakeWine
+            stack.callback(os.environ.__setitem__, "PATH", os.environ.get("PATH", ""))
+            os.environ.update(FakeWine.install(stack.enter_context(tempfile.TemporaryDirectory(prefix="donner-fakewine-"))))
+        with ProcessPoolExecutor(max_workers=a.jobs) as pool:
+            futures = {pool.submit(run_job, j, a.prefix, a.base, a.temp_prefix, a.timeout, a.verbose, a.profile): j for j in jobs}
+            for fut in as_completed(futures):
+                try:    res = fut.result()
+                except Exception as e:    res = {"exe": futures[fut]["exe"], "ok": False, "error": str(e)}
+                ok += bool(res.get("ok"))
+                out.write(json.dumps(res) + "\n") ; out.flush()
+
+    print(f"✅ {ok}/{len(jobs)} jobs ok in {time.monotonic() - t0:.1f}s", file=sys.stderr)
+    return 0 if ok == len(jobs) else 1
+
+def check():
+    """Runs a small manifest end to end with --fake-wine and asserts on the JSON Lines."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(XDG_CACHE_HOME=f"{tmp}/cache", FAKE_WINE_COLD="0.1", FAKE_WINE_RUN="1.5",
+                          FAKE_WINE_MISSING="d3dx9_43.dll", DONNER_SHADER_CACHE="0")
+        prefix = Path(tmp, "prefix") ; (prefix / "drive_c").mkdir(parents=True)
+        games = Path(tmp, "games") ; games.mkdir()
+        for name in ("a", "b", "c"):    (games / f"{name}.exe").write_bytes(b"MZ")
+        manifest = Path(tmp, "manifest.txt")
+        manifest.write_text(f"# jobs\n{games}/a.exe\n{games}/b.exe\n" + json.dumps({"exe": f"{games}/c.exe", "timeout": 0.5}) + "\n")
+
+        out = Path(tmp, "out.jsonl")
+        rc = main([str(manifest), "--fake-wine", "--prefix", str(prefix), "-j", "2", "--timeout", "30", "-o", str(out)])
+        res = {Path(r["exe"]).name: r for r in map(json.loads, out.read_text().splitlines())}
+
+        assert rc == 0 and sorted(res) == ["a.exe", "b.exe", "c.exe"], f"jobs missing or failed: {res}"
+        for name in ("a.exe", "b.exe"):
+            r = res[name]
+            assert r["ok"] and r["returncode"] == 0 and not r["timed_out"], f"{name}: {r}"
+            assert "D3DX9_43.DLL" in map(str.upper, r["missing_dlls"]), f"{name}: missing DLL not reported"
+        assert res["c.exe"]["ok"] and res["c.exe"]["timed_out"], f"per-job timeout ignored: {res['c.exe']}"
+    print("✅ Headless checks passed")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["check"]:    check()
+    else:    sys.exit(main())